@@ -15,8 +15,8 @@ from .config import (
     AUTO_ABANDON_STALE_MATCHES,
     AUTO_ABANDON_STALE_MATCH_MINUTES,
 )
-from .game_state import db, db_write_queue
-from .gsi_handler import db_writer_worker
+from .game_state import db, db_write_queue, gsi_ingest_queue
+from .gsi_handler import db_writer_worker, gsi_ingest_worker
 
 # Import routes to register HTTP and WebSocket handlers
 from . import routes
@@ -51,12 +51,11 @@ def auto_abandon_stale_in_progress_matches() -> None:
     now_utc = datetime.now(timezone.utc)
 
     try:
-        matches = db.get_all_matches()
+        in_progress = db.get_all_matches(status='in_progress')
     except Exception as e:
         print(f"[STARTUP] Failed to load matches for stale sweep: {e}")
         return
 
-    in_progress = [m for m in matches if not m.get('ended_at')]
     if not in_progress:
         print("[STARTUP] No in-progress matches found for stale sweep")
         return
@@ -67,22 +66,12 @@ def auto_abandon_stale_in_progress_matches() -> None:
         if not match_id:
             continue
         try:
-            snapshots = db.get_match_snapshots(match_id)
+            latest = db.get_latest_snapshot_meta(match_id)
         except Exception as e:
-            print(f"[STARTUP] Skipping {match_id}: failed to read snapshots ({e})")
+            print(f"[STARTUP] Skipping {match_id}: failed to read latest snapshot ({e})")
             continue
 
-        latest_snapshot_time = None
-        latest_sequence = -1
-        for snapshot in snapshots:
-            snap_time = _parse_snapshot_timestamp(snapshot.get('timestamp'))
-            if snap_time is None:
-                continue
-            seq = int(snapshot.get('sequence_number') or 0)
-            if seq > latest_sequence:
-                latest_sequence = seq
-                latest_snapshot_time = snap_time
-
+        latest_snapshot_time = _parse_snapshot_timestamp(latest['timestamp']) if latest else None
         if latest_snapshot_time is None:
             print(f"[STARTUP] Skipping {match_id}: no valid snapshot timestamp")
             continue
@@ -91,7 +80,8 @@ def auto_abandon_stale_in_progress_matches() -> None:
         if age_seconds < threshold_seconds:
             continue
 
-        db.update_match_end_time(match_id, latest_snapshot_time)
+        # Writes go through the DB writer, which owns the write connection
+        db_write_queue.put(('update_match_end', match_id, latest_snapshot_time))
         auto_closed.append((match_id, latest_snapshot_time, int(age_seconds // 60)))
 
     if auto_closed:
@@ -157,6 +147,11 @@ if __name__ == '__main__':
         db_thread.start()
         print("[DB Writer] Background thread started")
         
+        # Start GSI ingest thread (/upload only enqueues)
+        ingest_thread = threading.Thread(target=gsi_ingest_worker, daemon=True)
+        ingest_thread.start()
+        print("[GSI] Ingest thread started")
+        
         # Run with socketio
         socketio.run(
             app,
@@ -173,6 +168,13 @@ if __name__ == '__main__':
         import traceback
         traceback.print_exc()
     finally:
+        # Stop the ingest thread first so its last packets still reach the DB writer
+        try:
+            gsi_ingest_queue.put(None)
+            ingest_thread.join(timeout=2)
+        except NameError:
+            pass  # ingest thread might not exist if error occurred early
+        
         # Signal db writer thread to stop
         print("[SHUTDOWN] Signaling DB writer thread to stop...")
         try:
@@ -2,20 +2,134 @@
 Change Detector - Detects changes between player state snapshots
 Ports frontend change detection logic to backend for real-time and historical change calculation
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 from datetime import datetime
+from bisect import bisect_left, bisect_right
+from heapq import merge
 import json
 
+# Snapshot fields replay_snapshots / detect_changes read (fields= projection for DB snapshot reads)
+REPLAY_SNAPSHOT_FIELDS = (
+    'gold', 'xp', 'level', 'next_level_xp', 'health', 'units', 'item_slots', 'synergies',
+    'round_number', 'round_phase',
+)
+
+
+class MatchChangeLog:
+    """
+    Append-only change log for one match.
+    
+    A change's position in the log is change_id - 1, so a change_id cursor is a direct index.
+    Secondary indexes hold ascending positions per account, per type and per round, and a
+    running max of current_sequence_number makes since_sequence cursors a binary search.
+    Queries only touch the positions past the cursor (or up to limit from the end).
+    """
+    
+    def __init__(self):
+        self.changes: List[Dict] = []
+        self.rounds: List[tuple] = []           # position -> (round_number, round_phase)
+        self.max_sequence: List[int] = []       # position -> max current_sequence_number up to here
+        self.by_account: Dict[int, List[int]] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_round: Dict[Optional[int], List[int]] = {}
+    
+    @property
+    def last_change_id(self) -> int:
+        return len(self.changes)
+    
+    def append(self, change: Dict, round_number: Optional[int] = None, round_phase: Optional[str] = None) -> int:
+        """Append a change, stamp it with its change_id and index it."""
+        position = len(self.changes)
+        change['change_id'] = position + 1
+        self.changes.append(change)
+        self.rounds.append((round_number, round_phase))
+        sequence = change.get('current_sequence_number') or 0
+        previous_max = self.max_sequence[-1] if self.max_sequence else 0
+        self.max_sequence.append(sequence if sequence > previous_max else previous_max)
+        self.by_account.setdefault(change.get('account_id'), []).append(position)
+        self.by_type.setdefault(change.get('type'), []).append(position)
+        self.by_round.setdefault(round_number, []).append(position)
+        return position + 1
+    
+    def query(
+        self,
+        account_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        round_number: Optional[int] = None,
+        round_phase: Optional[str] = None,
+        after_change_id: Optional[int] = None,
+        since_sequence: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Filtered view of the log.
+        
+        With a cursor (after_change_id and/or since_sequence) returns the oldest matching changes
+        after it in ascending change_id order - the polling case. Without one returns the newest
+        matching changes first.
+        """
+        # Candidate positions: the narrowest index that applies (all of them are ascending)
+        candidates: Optional[Sequence[int]] = None
+        if account_id is not None:
+            candidates = self.by_account.get(account_id, [])
+        if round_number is not None:
+            round_positions = self.by_round.get(round_number, [])
+            if candidates is None or len(round_positions) < len(candidates):
+                candidates = round_positions
+        wanted_types = set(change_types) if change_types else None
+        if wanted_types is not None:
+            type_lists = [self.by_type.get(change_type, []) for change_type in wanted_types]
+            type_total = sum(len(positions) for positions in type_lists)
+            if candidates is None or type_total < len(candidates):
+                candidates = type_lists[0] if len(type_lists) == 1 else list(merge(*type_lists))
+        
+        # First position past the cursor
+        start = 0
+        if after_change_id is not None:
+            start = max(start, after_change_id)  # change_id N sits at position N - 1
+        if since_sequence is not None:
+            start = max(start, bisect_right(self.max_sequence, since_sequence))
+        has_cursor = after_change_id is not None or since_sequence is not None
+        
+        if candidates is None:
+            candidates = range(len(self.changes))
+        first = bisect_left(candidates, start)
+        if has_cursor:
+            indices = range(first, len(candidates))
+        else:
+            indices = range(len(candidates) - 1, first - 1, -1)
+        
+        results: List[Dict] = []
+        for index in indices:
+            position = candidates[index]
+            change = self.changes[position]
+            if account_id is not None and change.get('account_id') != account_id:
+                continue
+            if wanted_types is not None and change.get('type') not in wanted_types:
+                continue
+            if round_number is not None or round_phase is not None:
+                change_round, change_phase = self.rounds[position]
+                if round_number is not None and change_round != round_number:
+                    continue
+                if round_phase is not None and change_phase != round_phase:
+                    continue
+            if since_sequence is not None and (change.get('current_sequence_number') or 0) <= since_sequence:
+                continue
+            results.append(change)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
 
 class ChangeDetector:
     """Detects changes between player state snapshots and maintains in-memory buffer."""
     
     def __init__(self):
-        # In-memory buffer: {match_id: [change1, change2, ...]}
-        self.active_changes: Dict[str, List[Dict]] = {}
+        # In-memory buffer: {match_id: MatchChangeLog}
+        self.active_changes: Dict[str, MatchChangeLog] = {}
         
-        # Previous states for real-time detection: {match_id: {account_id: previous_state}}
-        self.previous_states: Dict[str, Dict[int, Dict]] = {}
+        # Previous states for real-time detection: {match_id: {account_id: PublicPlayerState}}
+        self.previous_states: Dict[str, Dict[int, Any]] = {}
     
     def detect_changes(
         self, 
@@ -30,8 +144,8 @@ class ChangeDetector:
         Compare two snapshots and return list of changes.
         
         Args:
-            previous_state: Previous player state snapshot
-            current_state: Current player state snapshot
+            previous_state: Previous player state snapshot (PublicPlayerState live, dict when replaying the DB)
+            current_state: Current player state snapshot (same types as previous_state)
             account_id: Player account ID
             match_id: Match identifier
             round_number: Current round number (for HP changes)
@@ -442,17 +556,78 @@ class ChangeDetector:
             return None
         return self.previous_states[match_id].get(account_id)
     
-    def add_change(self, match_id: str, change: Dict) -> None:
-        """Add detected change to in-memory buffer."""
+    def add_change(
+        self,
+        match_id: str,
+        change: Dict,
+        round_number: Optional[int] = None,
+        round_phase: Optional[str] = None
+    ) -> None:
+        """Append detected change to the match's log, stamping it with the next per-match change_id."""
         if match_id not in self.active_changes:
-            self.active_changes[match_id] = []
-        self.active_changes[match_id].append(change)
+            self.active_changes[match_id] = MatchChangeLog()
+        self.active_changes[match_id].append(change, round_number=round_number, round_phase=round_phase)
+    
+    def last_change_id(self, match_id: str) -> int:
+        """Newest change_id for a match (0 if none) - the cursor to poll from."""
+        log = self.active_changes.get(match_id)
+        return log.last_change_id if log is not None else 0
+    
+    def replay_snapshots(self, match_id: str, snapshots: List[Dict]) -> List[tuple]:
+        """
+        Re-run detection over stored snapshots (historical matches without persisted changes).
+        
+        Snapshots are compared with the previous snapshot of the same player, in the order given
+        (get_match_snapshots returns them by sequence_number). Changes get change_ids in that
+        order and carry the timestamp of the snapshot they were detected on.
+        
+        Returns:
+            List of (snapshot, changes) tuples, one per snapshot that produced changes
+        """
+        results = []
+        previous_by_account: Dict[int, Dict] = {}
+        change_id = 0
+        for snapshot in snapshots:
+            acc_id = snapshot['account_id']
+            previous_snapshot = previous_by_account.get(acc_id)
+            previous_by_account[acc_id] = snapshot
+            if previous_snapshot is None:
+                continue
+            
+            detected_changes = self.detect_changes(
+                previous_snapshot,
+                snapshot,
+                acc_id,
+                match_id,
+                round_number=snapshot.get('round_number'),
+                round_phase=snapshot.get('round_phase')
+            )
+            if not detected_changes:
+                continue
+            
+            timestamp = snapshot.get('timestamp')
+            if isinstance(timestamp, datetime):
+                timestamp = timestamp.isoformat()
+            elif isinstance(timestamp, str):
+                timestamp = timestamp.replace(' ', 'T', 1)
+            for change in detected_changes:
+                change_id += 1
+                change['change_id'] = change_id
+                if timestamp:
+                    change['timestamp'] = timestamp
+            results.append((snapshot, detected_changes))
+        return results
     
     def get_changes(
         self, 
         match_id: str, 
         account_id: Optional[int] = None, 
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        round_number: Optional[int] = None,
+        round_phase: Optional[str] = None,
+        after_change_id: Optional[int] = None,
+        since_sequence: Optional[int] = None
     ) -> List[Dict]:
         """
         Retrieve changes from buffer (with optional filters).
@@ -461,30 +636,27 @@ class ChangeDetector:
             match_id: Match identifier
             account_id: Optional player account ID to filter by
             limit: Optional limit on number of changes to return
+            change_types: Optional list of change types to filter by
+            round_number: Optional round number to filter by
+            round_phase: Optional round phase to filter by
+            after_change_id: Optional cursor - only changes with a larger change_id
+            since_sequence: Optional cursor - only changes with a larger current_sequence_number
             
         Returns:
-            List of changes, sorted by timestamp descending
+            List of changes - newest first, or oldest first after a cursor
         """
-        if match_id not in self.active_changes:
+        log = self.active_changes.get(match_id)
+        if log is None:
             return []
-        
-        changes = self.active_changes[match_id]
-        
-        # Filter by account_id if provided
-        if account_id is not None:
-            changes = [
-                c for c in changes 
-                if c.get('account_id') == account_id
-            ]
-        
-        # Sort by timestamp descending (newest first)
-        changes.sort(key=lambda c: c.get('timestamp', ''), reverse=True)
-        
-        # Apply limit if provided
-        if limit is not None:
-            changes = changes[:limit]
-        
-        return changes
+        return log.query(
+            account_id=account_id,
+            change_types=change_types,
+            round_number=round_number,
+            round_phase=round_phase,
+            after_change_id=after_change_id,
+            since_sequence=since_sequence,
+            limit=limit
+        )
     
     def clear_match(self, match_id: str) -> None:
         """Clear buffer and previous states for specific match."""
@@ -16,6 +16,28 @@ LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 AUTO_ABANDON_STALE_MATCHES = os.getenv('AUTO_ABANDON_STALE_MATCHES', 'true').lower() == 'true'
 AUTO_ABANDON_STALE_MATCH_MINUTES = int(os.getenv('AUTO_ABANDON_STALE_MATCH_MINUTES', '60'))
 
+# DB writer group commit: drain up to N queued tasks or wait up to M ms, then commit once
+DB_WRITER_BATCH_MAX_TASKS = int(os.getenv('DB_WRITER_BATCH_MAX_TASKS', '256'))
+DB_WRITER_BATCH_MAX_WAIT_MS = int(os.getenv('DB_WRITER_BATCH_MAX_WAIT_MS', '50'))
+# Read-only SQLite connections shared by HTTP handlers (the writer keeps its own connection)
+DB_READ_POOL_SIZE = int(os.getenv('DB_READ_POOL_SIZE', '4'))
+
+# Realtime stream: send a full match_update keyframe every N frames, match_delta frames in between
+MATCH_UPDATE_KEYFRAME_INTERVAL = int(os.getenv('MATCH_UPDATE_KEYFRAME_INTERVAL', '100'))
+# Realtime stream: coalesce GSI bursts into at most N broadcasts per second (0 = emit on every update)
+MATCH_UPDATE_MAX_RATE_HZ = float(os.getenv('MATCH_UPDATE_MAX_RATE_HZ', '10'))
+
+# GSI ingest: /upload enqueues, one worker processes packets in arrival order
+GSI_INGEST_QUEUE_MAX = int(os.getenv('GSI_INGEST_QUEUE_MAX', '1024'))
+# When the queue is full: 'drop_oldest' (default), 'drop_newest' or 'block' (wait up to GSI_INGEST_BLOCK_TIMEOUT_MS, then drop)
+GSI_INGEST_OVERFLOW_POLICY = os.getenv('GSI_INGEST_OVERFLOW_POLICY', 'drop_oldest').lower()
+GSI_INGEST_BLOCK_TIMEOUT_MS = int(os.getenv('GSI_INGEST_BLOCK_TIMEOUT_MS', '200'))
+
+# Pre-match buffering (no active match): latest state per account, evicted by age and total size
+PREMATCH_BUFFER_MAX_AGE_SECONDS = int(os.getenv('PREMATCH_BUFFER_MAX_AGE_SECONDS', '300'))
+PREMATCH_BUFFER_MAX_BYTES = int(os.getenv('PREMATCH_BUFFER_MAX_BYTES', str(4 * 1024 * 1024)))
+PREMATCH_PRIVATE_BUFFER_MAX_ENTRIES = int(os.getenv('PREMATCH_PRIVATE_BUFFER_MAX_ENTRIES', '256'))
+
 # GSI endpoint is fixed by game configuration
 GSI_HOST = '0.0.0.0'  # Must match game's GSI config
 GSI_PORT = 3000       # Must match game's GSI config
@@ -6,16 +6,78 @@ Uses SQLite for efficient storage and real-time querying.
 import sqlite3
 import hashlib
 import json
-from typing import Dict, List, Optional, Literal, Any
+from typing import Dict, Iterable, List, Optional, Literal, Any
 from datetime import datetime
 from pathlib import Path
 import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from queue import LifoQueue, Empty
 from .utils import generate_bot_account_id
+from .player_state import json_default
+from .snapshot_codec import (
+    CODECS, DEFAULT_LEVEL, MIN_DICTIONARY_BYTES, CodecError, FrameDecoder, JsonCodec, frame_dictionary_id, train_dictionary,
+)
+from .timeline import TIMELINE_FIELDS
 
 
 PlayerCategory = Literal['public_player', 'private_player']
 
 
+class SnapshotRow:
+    """
+    One public snapshot from get_player_snapshots / get_match_snapshots.
+    
+    Same dict read API as the player state records (get, [], in, keys, items, to_dict), so
+    change detection and pool counting take either. JSON fields keep their stored cell (blob id
+    or legacy text) until first read; rows of one read share a loader that parses each distinct
+    blob once, so decoded values are shared between rows - treat them as read-only.
+    """
+    __slots__ = ('_values', '_pending', '_load')
+    
+    def __init__(self, values: Dict[str, Any], json_keys: Iterable[str], load):
+        self._values = values
+        self._pending = {key: values[key] for key in json_keys if values[key] is not None} or None
+        self._load = load
+    
+    def _decode(self, key: str) -> None:
+        self._values[key] = self._load(self._pending.pop(key))
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._pending and key in self._pending:
+            self._decode(key)
+        return self._values.get(key, default)
+    
+    def __getitem__(self, key: str) -> Any:
+        if self._pending and key in self._pending:
+            self._decode(key)
+        return self._values[key]
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._pending:
+            self._pending.pop(key, None)
+        self._values[key] = value
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+    
+    def keys(self) -> List[str]:
+        return list(self._values)
+    
+    def items(self):
+        return self.to_dict().items()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with every projected field decoded."""
+        while self._pending:
+            self._decode(next(iter(self._pending)))
+        return dict(self._values)
+    
+    def __repr__(self) -> str:
+        return f"SnapshotRow({self._values.get('match_id')!r}, {self._values.get('account_id')!r}, seq={self._values.get('sequence_number')!r})"
+
+
 class UnderlordsDatabaseManager:
     """Manages SQLite database for Underlords GSI data."""
     
@@ -90,22 +152,128 @@ class UnderlordsDatabaseManager:
     ]
     
     
-    def __init__(self, db_path: Optional[str] = None) -> None:
+    # Connection tuning. WAL lets readers run against the last committed state while the
+    # writer appends, so historical reads never block live ingest (and vice versa).
+    # synchronous=NORMAL is durable in WAL mode up to the last checkpointed commit.
+    WRITER_PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-16000",      # ~16 MB page cache
+        "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped I/O
+        "PRAGMA temp_store=MEMORY",
+    ]
+    READER_PRAGMAS = [
+        "PRAGMA query_only=ON",
+        "PRAGMA cache_size=-8000",       # ~8 MB page cache per reader
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    BUSY_TIMEOUT_SECONDS = 5.0
+    
+    # PRAGMA user_version marks one-shot data migrations as done (schema changes check table_info)
+    FINAL_PLACE_BACKFILL_VERSION = 1
+    
+    # Content-addressed storage for snapshot JSON: every distinct JSON text is stored once in
+    # snapshot_blobs and snapshot rows reference it through a <name>_blob column (see _blob_column).
+    # The writer remembers hash -> blob_id for the most recent blobs, so an unchanged board costs
+    # one hash and no extra statement.
+    SNAPSHOT_BLOB_CACHE_SIZE = int(os.getenv('SNAPSHOT_BLOB_CACHE_SIZE', '65536'))
+    BLOB_FETCH_CHUNK = 500  # blob ids per IN (...) lookup, below SQLite's variable limit
+    
+    # Optional compression of snapshot_blobs data (backend/snapshot_codec.py): 'none' stores JSON
+    # text, 'zlib' stores frames primed with the newest dictionary trained by
+    # scripts/recompress_snapshot_blobs.py. Reads decode whatever each blob was stored with.
+    SNAPSHOT_JSON_CODEC = os.getenv('SNAPSHOT_JSON_CODEC', 'none').strip().lower()
+    SNAPSHOT_JSON_CODEC_LEVEL = int(os.getenv('SNAPSHOT_JSON_CODEC_LEVEL', str(DEFAULT_LEVEL)))
+    CODEC_TRAINING_SAMPLES = 5000
+    
+    def __init__(self, db_path: Optional[str] = None, read_pool_size: int = 4) -> None:
         # Default to parent directory if not specified
         if db_path is None:
             db_path = os.path.join(os.path.dirname(__file__), '..', 'underlords_gsi_v5.db')
         self.db_path = db_path
-        self.conn = None
+        self.conn = None  # Single writer connection - owned by the DB writer thread
+        # Serializes everything that writes through self.conn (writer batches, match creation, builds)
+        self.write_lock = threading.RLock()
+        
+        # Pool of read-only connections for HTTP handlers and other readers
+        self.read_pool_size = max(1, read_pool_size)
+        self._read_pool: LifoQueue = LifoQueue()
+        self._read_connections: List[sqlite3.Connection] = []
+        self._read_pool_lock = threading.Lock()
+        
+        # Writer-side blob interning (only touched through self.conn, under write_lock)
+        self._blob_ids: OrderedDict = OrderedDict()  # blake2b digest -> blob_id
+        self.blob_stats = {
+            'references': 0,        # JSON values written as blob references
+            'new_blobs': 0,
+            'cache_hits': 0,
+            'bytes_referenced': 0,  # JSON bytes those references stand for
+            'bytes_stored': 0,      # bytes actually written to snapshot_blobs (after the codec)
+        }
+        self._json_encoder: Optional[JsonCodec] = None  # None = store plain JSON text
+        self._json_decoder = FrameDecoder()
         self.init_database()
     
     def init_database(self) -> None:
         """Initialize database connection and create tables if they don't exist."""
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.BUSY_TIMEOUT_SECONDS)
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
+        for pragma in self.WRITER_PRAGMAS:
+            self.conn.execute(pragma)
         self.create_tables()
         self.migrate_add_round_columns()
         self.migrate_rename_items_column()
         self.migrate_add_global_leaderboard_rank_column()
+        self.migrate_backfill_match_player_final_place()
+        self.migrate_add_snapshot_blob_columns()
+        self._init_json_codec()
+    
+    def _uses_shared_memory_connection(self) -> bool:
+        """In-memory databases cannot be opened twice - readers fall back to the writer connection."""
+        return self.db_path == ':memory:' or str(self.db_path).startswith('file::memory:')
+    
+    def _open_read_connection(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file."""
+        uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=self.BUSY_TIMEOUT_SECONDS)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.READER_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def read_connection(self):
+        """
+        Borrow a read-only connection from the pool.
+        Connections are created lazily up to read_pool_size; callers beyond that wait for one to free up.
+        """
+        if self._uses_shared_memory_connection():
+            with self.write_lock:
+                yield self.conn
+            return
+        
+        conn = None
+        try:
+            conn = self._read_pool.get_nowait()
+        except Empty:
+            with self._read_pool_lock:
+                if len(self._read_connections) < self.read_pool_size:
+                    conn = self._open_read_connection()
+                    self._read_connections.append(conn)
+            if conn is None:
+                conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._read_pool.put(conn)
+    
+    def check_health(self) -> None:
+        """Run a trivial query on a read connection. Raises if the database is unreachable."""
+        with self.read_connection() as conn:
+            conn.execute("SELECT 1").fetchone()
     
     def create_tables(self) -> None:
         """Create all necessary tables."""
@@ -213,6 +381,13 @@ class UnderlordsDatabaseManager:
                 round_number INTEGER,
                 round_phase TEXT,
                 
+                -- snapshot_blobs references for the JSON columns (the *_json columns stay NULL)
+                underlord_talents_blob INTEGER,
+                synergies_blob INTEGER,
+                board_buddy_blob INTEGER,
+                units_blob INTEGER,
+                item_slots_blob INTEGER,
+                
                 FOREIGN KEY (match_id) REFERENCES matches(match_id)
             )
         """)
@@ -243,16 +418,103 @@ class UnderlordsDatabaseManager:
                 used_item_reward_reroll_this_round BOOLEAN,
                 grants_rewards INTEGER,
                 
+                -- snapshot_blobs references for the JSON columns (the *_json columns stay NULL)
+                shop_units_blob INTEGER,
+                underlord_picker_offering_blob INTEGER,
+                oldest_unclaimed_reward_blob INTEGER,
+                
+                FOREIGN KEY (match_id) REFERENCES matches(match_id)
+            )
+        """)
+        
+        # Distinct JSON values of snapshot JSON columns, shared by every snapshot row that holds them
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS snapshot_blobs (
+                blob_id INTEGER PRIMARY KEY,
+                hash BLOB NOT NULL UNIQUE,  -- blake2b-128 of data
+                data TEXT NOT NULL,         -- JSON text, or a snapshot_codec frame (BLOB)
+                size INTEGER NOT NULL       -- bytes of the JSON text (UTF-8)
+            )
+        """)
+        
+        # Trained deflate dictionaries for snapshot_codec frames (never changed or deleted)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS snapshot_codec_dictionaries (
+                dictionary_id INTEGER PRIMARY KEY,
+                data BLOB NOT NULL,
+                sample_count INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Change events detected at ingest time (one row per change, full change dict in data_json)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS match_changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                match_id TEXT NOT NULL,
+                change_id INTEGER NOT NULL,
+                account_id INTEGER NOT NULL,
+                sequence_number INTEGER,
+                round_number INTEGER,
+                round_phase TEXT,
+                change_type TEXT NOT NULL,
+                timestamp TEXT,
+                data_json TEXT NOT NULL,
+                
+                FOREIGN KEY (match_id) REFERENCES matches(match_id)
+            )
+        """)
+        
+        # Per-player end-of-match summary, materialized by finalize_match_summary when a match ends
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS match_summaries (
+                match_id TEXT NOT NULL,
+                account_id INTEGER NOT NULL,
+                final_place INTEGER DEFAULT 0,
+                sequence_number INTEGER,  -- latest snapshot the summary was taken from
+                
+                -- Final stats
+                health INTEGER,
+                gold INTEGER,
+                level INTEGER,
+                xp INTEGER,
+                next_level_xp INTEGER,
+                wins INTEGER,
+                losses INTEGER,
+                win_streak INTEGER,
+                lose_streak INTEGER,
+                net_worth INTEGER,
+                
+                -- Final board (JSON copied from the snapshot)
+                units_json TEXT,
+                item_slots_json TEXT,
+                synergies_json TEXT,
+                
+                -- Combat tallies (sum of the final vs_opponent_* counters per opponent)
+                combat_wins INTEGER DEFAULT 0,
+                combat_losses INTEGER DEFAULT 0,
+                combat_draws INTEGER DEFAULT 0,
+                
+                finalized_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (match_id, account_id),
                 FOREIGN KEY (match_id) REFERENCES matches(match_id)
             )
         """)
         
         # Create indexes for performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_players ON match_players(match_id, account_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_players_account ON match_players(account_id, match_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_started ON matches(started_at, match_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_in_progress ON matches(started_at, match_id) WHERE ended_at IS NULL")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_public_snapshots_player ON public_player_snapshots(account_id, sequence_number)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_public_snapshots_match ON public_player_snapshots(match_id, timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_public_snapshots_match_seq ON public_player_snapshots(match_id, sequence_number, timestamp)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_public_snapshots_round ON public_player_snapshots(match_id, account_id, round_number, round_phase)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_private_snapshots_match ON private_player_snapshots(match_id, timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_changes_match ON match_changes(match_id, change_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_changes_player ON match_changes(match_id, account_id, change_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_changes_type ON match_changes(match_id, change_type, change_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_changes_round ON match_changes(match_id, round_number, round_phase)")
         
         self.conn.commit()
     
@@ -328,6 +590,7 @@ class UnderlordsDatabaseManager:
                 # Recreate indexes
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_public_snapshots_player ON public_player_snapshots(account_id, sequence_number)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_public_snapshots_match ON public_player_snapshots(match_id, timestamp)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_public_snapshots_match_seq ON public_player_snapshots(match_id, sequence_number, timestamp)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_public_snapshots_round ON public_player_snapshots(match_id, account_id, round_number, round_phase)")
                 
                 print("[MIGRATION] Renamed items_json column to item_slots_json in public_player_snapshots")
@@ -353,59 +616,241 @@ class UnderlordsDatabaseManager:
 
         self.conn.commit()
     
+    def migrate_add_snapshot_blob_columns(self) -> None:
+        """
+        Add the *_blob reference columns to existing snapshot tables.
+        Rows written before keep their JSON text (reads handle both); move them with
+        scripts/migrate_snapshot_blobs.py.
+        """
+        cursor = self.conn.cursor()
+        for table, fields in (
+            ('public_player_snapshots', self.PUBLIC_SNAPSHOT_FIELDS),
+            ('private_player_snapshots', self.PRIVATE_SNAPSHOT_FIELDS),
+        ):
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = {row[1] for row in cursor.fetchall()}
+            for db_column, _, is_json in fields:
+                blob_column = self._blob_column(db_column)
+                if not is_json or blob_column in columns:
+                    continue
+                try:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {blob_column} INTEGER")
+                    print(f"[MIGRATION] Added {blob_column} column to {table}")
+                except sqlite3.OperationalError as e:
+                    print(f"[MIGRATION] Could not add {blob_column}: {e}")
+        self.conn.commit()
+    
+    def migrate_snapshot_json_to_blobs(self, batch_size: int = 2000) -> Dict[str, int]:
+        """
+        Move JSON text of existing snapshot rows into snapshot_blobs (writer connection, commits
+        per batch so it can be interrupted and resumed).
+        
+        Returns:
+            {'rows', 'values', 'bytes_before', 'bytes_stored', 'new_blobs'} - bytes_before is the
+            JSON text moved out of the snapshot tables, bytes_stored what was added to snapshot_blobs
+        """
+        report = {'rows': 0, 'values': 0, 'bytes_before': 0, 'bytes_stored': 0, 'new_blobs': 0}
+        for table, fields in (
+            ('public_player_snapshots', self.PUBLIC_SNAPSHOT_FIELDS),
+            ('private_player_snapshots', self.PRIVATE_SNAPSHOT_FIELDS),
+        ):
+            json_columns = [db_column for db_column, _, is_json in fields if is_json]
+            pending = ' OR '.join(f"{column} IS NOT NULL" for column in json_columns)
+            assignments = ', '.join(
+                f"{self._blob_column(column)} = COALESCE({self._blob_column(column)}, ?), {column} = NULL"
+                for column in json_columns
+            )
+            last_id = 0
+            while True:
+                rows = self.conn.execute(
+                    f"""SELECT snapshot_id, {', '.join(json_columns)} FROM {table}
+                        WHERE snapshot_id > ? AND ({pending})
+                        ORDER BY snapshot_id LIMIT ?""",
+                    (last_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                stored_before = self.blob_stats['bytes_stored']
+                new_before = self.blob_stats['new_blobs']
+                params = []
+                for row in rows:
+                    values = []
+                    for text in row[1:]:
+                        if text is not None:
+                            report['values'] += 1
+                            report['bytes_before'] += len(text.encode('utf-8'))
+                        values.append(self._blob_id(text))
+                    params.append((*values, row[0]))
+                self.conn.executemany(f"UPDATE {table} SET {assignments} WHERE snapshot_id = ?", params)
+                self.conn.commit()
+                report['rows'] += len(rows)
+                report['bytes_stored'] += self.blob_stats['bytes_stored'] - stored_before
+                report['new_blobs'] += self.blob_stats['new_blobs'] - new_before
+                last_id = rows[-1][0]
+        return report
+    
+    def snapshot_blob_report(self) -> Dict[str, int]:
+        """
+        Storage totals for snapshot JSON (full scan - for scripts, not request handlers).
+        
+        Returns:
+            {'blobs', 'blob_bytes', 'stored_bytes', 'compressed_blobs', 'references', 'referenced_bytes',
+             'legacy_values', 'legacy_bytes', 'orphan_blobs', 'bytes_saved'} - blob_bytes is the blobs'
+            JSON size and stored_bytes their size after the codec, referenced_bytes what the referencing
+            rows would take as plain JSON text, legacy_* the JSON text still stored inline
+        """
+        references = []
+        referenced_ids = []
+        legacy = []
+        for table, fields in (
+            ('public_player_snapshots', self.PUBLIC_SNAPSHOT_FIELDS),
+            ('private_player_snapshots', self.PRIVATE_SNAPSHOT_FIELDS),
+        ):
+            for db_column, _, is_json in fields:
+                if is_json:
+                    blob_column = self._blob_column(db_column)
+                    references.append(f"SELECT {blob_column} AS blob_id FROM {table}")
+                    referenced_ids.append(f"SELECT {blob_column} FROM {table} WHERE {blob_column} IS NOT NULL")
+                    legacy.append(f"SELECT LENGTH(CAST({db_column} AS BLOB)) AS size FROM {table} WHERE {db_column} IS NOT NULL")
+        with self.read_connection() as conn:
+            blobs, blob_bytes, stored_bytes, compressed_blobs = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(CAST(data AS BLOB))), 0),
+                       COALESCE(SUM(typeof(data) = 'blob'), 0)
+                FROM snapshot_blobs
+            """).fetchone()
+            reference_count, referenced_bytes = conn.execute(f"""
+                SELECT COUNT(*), COALESCE(SUM(b.size), 0)
+                FROM ({' UNION ALL '.join(references)}) r
+                JOIN snapshot_blobs b ON b.blob_id = r.blob_id
+            """).fetchone()
+            legacy_values, legacy_bytes = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ({' UNION ALL '.join(legacy)})"
+            ).fetchone()
+            orphan_blobs = conn.execute(f"""
+                SELECT COUNT(*) FROM snapshot_blobs
+                WHERE blob_id NOT IN ({' UNION '.join(referenced_ids)})
+            """).fetchone()[0]
+        return {
+            'blobs': blobs,
+            'blob_bytes': blob_bytes,
+            'stored_bytes': stored_bytes,
+            'compressed_blobs': compressed_blobs,
+            'references': reference_count,
+            'referenced_bytes': referenced_bytes,
+            'legacy_values': legacy_values,
+            'legacy_bytes': legacy_bytes,
+            'orphan_blobs': orphan_blobs,
+            'bytes_saved': referenced_bytes - stored_bytes,
+        }
+    
+    def prune_snapshot_blobs(self) -> int:
+        """
+        Delete blobs no snapshot references any more (left behind by delete_match). Writer
+        connection; run it with the server stopped, since a running writer caches blob ids.
+        Returns the number of blobs deleted.
+        """
+        references = ' UNION '.join(
+            f"SELECT {self._blob_column(db_column)} FROM {table} WHERE {self._blob_column(db_column)} IS NOT NULL"
+            for table, fields in (
+                ('public_player_snapshots', self.PUBLIC_SNAPSHOT_FIELDS),
+                ('private_player_snapshots', self.PRIVATE_SNAPSHOT_FIELDS),
+            )
+            for db_column, _, is_json in fields if is_json
+        )
+        cursor = self.conn.execute(f"DELETE FROM snapshot_blobs WHERE blob_id NOT IN ({references})")
+        self.conn.commit()
+        self._blob_ids.clear()
+        return cursor.rowcount
+    
+    def migrate_backfill_match_player_final_place(self) -> None:
+        """
+        Copy final_place from the latest placed snapshot into match_players for completed legacy matches.
+        
+        Runs once per database (user_version): matches ending later record final_place when they
+        end, and rows with no placed snapshot (e.g. abandoned matches) would be rescanned every start.
+        """
+        cursor = self.conn.cursor()
+        if cursor.execute("PRAGMA user_version").fetchone()[0] >= self.FINAL_PLACE_BACKFILL_VERSION:
+            return
+        cursor.execute("""
+            UPDATE match_players
+            SET final_place = (
+                SELECT s.final_place FROM public_player_snapshots s
+                WHERE s.match_id = match_players.match_id
+                  AND s.account_id = match_players.account_id
+                  AND s.final_place > 0
+                ORDER BY s.timestamp DESC LIMIT 1
+            )
+            WHERE COALESCE(final_place, 0) = 0
+              AND match_id IN (SELECT match_id FROM matches WHERE ended_at IS NOT NULL)
+              AND EXISTS (
+                SELECT 1 FROM public_player_snapshots s
+                WHERE s.match_id = match_players.match_id
+                  AND s.account_id = match_players.account_id
+                  AND s.final_place > 0
+              )
+        """)
+        if cursor.rowcount:
+            print(f"[MIGRATION] Backfilled final_place for {cursor.rowcount} match_players rows")
+        cursor.execute(f"PRAGMA user_version = {self.FINAL_PLACE_BACKFILL_VERSION}")
+        self.conn.commit()
+    
     def create_match(self, match_id: str, players_data: List[Dict], timestamp: datetime) -> str:
         """
         Create new match - no logic, just insert.
         """
         print(f"[DB DEBUG] create_match called with match_id: {match_id}")
         
-        cursor = self.conn.cursor()
-        
-        # Create new match
-        cursor.execute("""
-            INSERT OR IGNORE INTO matches (match_id, started_at, player_count)
-            VALUES (?, ?, ?)
-        """, (match_id, timestamp, len(players_data)))
-        print(f"[DB DEBUG] Match record inserted")
-        
-        # Insert players
-        print(f"[DB DEBUG] Inserting {len(players_data)} players...")
-        for i, player in enumerate(players_data):
-            # Get account_id - for bots generate it, for humans use raw data
-            is_human = player.get('is_human_player')
-            if is_human is False:
-                # Bot player - generate account_id
-                account_id = generate_bot_account_id(player)
-            else:
-                # Human player - use account_id directly from raw data
-                account_id = player.get('account_id')
-            
-            print(f"[DB DEBUG] Player {i+1}: account_id={account_id} (is_human={is_human})")
+        with self.write_lock:
+            cursor = self.conn.cursor()
             
+            # Create new match
             cursor.execute("""
-                INSERT OR IGNORE INTO match_players 
-                (match_id, account_id, persona_name, bot_persona_name, 
-                 player_slot, is_human_player, platform)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                match_id,
-                account_id,
-                player.get('persona_name'),
-                player.get('bot_persona_name'),
-                player.get('player_slot'),
-                is_human,
-                player.get('platform')
-            ))
-        
-        print(f"[DB DEBUG] Committing transaction...")
-        self.conn.commit()
-        print(f"[OK] Created new match: {match_id} with {len(players_data)} players")
-        return match_id
+                INSERT OR IGNORE INTO matches (match_id, started_at, player_count)
+                VALUES (?, ?, ?)
+            """, (match_id, timestamp, len(players_data)))
+            print(f"[DB DEBUG] Match record inserted")
+            
+            # Insert players
+            print(f"[DB DEBUG] Inserting {len(players_data)} players...")
+            for i, player in enumerate(players_data):
+                # Get account_id - for bots generate it, for humans use raw data
+                is_human = player.get('is_human_player')
+                if is_human is False:
+                    # Bot player - generate account_id
+                    account_id = generate_bot_account_id(player)
+                else:
+                    # Human player - use account_id directly from raw data
+                    account_id = player.get('account_id')
+            
+                print(f"[DB DEBUG] Player {i+1}: account_id={account_id} (is_human={is_human})")
+            
+                cursor.execute("""
+                    INSERT OR IGNORE INTO match_players 
+                    (match_id, account_id, persona_name, bot_persona_name, 
+                     player_slot, is_human_player, platform)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    match_id,
+                    account_id,
+                    player.get('persona_name'),
+                    player.get('bot_persona_name'),
+                    player.get('player_slot'),
+                    is_human,
+                    player.get('platform')
+                ))
+            
+            print(f"[DB DEBUG] Committing transaction...")
+            self.conn.commit()
+            print(f"[OK] Created new match: {match_id} with {len(players_data)} players")
+            return match_id
     
     def _execute_with_retry(self, sql: str, params: tuple):
         """
         Execute SQL with automatic retry on SQLite transaction errors.
-        Only retries on specific "cannot start a transaction within a transaction" error.
+        Only retries on specific "cannot start a transaction within a transaction" error, and only
+        outside a transaction: inside a DB writer batch a rollback would discard the earlier tasks
+        of the batch, so the error is re-raised for the task's savepoint to roll back.
         Re-raises all other exceptions immediately.
         """
         try:
@@ -413,8 +858,8 @@ class UnderlordsDatabaseManager:
             cursor.execute(sql, params)
             return cursor
         except sqlite3.OperationalError as e:
-            if "cannot start a transaction within a transaction" in str(e):
-                self.conn.rollback()
+            if "cannot start a transaction within a transaction" in str(e) and not self.conn.in_transaction:
+                self.rollback()
                 cursor = self.conn.cursor()
                 cursor.execute(sql, params)
                 return cursor
@@ -426,13 +871,251 @@ class UnderlordsDatabaseManager:
         Serialize a field to JSON string.
         Requires the field to exist - no defaults. Let KeyError propagate if missing.
         """
-        return json.dumps(data)
+        return json.dumps(data, default=json_default)
+    
+    @staticmethod
+    def _blob_column(db_column: str) -> str:
+        """snapshot_blobs reference column for a JSON column (units_json -> units_blob)."""
+        return db_column.removesuffix('_json') + '_blob'
+    
+    def _blob_id(self, text: Optional[str]) -> Optional[int]:
+        """
+        blob_id for a serialized JSON value, inserting it into snapshot_blobs the first time it is
+        seen (writer connection). None and "null" are stored as a NULL reference.
+        """
+        if text is None or text == 'null':
+            return None
+        data = text.encode('utf-8')
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        stats = self.blob_stats
+        stats['references'] += 1
+        stats['bytes_referenced'] += len(data)
+        blob_id = self._blob_ids.get(digest)
+        if blob_id is not None:
+            self._blob_ids.move_to_end(digest)
+            stats['cache_hits'] += 1
+            return blob_id
+        
+        stored = self._json_encoder.encode(text) if self._json_encoder else text
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO snapshot_blobs (hash, data, size) VALUES (?, ?, ?)",
+            (digest, stored, len(data))
+        )
+        if cursor.rowcount == 1:
+            blob_id = cursor.lastrowid
+            stats['new_blobs'] += 1
+            stats['bytes_stored'] += len(data) if stored is text else len(stored)
+        else:
+            blob_id = self.conn.execute("SELECT blob_id FROM snapshot_blobs WHERE hash = ?", (digest,)).fetchone()[0]
+        self._blob_ids[digest] = blob_id
+        if len(self._blob_ids) > self.SNAPSHOT_BLOB_CACHE_SIZE:
+            self._blob_ids.popitem(last=False)
+        return blob_id
+    
+    def _forget_uncommitted_blobs(self) -> None:
+        """
+        Drop the hash -> blob_id cache after a rollback: blobs inserted by the rolled back
+        statements are gone, so cached ids for them would dangle.
+        """
+        self._blob_ids.clear()
+    
+    def rollback(self) -> None:
+        """Roll back the writer connection's open transaction."""
+        try:
+            self.conn.rollback()
+        finally:
+            self._forget_uncommitted_blobs()
+    
+    def blob_cache_stats(self) -> Dict[str, int]:
+        """Writer-side dedup counters since startup (bytes_saved = JSON bytes not written)."""
+        return {
+            **self.blob_stats,
+            'cache_size': len(self._blob_ids),
+            'max_cache_size': self.SNAPSHOT_BLOB_CACHE_SIZE,
+            'codec': 'zlib' if self._json_encoder else 'none',
+            'codec_dictionary_id': self._json_encoder.dictionary_id if self._json_encoder else None,
+            'bytes_saved': self.blob_stats['bytes_referenced'] - self.blob_stats['bytes_stored'],
+        }
+    
+    def _stored_values(self, values: tuple, fields: List[tuple]) -> tuple:
+        """Swap each serialized JSON value in a values tuple for its blob_id."""
+        return tuple(
+            self._blob_id(value) if is_json else value
+            for value, (_, _, is_json) in zip(values, fields)
+        )
+    
+    def _stored_columns(self, fields: List[tuple]) -> List[str]:
+        """Column each field is written to (JSON fields go to their *_blob reference column)."""
+        return [self._blob_column(db_column) if is_json else db_column for db_column, _, is_json in fields]
+    
+    def _json_select_columns(self, fields: List[tuple], prefix: str = '') -> List[str]:
+        """
+        SELECT expressions for fields: JSON fields read their blob reference, falling back to the
+        inline text of rows written before snapshot_blobs (see _snapshot_json_loader).
+        """
+        return [
+            f"COALESCE({prefix}{self._blob_column(db_column)}, {prefix}{db_column})" if is_json else f"{prefix}{db_column}"
+            for db_column, _, is_json in fields
+        ]
+    
+    def _init_json_codec(self) -> None:
+        """Load the codec dictionaries and pick the codec for new blobs from SNAPSHOT_JSON_CODEC."""
+        for dictionary_id, data in self.conn.execute("SELECT dictionary_id, data FROM snapshot_codec_dictionaries"):
+            self._json_decoder.add_dictionary(dictionary_id, bytes(data))
+        codec = self.SNAPSHOT_JSON_CODEC
+        if codec not in CODECS:
+            print(f"[DB] Unknown SNAPSHOT_JSON_CODEC {codec!r} (expected one of {', '.join(CODECS)}), storing plain JSON")
+            codec = 'none'
+        self.set_json_codec(codec)
+    
+    def set_json_codec(self, codec: str, level: Optional[int] = None) -> None:
+        """
+        Codec for blobs written from now on: 'none', or 'zlib' with the newest trained dictionary
+        (empty dictionaries stored by earlier versions are skipped).
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Invalid snapshot JSON codec: {codec}. Must be one of {', '.join(CODECS)}")
+        if codec == 'none':
+            self._json_encoder = None
+            return
+        dictionaries = self._json_decoder.dictionaries
+        dictionary_id = max((key for key, data in dictionaries.items() if data), default=0)
+        self._json_encoder = JsonCodec(
+            dictionaries.get(dictionary_id, b''), dictionary_id, level or self.SNAPSHOT_JSON_CODEC_LEVEL
+        )
+    
+    def _decode_json(self, conn: sqlite3.Connection, value):
+        """
+        JSON text of a stored value (plain text or codec frame). A dictionary trained by another
+        process after startup is loaded on first use.
+        """
+        if value is None or isinstance(value, str):
+            return value
+        self._ensure_codec_dictionary(conn, value)
+        return self._json_decoder.decode(value)
+    
+    def _ensure_codec_dictionary(self, conn: sqlite3.Connection, value) -> None:
+        """Load the dictionary a stored frame needs, if this process has not seen it yet."""
+        dictionary_id = frame_dictionary_id(value)
+        if dictionary_id and dictionary_id not in self._json_decoder.dictionaries:
+            row = conn.execute(
+                "SELECT data FROM snapshot_codec_dictionaries WHERE dictionary_id = ?", (dictionary_id,)
+            ).fetchone()
+            if row is None:
+                raise CodecError(f"Snapshot JSON dictionary {dictionary_id} not found")
+            self._json_decoder.add_dictionary(dictionary_id, bytes(row[0]))
+    
+    def train_json_codec_dictionary(self, sample_count: Optional[int] = None) -> Optional[int]:
+        """
+        Train a dictionary from the newest blobs and store it (writer connection). If the zlib
+        codec is active, new blobs use it from now on. Returns the dictionary id, or None (nothing
+        stored) when the blobs yield less than MIN_DICTIONARY_BYTES - too few, or nothing repeats.
+        """
+        sample_count = sample_count or self.CODEC_TRAINING_SAMPLES
+        rows = self.conn.execute(
+            "SELECT data FROM snapshot_blobs ORDER BY blob_id DESC LIMIT ?", (sample_count,)
+        ).fetchall()
+        if not rows:
+            return None
+        samples = [self._decode_json(self.conn, row[0]) for row in rows]
+        dictionary = train_dictionary(samples)
+        if len(dictionary) < MIN_DICTIONARY_BYTES:
+            return None
+        cursor = self.conn.execute(
+            "INSERT INTO snapshot_codec_dictionaries (data, sample_count) VALUES (?, ?)",
+            (dictionary, len(samples))
+        )
+        self.conn.commit()
+        dictionary_id = cursor.lastrowid
+        self._json_decoder.add_dictionary(dictionary_id, dictionary)
+        if self._json_encoder is not None:
+            self.set_json_codec('zlib', self._json_encoder.level)
+        return dictionary_id
+    
+    def recompress_snapshot_blobs(self, batch_size: int = 2000) -> Dict[str, int]:
+        """
+        Re-encode every blob not yet stored with the current codec (writer connection, commits per
+        batch). Hashes are of the JSON text, so blob ids and references do not change.
+        
+        Returns:
+            {'blobs', 'rewritten', 'bytes_before', 'bytes_after'} - bytes of the rewritten blobs
+        """
+        encoder = self._json_encoder
+        report = {'blobs': 0, 'rewritten': 0, 'bytes_before': 0, 'bytes_after': 0}
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT blob_id, data FROM snapshot_blobs WHERE blob_id > ? ORDER BY blob_id LIMIT ?",
+                (last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+            updates = []
+            for blob_id, data in rows:
+                if encoder.is_current(data) if encoder else isinstance(data, str):
+                    continue
+                text = self._decode_json(self.conn, data)
+                stored = encoder.encode(text) if encoder else text
+                if stored == data:
+                    continue
+                report['bytes_before'] += len(data.encode('utf-8')) if isinstance(data, str) else len(data)
+                report['bytes_after'] += len(stored.encode('utf-8')) if isinstance(stored, str) else len(stored)
+                updates.append((stored, blob_id))
+            if updates:
+                self.conn.executemany("UPDATE snapshot_blobs SET data = ? WHERE blob_id = ?", updates)
+                self.conn.commit()
+            report['blobs'] += len(rows)
+            report['rewritten'] += len(updates)
+            last_id = rows[-1][0]
+        return report
+    
+    def _fetch_blobs(self, conn: sqlite3.Connection, blob_ids) -> Dict[int, Any]:
+        """blob_id -> stored data (JSON text or codec frame) for a set of blob ids."""
+        blob_ids = list(blob_ids)
+        stored: Dict[int, Any] = {}
+        for start in range(0, len(blob_ids), self.BLOB_FETCH_CHUNK):
+            chunk = blob_ids[start:start + self.BLOB_FETCH_CHUNK]
+            placeholders = ','.join(['?'] * len(chunk))
+            for blob_id, data in conn.execute(
+                f"SELECT blob_id, data FROM snapshot_blobs WHERE blob_id IN ({placeholders})", chunk
+            ):
+                self._ensure_codec_dictionary(conn, data)
+                stored[blob_id] = data
+        return stored
+    
+    def _snapshot_json_loader(self, conn: sqlite3.Connection, rows: List, json_indexes: List[int]):
+        """
+        Decoder for the JSON cells of a result set selected with _json_select_columns.
+        
+        A cell is either a blob_id (int) or legacy inline JSON text. The blobs are fetched in one
+        pass while the connection is held; each is decompressed and parsed on first use only,
+        then shared by every row that references it - treat decoded values as read-only.
+        """
+        stored = self._fetch_blobs(
+            conn, {row[index] for row in rows for index in json_indexes if isinstance(row[index], int)}
+        )
+        decoded: Dict[int, Any] = {}
+        decode = self._json_decoder.decode
+        
+        def load(value):
+            if isinstance(value, int):
+                if value not in decoded:
+                    data = stored.get(value)
+                    decoded[value] = json.loads(decode(data)) if data is not None else None
+                return decoded[value]
+            return json.loads(value) if value else None
+        return load
     
     def _build_public_snapshot_values(self, player_data: Dict) -> tuple:
-        """Build values tuple for public snapshot insert, handling missing fields."""
+        """Build values tuple for public snapshot insert, handling missing fields.
+        
+        player_data is a PublicPlayerState from the live pipeline or a plain dict (scripts, imports);
+        records inside JSON fields are serialized through json_default.
+        """
         values = []
+        get = player_data.get
         for db_column, gsi_field, is_json in self.PUBLIC_SNAPSHOT_FIELDS:
-            field_value = player_data.get(gsi_field)
+            field_value = get(gsi_field)
             if is_json:
                 # JSON fields - serialize None as "null"
                 if field_value is None:
@@ -460,28 +1143,29 @@ class UnderlordsDatabaseManager:
                 values.append(field_value)
         return tuple(values)
     
-    def _insert_public_snapshot(self, match_id: str, account_id: int, player_data: Dict, timestamp: datetime) -> int:
-        """Insert public player snapshot with all fields."""
-        cursor = self.conn.cursor()
-        
-        field_values = self._build_public_snapshot_values(player_data)
+    def _public_snapshot_insert_sql(self) -> str:
+        """Build the INSERT statement for public snapshots from field definitions."""
         # SQL expects: match_id, account_id, sequence_number, timestamp, then all direct fields, then all JSON fields
-        # field_values starts with sequence_number, so we need to insert timestamp after it
-        params = (match_id, account_id, field_values[0], timestamp, *field_values[1:])
-        
-        # Build column list from field definitions
-        columns = ['match_id', 'account_id'] + [db_column for db_column, _, _ in self.PUBLIC_SNAPSHOT_FIELDS]
+        columns = ['match_id', 'account_id'] + self._stored_columns(self.PUBLIC_SNAPSHOT_FIELDS)
         columns.insert(3, 'timestamp')  # Insert timestamp after sequence_number
         
-        # Build placeholders
         placeholders = ', '.join(['?'] * len(columns))
         column_list = ', '.join(columns)
-        
-        cursor.execute(f"""
-            INSERT INTO public_player_snapshots ({column_list})
-            VALUES ({placeholders})
-        """, params)
-        
+        return f"INSERT INTO public_player_snapshots ({column_list}) VALUES ({placeholders})"
+    
+    def _public_snapshot_params(self, match_id: str, account_id: int, player_data: Dict, timestamp: datetime) -> tuple:
+        """Build INSERT params for a public snapshot."""
+        field_values = self._stored_values(self._build_public_snapshot_values(player_data), self.PUBLIC_SNAPSHOT_FIELDS)
+        # field_values starts with sequence_number, so we need to insert timestamp after it
+        return (match_id, account_id, field_values[0], timestamp, *field_values[1:])
+    
+    def _insert_public_snapshot(self, match_id: str, account_id: int, player_data: Dict, timestamp: datetime) -> int:
+        """Insert public player snapshot with all fields."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            self._public_snapshot_insert_sql(),
+            self._public_snapshot_params(match_id, account_id, player_data, timestamp)
+        )
         return cursor.lastrowid
     
     def insert_snapshot(self, match_id: str, player_category: PlayerCategory, account_id: Optional[int] = None, player_data: Dict = None, timestamp: datetime = None) -> int:
@@ -520,29 +1204,125 @@ class UnderlordsDatabaseManager:
         """Insert private player snapshot with all fields. Public wrapper for backward compatibility."""
         return self._insert_private_snapshot(match_id, private_data, timestamp)
     
-    def _insert_private_snapshot(self, match_id: str, private_data: Dict, timestamp: datetime) -> int:
-        """Insert private player snapshot."""
-        cursor = self.conn.cursor()
-        
-        field_values = self._build_private_snapshot_values(private_data)
+    def _private_snapshot_insert_sql(self) -> str:
+        """Build the INSERT statement for private snapshots from field definitions."""
         # SQL expects: match_id, sequence_number, timestamp, player_slot, then rest of fields
-        # field_values starts with sequence_number, so we need to insert timestamp after it
-        params = (match_id, field_values[0], timestamp, *field_values[1:])
-        
-        # Build column list from field definitions
-        columns = ['match_id'] + [db_column for db_column, _, _ in self.PRIVATE_SNAPSHOT_FIELDS]
+        columns = ['match_id'] + self._stored_columns(self.PRIVATE_SNAPSHOT_FIELDS)
         columns.insert(2, 'timestamp')  # Insert timestamp after sequence_number
         
-        # Build placeholders
         placeholders = ', '.join(['?'] * len(columns))
         column_list = ', '.join(columns)
+        return f"INSERT INTO private_player_snapshots ({column_list}) VALUES ({placeholders})"
+    
+    def _private_snapshot_params(self, match_id: str, private_data: Dict, timestamp: datetime) -> tuple:
+        """Build INSERT params for a private snapshot."""
+        field_values = self._stored_values(self._build_private_snapshot_values(private_data), self.PRIVATE_SNAPSHOT_FIELDS)
+        # field_values starts with sequence_number, so we need to insert timestamp after it
+        return (match_id, field_values[0], timestamp, *field_values[1:])
+    
+    def _insert_private_snapshot(self, match_id: str, private_data: Dict, timestamp: datetime) -> int:
+        """Insert private player snapshot."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            self._private_snapshot_insert_sql(),
+            self._private_snapshot_params(match_id, private_data, timestamp)
+        )
+        return cursor.lastrowid
+    
+    def insert_snapshots_many(self, snapshots: List[tuple]) -> int:
+        """
+        Insert a group of snapshots with one executemany per table.
         
-        cursor.execute(f"""
-            INSERT INTO private_player_snapshots ({column_list})
-            VALUES ({placeholders})
-        """, params)
+        Args:
+            snapshots: List of (match_id, player_category, account_id, player_data, timestamp) tuples,
+                       the same arguments insert_snapshot takes
+            
+        Returns:
+            Number of rows inserted
+        """
+        public_params = []
+        private_params = []
+        for match_id, player_category, account_id, player_data, timestamp in snapshots:
+            if player_data is None:
+                raise ValueError("player_data is required")
+            if timestamp is None:
+                raise ValueError("timestamp is required")
+            if player_category == 'public_player':
+                if account_id is None:
+                    raise ValueError("account_id is required for public_player snapshots")
+                public_params.append(self._public_snapshot_params(match_id, account_id, player_data, timestamp))
+            elif player_category == 'private_player':
+                private_params.append(self._private_snapshot_params(match_id, player_data, timestamp))
+            else:
+                raise ValueError(f"Invalid player_category: {player_category}. Must be 'public_player' or 'private_player'")
         
-        return cursor.lastrowid
+        cursor = self.conn.cursor()
+        if public_params:
+            cursor.executemany(self._public_snapshot_insert_sql(), public_params)
+        if private_params:
+            cursor.executemany(self._private_snapshot_insert_sql(), private_params)
+        return len(public_params) + len(private_params)
+    
+    def insert_changes(
+        self,
+        match_id: str,
+        account_id: int,
+        sequence_number: Optional[int],
+        round_number: Optional[int],
+        round_phase: Optional[str],
+        changes: List[Dict]
+    ) -> int:
+        """
+        Persist change events detected between two snapshots of one player.
+        
+        Each change must carry the change_id stamped by ChangeDetector.add_change.
+        
+        Returns:
+            Number of rows inserted
+        """
+        params = [
+            (
+                match_id,
+                change['change_id'],
+                account_id,
+                sequence_number,
+                round_number,
+                round_phase,
+                change['type'],
+                change.get('timestamp'),
+                json.dumps(change),
+            )
+            for change in changes
+        ]
+        self.conn.cursor().executemany(
+            """INSERT INTO match_changes (
+                match_id, change_id, account_id, sequence_number, round_number, round_phase,
+                change_type, timestamp, data_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            params
+        )
+        return len(params)
+    
+    def begin(self) -> None:
+        """Open an explicit write transaction (used by the DB writer to group-commit a batch)."""
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+    
+    @contextmanager
+    def savepoint(self, name: str = 'task'):
+        """
+        Run a block inside a SAVEPOINT so a failure only rolls back that block.
+        The surrounding transaction (and the rest of the batch) stays intact.
+        """
+        self.conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield
+        except Exception:
+            self.conn.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self.conn.execute(f"RELEASE SAVEPOINT {name}")
+            self._forget_uncommitted_blobs()
+            raise
+        self.conn.execute(f"RELEASE SAVEPOINT {name}")
     
     def update_match_end_time(self, match_id: str, timestamp: datetime) -> None:
         """Update match ended_at timestamp."""
@@ -577,11 +1357,89 @@ class UnderlordsDatabaseManager:
         for operation in operations:
             cursor.execute(operation['sql'], operation['params'])
     
+    MATCH_SUMMARY_STATS = (
+        'health', 'gold', 'level', 'xp', 'next_level_xp', 'wins', 'losses', 'win_streak', 'lose_streak', 'net_worth'
+    )
+    MATCH_SUMMARY_JSON = (('units_json', 'units'), ('item_slots_json', 'item_slots'), ('synergies_json', 'synergies'))
+
+    def finalize_match_summary(self, match_id: str) -> int:
+        """
+        Materialize match_summaries for a match (writer connection; replaces existing rows).
+        
+        One row per match player from their latest public snapshot (JSON text is copied from the
+        snapshot's blobs as stored, not decoded) plus combat tallies from the vs_opponent_* counters. Returns the rows written.
+        """
+        stats = ', '.join(self.MATCH_SUMMARY_STATS)
+        json_columns = ', '.join(column for column, _ in self.MATCH_SUMMARY_JSON)
+        snapshot_stats = ', '.join(f"s.{name}" for name in self.MATCH_SUMMARY_STATS)
+        snapshot_json = ', '.join(
+            f"COALESCE(b{index}.data, s.{column})" for index, (column, _) in enumerate(self.MATCH_SUMMARY_JSON)
+        )
+        blob_joins = '\n'.join(
+            f"LEFT JOIN snapshot_blobs b{index} ON b{index}.blob_id = s.{self._blob_column(column)}"
+            for index, (column, _) in enumerate(self.MATCH_SUMMARY_JSON)
+        )
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM match_summaries WHERE match_id = ?", (match_id,))
+        cursor.execute(f"""
+            INSERT INTO match_summaries (
+                match_id, account_id, final_place, sequence_number, {stats}, {json_columns},
+                combat_wins, combat_losses, combat_draws
+            )
+            WITH per_opponent AS (
+                SELECT account_id,
+                       MAX(COALESCE(vs_opponent_wins, 0)) AS wins,
+                       MAX(COALESCE(vs_opponent_losses, 0)) AS losses,
+                       MAX(COALESCE(vs_opponent_draws, 0)) AS draws
+                FROM public_player_snapshots
+                WHERE match_id = ? AND opponent_player_slot IS NOT NULL
+                GROUP BY account_id, opponent_player_slot
+            ),
+            combats AS (
+                SELECT account_id, SUM(wins) AS wins, SUM(losses) AS losses, SUM(draws) AS draws
+                FROM per_opponent
+                GROUP BY account_id
+            )
+            SELECT mp.match_id, mp.account_id, COALESCE(mp.final_place, 0), s.sequence_number,
+                   {snapshot_stats}, {snapshot_json},
+                   COALESCE(c.wins, 0), COALESCE(c.losses, 0), COALESCE(c.draws, 0)
+            FROM match_players mp
+            LEFT JOIN public_player_snapshots s ON s.snapshot_id = (
+                SELECT snapshot_id FROM public_player_snapshots
+                WHERE match_id = mp.match_id AND account_id = mp.account_id
+                ORDER BY sequence_number DESC LIMIT 1
+            )
+            {blob_joins}
+            LEFT JOIN combats c ON c.account_id = mp.account_id
+            WHERE mp.match_id = ?
+        """, (match_id, match_id))
+        return cursor.rowcount
+
+    def get_match_summary_rows(self, match_id: str) -> List[Dict]:
+        """Materialized per-player summaries for a match ([] if it was never finalized)."""
+        columns = ('account_id', 'final_place', 'sequence_number') + self.MATCH_SUMMARY_STATS + tuple(
+            column for column, _ in self.MATCH_SUMMARY_JSON
+        ) + ('combat_wins', 'combat_losses', 'combat_draws')
+        with self.read_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM match_summaries WHERE match_id = ?", (match_id,)
+            ).fetchall()
+            summaries = []
+            for row in rows:
+                summary = dict(zip(columns, row))
+                for column, field in self.MATCH_SUMMARY_JSON:
+                    raw = self._decode_json(conn, summary.pop(column))
+                    summary[field] = json.loads(raw) if raw else None
+                summaries.append(summary)
+        return summaries
+
     def delete_match(self, match_id: str) -> None:
         """Delete a match and all associated data."""
         cursor = self.conn.cursor()
         
         # Delete in order: snapshots first, then players, then match
+        cursor.execute("DELETE FROM match_changes WHERE match_id = ?", (match_id,))
+        cursor.execute("DELETE FROM match_summaries WHERE match_id = ?", (match_id,))
         cursor.execute("DELETE FROM private_player_snapshots WHERE match_id = ?", (match_id,))
         cursor.execute("DELETE FROM public_player_snapshots WHERE match_id = ?", (match_id,))
         cursor.execute("DELETE FROM match_players WHERE match_id = ?", (match_id,))
@@ -597,118 +1455,227 @@ class UnderlordsDatabaseManager:
         Returns list of dicts with 'generation_id', 'shop_units', 'purchased_slot_indices'.
         Ordered by shop_generation_id ascending (chronological).
         """
-        cursor = self.conn.cursor()
-        # First snapshot per generation (full shop)
-        cursor.execute("""
-            SELECT p.shop_generation_id, p.shop_units_json
-            FROM private_player_snapshots p
-            INNER JOIN (
-                SELECT shop_generation_id, MIN(timestamp) AS min_ts
-                FROM private_player_snapshots
-                WHERE match_id = ?
-                GROUP BY shop_generation_id
-            ) q ON p.shop_generation_id = q.shop_generation_id AND p.timestamp = q.min_ts
-            WHERE p.match_id = ?
-            ORDER BY p.shop_generation_id ASC
-        """, (match_id, match_id))
-        first_rows = {row[0]: (row[0], json.loads(row[1]) if row[1] else []) for row in cursor.fetchall()}
-        # Last snapshot per generation (after purchases)
-        cursor.execute("""
-            SELECT p.shop_generation_id, p.shop_units_json
-            FROM private_player_snapshots p
-            INNER JOIN (
-                SELECT shop_generation_id, MAX(timestamp) AS max_ts
-                FROM private_player_snapshots
-                WHERE match_id = ?
-                GROUP BY shop_generation_id
-            ) q ON p.shop_generation_id = q.shop_generation_id AND p.timestamp = q.max_ts
-            WHERE p.match_id = ?
-            ORDER BY p.shop_generation_id ASC
-        """, (match_id, match_id))
-        last_rows = {row[0]: (json.loads(row[1]) if row[1] else []) for row in cursor.fetchall()}
-        result = []
-        for gen_id in sorted(first_rows.keys()):
-            _, shop_units = first_rows[gen_id]
-            last_units = last_rows.get(gen_id, [])
-            # Pad to 5 slots
-            first_slots = (shop_units + [{'unit_id': -1}] * 5)[:5]
-            last_slots = (last_units + [{'unit_id': -1}] * 5)[:5]
-            purchased = []
-            for i in range(5):
-                u_first = first_slots[i].get('unit_id', -1) if i < len(first_slots) else -1
-                u_last = last_slots[i].get('unit_id', -1) if i < len(last_slots) else -1
-                if u_first != -1 and u_last == -1:
-                    purchased.append(i)
-            result.append({
-                'generation_id': gen_id,
-                'shop_units': shop_units,
-                'purchased_slot_indices': purchased
-            })
-        return result
+        with self.read_connection() as conn:
+            cursor = conn.cursor()
+            # First snapshot per generation (full shop)
+            cursor.execute("""
+                SELECT p.shop_generation_id, COALESCE(p.shop_units_blob, p.shop_units_json)
+                FROM private_player_snapshots p
+                INNER JOIN (
+                    SELECT shop_generation_id, MIN(timestamp) AS min_ts
+                    FROM private_player_snapshots
+                    WHERE match_id = ?
+                    GROUP BY shop_generation_id
+                ) q ON p.shop_generation_id = q.shop_generation_id AND p.timestamp = q.min_ts
+                WHERE p.match_id = ?
+                ORDER BY p.shop_generation_id ASC
+            """, (match_id, match_id))
+            rows = cursor.fetchall()
+            load_json = self._snapshot_json_loader(conn, rows, [1])
+            first_rows = {row[0]: (row[0], load_json(row[1]) or []) for row in rows}
+            # Last snapshot per generation (after purchases)
+            cursor.execute("""
+                SELECT p.shop_generation_id, COALESCE(p.shop_units_blob, p.shop_units_json)
+                FROM private_player_snapshots p
+                INNER JOIN (
+                    SELECT shop_generation_id, MAX(timestamp) AS max_ts
+                    FROM private_player_snapshots
+                    WHERE match_id = ?
+                    GROUP BY shop_generation_id
+                ) q ON p.shop_generation_id = q.shop_generation_id AND p.timestamp = q.max_ts
+                WHERE p.match_id = ?
+                ORDER BY p.shop_generation_id ASC
+            """, (match_id, match_id))
+            rows = cursor.fetchall()
+            load_json = self._snapshot_json_loader(conn, rows, [1])
+            last_rows = {row[0]: (load_json(row[1]) or []) for row in rows}
+            result = []
+            for gen_id in sorted(first_rows.keys()):
+                _, shop_units = first_rows[gen_id]
+                last_units = last_rows.get(gen_id, [])
+                # Pad to 5 slots
+                first_slots = (shop_units + [{'unit_id': -1}] * 5)[:5]
+                last_slots = (last_units + [{'unit_id': -1}] * 5)[:5]
+                purchased = []
+                for i in range(5):
+                    u_first = first_slots[i].get('unit_id', -1) if i < len(first_slots) else -1
+                    u_last = last_slots[i].get('unit_id', -1) if i < len(last_slots) else -1
+                    if u_first != -1 and u_last == -1:
+                        purchased.append(i)
+                result.append({
+                    'generation_id': gen_id,
+                    'shop_units': shop_units,
+                    'purchased_slot_indices': purchased
+                })
+            return result
 
-    def get_all_matches(self) -> List[Dict]:
-        """Get list of all matches with basic info and player data."""
-        cursor = self.conn.cursor()
-        # Get all matches
-        cursor.execute("""
+    MATCH_STATUSES = ('completed', 'in_progress')
+
+    @staticmethod
+    def encode_match_cursor(match: Dict) -> str:
+        """Keyset cursor for the page after `match` (matches are listed newest first)."""
+        return f"{match['started_at']}|{match['match_id']}"
+
+    @staticmethod
+    def _decode_match_cursor(cursor: str) -> tuple:
+        started_at, separator, match_id = cursor.rpartition('|')
+        if not separator:
+            raise ValueError(f"Invalid match cursor: {cursor!r}")
+        return started_at, match_id
+
+    def list_matches(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        started_from: Optional[Any] = None,
+        started_to: Optional[Any] = None,
+        account_id: Optional[int] = None,
+        status: Optional[str] = None,
+        match_id: Optional[str] = None,
+    ) -> tuple:
+        """
+        One page of matches (newest first) with their players, in a single query.
+        
+        Args:
+            limit: Page size (None = everything after the cursor)
+            cursor: encode_match_cursor() of the last match of the previous page
+            started_from / started_to: started_at range, inclusive / exclusive
+            account_id: Only matches this player was in
+            status: 'completed' (ended_at set) or 'in_progress'
+            match_id: Only this match (see get_match)
+            
+        Returns:
+            tuple: (matches, next_cursor) - next_cursor is None on the last page
+        """
+        where = []
+        params: List[Any] = []
+        if match_id is not None:
+            where.append("match_id = ?")
+            params.append(match_id)
+        if cursor:
+            where.append("(started_at, match_id) < (?, ?)")
+            params.extend(self._decode_match_cursor(cursor))
+        if started_from is not None:
+            where.append("started_at >= ?")
+            params.append(started_from)
+        if started_to is not None:
+            where.append("started_at < ?")
+            params.append(started_to)
+        if account_id is not None:
+            where.append("match_id IN (SELECT match_id FROM match_players WHERE account_id = ?)")
+            params.append(account_id)
+        if status is not None:
+            if status not in self.MATCH_STATUSES:
+                raise ValueError(f"Invalid match status: {status!r} (expected one of {', '.join(self.MATCH_STATUSES)})")
+            where.append("ended_at IS NOT NULL" if status == 'completed' else "ended_at IS NULL")
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        # Fetch one extra match to know whether another page follows
+        limit_sql = "LIMIT ?" if limit is not None else ""
+        if limit is not None:
+            params.append(limit + 1)
+        
+        # final_place comes from match_players (kept current by the DB writer, backfilled for
+        # legacy rows by migrate_backfill_match_player_final_place)
+        query = f"""
+            WITH page AS (
+                SELECT match_id, started_at, ended_at, player_count, created_at
+                FROM matches
+                {where_sql}
+                ORDER BY started_at DESC, match_id DESC
+                {limit_sql}
+            )
             SELECT 
-                match_id,
-                started_at,
-                ended_at,
-                player_count,
-                created_at
-            FROM matches
-            ORDER BY started_at DESC
-        """)
+                page.match_id,
+                page.started_at,
+                page.ended_at,
+                page.player_count,
+                page.created_at,
+                mp.account_id,
+                mp.persona_name,
+                mp.bot_persona_name,
+                COALESCE(mp.final_place, 0)
+            FROM page
+            LEFT JOIN match_players mp ON mp.match_id = page.match_id
+            ORDER BY page.started_at DESC, page.match_id DESC, mp.id
+        """
+        with self.read_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
         
         matches = []
-        for row in cursor.fetchall():
-            match_id = row[0]
-            
-            # Get players for this match
-            cursor.execute("""
-                SELECT 
-                    mp.account_id,
-                    mp.persona_name,
-                    mp.bot_persona_name,
-                    COALESCE(
-                        (SELECT final_place FROM public_player_snapshots 
-                         WHERE match_id = ?
-                           AND account_id = mp.account_id 
-                           AND final_place > 0 
-                         ORDER BY timestamp DESC LIMIT 1), 0
-                    ) as final_place
-                FROM match_players mp
-                WHERE mp.match_id = ?
-            """, (match_id, match_id))
-            
-            players = []
-            for player_row in cursor.fetchall():
-                players.append({
-                    'account_id': player_row[0],
-                    'persona_name': player_row[1],
-                    'bot_persona_name': player_row[2],
-                    'final_place': player_row[3]
+        current = None
+        for row in rows:
+            if current is None or current['match_id'] != row[0]:
+                current = {
+                    'match_id': row[0],
+                    'started_at': row[1],
+                    'ended_at': row[2],
+                    'player_count': row[3],
+                    'created_at': row[4],
+                    'players': []
+                }
+                matches.append(current)
+            if row[5] is not None:
+                current['players'].append({
+                    'account_id': row[5],
+                    'persona_name': row[6],
+                    'bot_persona_name': row[7],
+                    'final_place': row[8]
                 })
-            
-            matches.append({
-                'match_id': match_id,
-                'started_at': row[1],
-                'ended_at': row[2],
-                'player_count': row[3],
-                'created_at': row[4],
-                'players': players
-            })
         
+        next_cursor = None
+        if limit is not None and len(matches) > limit:
+            del matches[limit:]
+            next_cursor = self.encode_match_cursor(matches[-1])
+        return matches, next_cursor
+
+    def get_all_matches(self, **filters: Any) -> List[Dict]:
+        """Get list of all matches with basic info and player data (list_matches filters apply)."""
+        matches, _ = self.list_matches(**filters)
         return matches
 
+    def get_match(self, match_id: str) -> Optional[Dict]:
+        """A single match with basic info and player data (same shape as get_all_matches entries), or None."""
+        matches, _ = self.list_matches(match_id=match_id)
+        return matches[0] if matches else None
+
+    # Returned by every public snapshot read, whatever the fields= projection
+    SNAPSHOT_KEY_COLUMNS = ('snapshot_id', 'match_id', 'account_id', 'sequence_number', 'timestamp')
+    
+    def _public_snapshot_projection(self, fields: Optional[Iterable[str]]) -> tuple:
+        """
+        (select expressions, row keys, JSON keys) for a fields= projection of public snapshots.
+        fields are GSI field names (the keys of the returned rows); None selects every field.
+        """
+        selected = [field for field in self.PUBLIC_SNAPSHOT_FIELDS if field[1] not in self.SNAPSHOT_KEY_COLUMNS]
+        if fields is not None:
+            wanted = set(fields)
+            unknown = wanted - {gsi_field for _, gsi_field, _ in self.PUBLIC_SNAPSHOT_FIELDS} - set(self.SNAPSHOT_KEY_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown snapshot field(s): {', '.join(sorted(unknown))}")
+            selected = [field for field in selected if field[1] in wanted]
+        expressions = list(self.SNAPSHOT_KEY_COLUMNS) + self._json_select_columns(selected)
+        keys = list(self.SNAPSHOT_KEY_COLUMNS) + [gsi_field for _, gsi_field, _ in selected]
+        json_keys = [gsi_field for _, gsi_field, is_json in selected if is_json]
+        return expressions, keys, json_keys
+    
+    def _read_public_snapshots(self, where: str, params: List, fields: Optional[Iterable[str]], suffix: str = '') -> List[SnapshotRow]:
+        """Run a projected public snapshot query and wrap the rows (JSON decoded lazily)."""
+        expressions, keys, json_keys = self._public_snapshot_projection(fields)
+        with self.read_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(expressions)} FROM public_player_snapshots WHERE {where}{suffix}", params
+            ).fetchall()
+            load_json = self._snapshot_json_loader(conn, rows, [keys.index(key) for key in json_keys])
+        return [SnapshotRow(dict(zip(keys, row)), json_keys, load_json) for row in rows]
+    
     def get_player_snapshots(
         self, 
         match_id: str, 
         account_id: int, 
         round_number: Optional[int] = None, 
-        round_phase: Optional[str] = None
-    ) -> List[Dict]:
+        round_phase: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> List[SnapshotRow]:
         """
         Query snapshots for a specific player in a match.
         
@@ -717,79 +1684,33 @@ class UnderlordsDatabaseManager:
             account_id: Player account ID
             round_number: Optional filter by round number
             round_phase: Optional filter by round phase
+            fields: Optional GSI field names to select (snapshot_id, match_id, account_id,
+                    sequence_number and timestamp always come back); default every field
             
         Returns:
-            List of snapshot dictionaries with parsed JSON fields
-        """
-        cursor = self.conn.cursor()
-        
-        # Build SELECT columns from field definitions
-        select_columns = ['snapshot_id', 'match_id', 'account_id'] + [db_column for db_column, _, _ in self.PUBLIC_SNAPSHOT_FIELDS]
-        select_columns.insert(4, 'timestamp')  # Insert timestamp after sequence_number
-        column_list = ', '.join(select_columns)
-        
-        # Build query with optional filters
-        query = f"""
-            SELECT {column_list}
-            FROM public_player_snapshots
-            WHERE match_id = ? AND account_id = ?
+            List of SnapshotRow (dict read API, JSON fields parsed on first access),
+            ordered by sequence_number ascending
         """
+        where = "match_id = ? AND account_id = ?"
         params = [match_id, account_id]
         
         if round_number is not None:
-            query += " AND round_number = ?"
+            where += " AND round_number = ?"
             params.append(round_number)
         
         if round_phase is not None:
-            query += " AND round_phase = ?"
+            where += " AND round_phase = ?"
             params.append(round_phase)
         
-        query += " ORDER BY sequence_number ASC"
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        snapshots = []
-        for row in rows:
-            snapshot = {
-                'snapshot_id': row[0],
-                'match_id': row[1],
-                'account_id': row[2],
-            }
-            
-            # Parse fields using field definitions
-            # Row structure: snapshot_id(0), match_id(1), account_id(2), sequence_number(3), timestamp(4), then rest of fields
-            # Handle timestamp separately (it's inserted at index 4, after sequence_number)
-            snapshot['timestamp'] = row[4]
-            
-            # Parse fields: start at index 3 for sequence_number, skip index 4 (timestamp), continue from index 5
-            row_index = 3
-            for db_column, gsi_field, is_json in self.PUBLIC_SNAPSHOT_FIELDS:
-                if is_json:
-                    # JSON fields - parse and use GSI field name
-                    if row[row_index]:
-                        snapshot[gsi_field] = json.loads(row[row_index])
-                    else:
-                        snapshot[gsi_field] = None
-                else:
-                    # Direct fields - use as-is
-                    snapshot[gsi_field] = row[row_index]
-                
-                row_index += 1
-                # Skip timestamp column (index 4) - it's already handled above
-                if row_index == 4:
-                    row_index += 1
-            
-            snapshots.append(snapshot)
+        return self._read_public_snapshots(where, params, fields, " ORDER BY sequence_number ASC")
         
-        return snapshots
-    
     def get_match_snapshots(
         self, 
         match_id: str, 
         account_ids: Optional[List[int]] = None, 
-        limit: Optional[int] = None
-    ) -> List[Dict]:
+        limit: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> List[SnapshotRow]:
         """
         Query snapshots for all players (or filtered list) in a match.
         
@@ -797,73 +1718,161 @@ class UnderlordsDatabaseManager:
             match_id: Match identifier
             account_ids: Optional list of account IDs to filter by
             limit: Optional limit on number of snapshots to return
+            fields: Optional GSI field names to select (snapshot_id, match_id, account_id,
+                    sequence_number and timestamp always come back); default every field
             
         Returns:
-            List of snapshot dictionaries with parsed JSON fields, ordered by sequence_number ascending
-        """
-        cursor = self.conn.cursor()
-        
-        # Build SELECT columns from field definitions
-        select_columns = ['snapshot_id', 'match_id', 'account_id'] + [db_column for db_column, _, _ in self.PUBLIC_SNAPSHOT_FIELDS]
-        select_columns.insert(4, 'timestamp')  # Insert timestamp after sequence_number
-        column_list = ', '.join(select_columns)
-        
-        # Build query with optional filters
-        query = f"""
-            SELECT {column_list}
-            FROM public_player_snapshots
-            WHERE match_id = ?
+            List of SnapshotRow (dict read API, JSON fields parsed on first access),
+            ordered by sequence_number ascending
         """
+        where = "match_id = ?"
         params = [match_id]
         
         if account_ids is not None:
             placeholders = ','.join(['?'] * len(account_ids))
-            query += f" AND account_id IN ({placeholders})"
+            where += f" AND account_id IN ({placeholders})"
             params.extend(account_ids)
         
-        query += " ORDER BY sequence_number ASC"
-        
+        suffix = " ORDER BY sequence_number ASC"
         if limit is not None:
-            query += f" LIMIT {limit}"
+            suffix += f" LIMIT {int(limit)}"
+        
+        return self._read_public_snapshots(where, params, fields, suffix)
+
+    def get_latest_player_snapshots(self, match_id: str, fields: Optional[Iterable[str]] = None) -> List[SnapshotRow]:
+        """
+        Latest public snapshot of each player in a match (highest sequence_number, then timestamp),
+        ordered by account_id. One backward seek on idx_public_snapshots_match_seq per player,
+        instead of reading every snapshot of the match.
+        """
+        where = """snapshot_id IN (
+            SELECT (
+                SELECT l.snapshot_id FROM public_player_snapshots l
+                WHERE l.match_id = a.match_id AND l.account_id = a.account_id
+                ORDER BY l.sequence_number DESC, l.timestamp DESC
+                LIMIT 1
+            )
+            FROM (SELECT DISTINCT match_id, account_id FROM public_player_snapshots WHERE match_id = ?) a
+        )"""
+        return self._read_public_snapshots(where, [match_id], fields, " ORDER BY account_id ASC")
+
+    def get_latest_snapshot_meta(self, match_id: str) -> Optional[Dict]:
+        """
+        account_id, sequence_number and timestamp of a match's latest public snapshot (highest
+        sequence_number, then timestamp), or None. One seek on idx_public_snapshots_match_seq.
+        """
+        with self.read_connection() as conn:
+            row = conn.execute("""
+                SELECT account_id, sequence_number, timestamp
+                FROM public_player_snapshots
+                WHERE match_id = ? AND timestamp IS NOT NULL
+                ORDER BY sequence_number DESC, timestamp DESC
+                LIMIT 1
+            """, (match_id,)).fetchone()
+        if row is None:
+            return None
+        return {'account_id': row[0], 'sequence_number': row[1], 'timestamp': row[2]}
+
+    def count_match_snapshots(self, match_id: str) -> int:
+        """Number of public snapshots stored for a match."""
+        with self.read_connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM public_player_snapshots WHERE match_id = ?", (match_id,)
+            ).fetchone()[0]
+
+    def get_match_timeline_rows(self, match_id: str, account_ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        Timeline columns only (no JSON fields) for every public snapshot in a match.
         
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        Returns:
+            List of dicts with account_id, sequence_number, round_number, timestamp and the
+            timeline.TIMELINE_FIELDS stats, ordered by sequence_number ascending
+        """
+        columns = ('account_id', 'sequence_number', 'round_number', 'timestamp') + TIMELINE_FIELDS
+        query = f"SELECT {', '.join(columns)} FROM public_player_snapshots WHERE match_id = ?"
+        params: List[Any] = [match_id]
+        if account_ids is not None:
+            query += f" AND account_id IN ({','.join(['?'] * len(account_ids))})"
+            params.extend(account_ids)
+        query += " ORDER BY sequence_number ASC"
+        with self.read_connection() as conn:
+            return [dict(zip(columns, row)) for row in conn.execute(query, params)]
+
+    def has_match_changes(self, match_id: str) -> bool:
+        """Whether change events were persisted for this match (False for matches recorded before match_changes existed)."""
+        with self.read_connection() as conn:
+            row = conn.execute("SELECT 1 FROM match_changes WHERE match_id = ? LIMIT 1", (match_id,)).fetchone()
+            return row is not None
+    
+    def get_last_change_id(self, match_id: str) -> int:
+        """Newest persisted change_id for a match (0 if none)."""
+        with self.read_connection() as conn:
+            row = conn.execute("SELECT MAX(change_id) FROM match_changes WHERE match_id = ?", (match_id,)).fetchone()
+            return row[0] or 0
+    
+    def get_match_changes(
+        self,
+        match_id: str,
+        account_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        round_number: Optional[int] = None,
+        round_phase: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_change_id: Optional[int] = None,
+        since_sequence: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Query persisted change events for a match.
         
-        snapshots = []
-        for row in rows:
-            snapshot = {
-                'snapshot_id': row[0],
-                'match_id': row[1],
-                'account_id': row[2],
-            }
+        Args:
+            match_id: Match identifier
+            account_id: Optional player account ID to filter by
+            change_types: Optional list of change types ('bought', 'sold', ...) to filter by
+            round_number: Optional round number to filter by (round of the snapshot the change was detected on)
+            round_phase: Optional round phase to filter by
+            limit: Optional limit on number of changes to return
+            after_change_id: Optional cursor - only changes with a larger change_id
+            since_sequence: Optional cursor - only changes detected on a later sequence_number
+            
+        Returns:
+            List of change dictionaries - newest first, or oldest first after a cursor
+        """
+        with self.read_connection() as conn:
+            cursor = conn.cursor()
             
-            # Parse fields using field definitions
-            # Row structure: snapshot_id(0), match_id(1), account_id(2), sequence_number(3), timestamp(4), then rest of fields
-            # Handle timestamp separately (it's inserted at index 4, after sequence_number)
-            snapshot['timestamp'] = row[4]
+            query = "SELECT data_json FROM match_changes WHERE match_id = ?"
+            params: List[Any] = [match_id]
             
-            # Parse fields: start at index 3 for sequence_number, skip index 4 (timestamp), continue from index 5
-            row_index = 3
-            for db_column, gsi_field, is_json in self.PUBLIC_SNAPSHOT_FIELDS:
-                if is_json:
-                    # JSON fields - parse and use GSI field name
-                    if row[row_index]:
-                        snapshot[gsi_field] = json.loads(row[row_index])
-                    else:
-                        snapshot[gsi_field] = None
-                else:
-                    # Direct fields - use as-is
-                    snapshot[gsi_field] = row[row_index]
-                
-                row_index += 1
-                # Skip timestamp column (index 4) - it's already handled above
-                if row_index == 4:
-                    row_index += 1
+            if account_id is not None:
+                query += " AND account_id = ?"
+                params.append(account_id)
+            if change_types:
+                placeholders = ','.join(['?'] * len(change_types))
+                query += f" AND change_type IN ({placeholders})"
+                params.extend(change_types)
+            if round_number is not None:
+                query += " AND round_number = ?"
+                params.append(round_number)
+            if round_phase is not None:
+                query += " AND round_phase = ?"
+                params.append(round_phase)
+            if after_change_id is not None:
+                query += " AND change_id > ?"
+                params.append(after_change_id)
+            if since_sequence is not None:
+                query += " AND sequence_number > ?"
+                params.append(since_sequence)
             
-            snapshots.append(snapshot)
-        
-        return snapshots
-
+            has_cursor = after_change_id is not None or since_sequence is not None
+            query += " ORDER BY change_id ASC" if has_cursor else " ORDER BY change_id DESC"
+            
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            
+            cursor.execute(query, params)
+            return [json.loads(row[0]) for row in cursor.fetchall()]
+    
     def get_player_match_count(self, account_id: int) -> int:
         """
         Get the count of distinct matches a player has appeared in.
@@ -875,76 +1884,88 @@ class UnderlordsDatabaseManager:
         Returns:
             Count of distinct matches the player has appeared in
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(DISTINCT match_id) 
-            FROM match_players 
-            WHERE account_id = ?
-        """, (account_id,))
-        
-        result = cursor.fetchone()
-        return result[0] if result else 0
+        with self.read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(DISTINCT match_id) 
+                FROM match_players 
+                WHERE account_id = ?
+            """, (account_id,))
+            
+            result = cursor.fetchone()
+            return result[0] if result else 0
 
     def save_build(self, build_id: str, name: str, description: Optional[str], units_json: str) -> None:
         """Save or update a build."""
-        cursor = self.conn.cursor()
-        now = datetime.now().isoformat()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO builds (id, name, description, units_json, created_at, updated_at)
-            VALUES (?, ?, ?, ?, 
-                COALESCE((SELECT created_at FROM builds WHERE id = ?), ?),
-                ?)
-        """, (build_id, name, description, units_json, build_id, now, now))
+        with self.write_lock:
+            cursor = self.conn.cursor()
+            now = datetime.now().isoformat()
+            
+            cursor.execute("""
+                INSERT OR REPLACE INTO builds (id, name, description, units_json, created_at, updated_at)
+                VALUES (?, ?, ?, ?, 
+                    COALESCE((SELECT created_at FROM builds WHERE id = ?), ?),
+                    ?)
+            """, (build_id, name, description, units_json, build_id, now, now))
+            
+            self.conn.commit()
         
-        self.conn.commit()
-    
     def get_build(self, build_id: str) -> Optional[Dict[str, Any]]:
         """Get a build by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM builds WHERE id = ?", (build_id,))
-        row = cursor.fetchone()
-        
-        if not row:
-            return None
-        
-        return {
-            'id': row['id'],
-            'name': row['name'],
-            'description': row['description'],
-            'units': json.loads(row['units_json']),
-            'createdAt': row['created_at'],
-            'updatedAt': row['updated_at']
-        }
-    
-    def get_all_builds(self) -> List[Dict[str, Any]]:
-        """Get all builds."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM builds ORDER BY updated_at DESC")
-        rows = cursor.fetchall()
-        
-        builds = []
-        for row in rows:
-            builds.append({
+        with self.read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM builds WHERE id = ?", (build_id,))
+            row = cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            return {
                 'id': row['id'],
                 'name': row['name'],
                 'description': row['description'],
                 'units': json.loads(row['units_json']),
                 'createdAt': row['created_at'],
                 'updatedAt': row['updated_at']
-            })
+            }
+        
+    def get_all_builds(self) -> List[Dict[str, Any]]:
+        """Get all builds."""
+        with self.read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM builds ORDER BY updated_at DESC")
+            rows = cursor.fetchall()
+            
+            builds = []
+            for row in rows:
+                builds.append({
+                    'id': row['id'],
+                    'name': row['name'],
+                    'description': row['description'],
+                    'units': json.loads(row['units_json']),
+                    'createdAt': row['created_at'],
+                    'updatedAt': row['updated_at']
+                })
+            
+            return builds
         
-        return builds
-    
     def delete_build(self, build_id: str) -> bool:
         """Delete a build by ID. Returns True if deleted, False if not found."""
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM builds WHERE id = ?", (build_id,))
-        self.conn.commit()
-        return cursor.rowcount > 0
+        with self.write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM builds WHERE id = ?", (build_id,))
+            self.conn.commit()
+            return cursor.rowcount > 0
 
     def close(self) -> None:
-        """Close database connection."""
+        """Close the writer connection and every pooled read connection."""
+        with self._read_pool_lock:
+            for conn in self._read_connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._read_connections = []
         if self.conn:
             self.conn.close()
 
@@ -2,17 +2,29 @@
 Game State Management - Match state, lifecycle, and game logic
 Consolidates match_state.py, match_manager.py, and game_logic.py
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict
+from collections import OrderedDict, deque
+import json
 import threading
 import time
 from queue import Queue
 
 from .database import UnderlordsDatabaseManager
 from .utils import generate_match_id, is_valid_new_player, get_highest_hp_player
-from .config import socketio
+from .config import (
+    socketio, DB_READ_POOL_SIZE, MATCH_UPDATE_KEYFRAME_INTERVAL, MATCH_UPDATE_MAX_RATE_HZ,
+    PREMATCH_BUFFER_MAX_AGE_SECONDS, PREMATCH_BUFFER_MAX_BYTES, PREMATCH_PRIVATE_BUFFER_MAX_ENTRIES,
+    GSI_INGEST_QUEUE_MAX,
+)
 from .change_detector import change_detector
 from .matchup_predictor_service import matchup_predictor_service
+from .hero_pool import HeroPoolTracker
+from .shop_odds import shop_odds_engine
+from .timeline import MatchTimeline
+from .player_state import (
+    PublicPlayerState, PrivatePlayerState, UnitRecord, ItemSlotRecord, SynergyRecord, records_from_gsi, as_dict,
+)
 from typing import Optional, Tuple
 
 
@@ -34,14 +46,27 @@ CombatRecord = Dict  # TypedDict would be better, but Dict works for now
 # }
 
 
+class WriteQueue(Queue):
+    """
+    Queue for DB writer tasks that remembers when each task was put.
+    get() returns (enqueued_at, task) with enqueued_at a perf_counter() value, so the writer can
+    report enqueue-to-commit lag; put() takes plain tasks, so producers are unchanged.
+    """
+    
+    def _put(self, item):
+        super()._put((time.perf_counter(), item))
+
+
 # ==========================================
 # Global State
 # ==========================================
 
-db = UnderlordsDatabaseManager()
+db = UnderlordsDatabaseManager(read_pool_size=DB_READ_POOL_SIZE)
 connected_clients = set()
 data_lock = threading.Lock()
-db_write_queue = Queue()
+db_write_queue = WriteQueue()
+# GSI packets waiting for the ingest worker: (gsi_payload, persist_to_db, enqueued_at) tuples
+gsi_ingest_queue = Queue(maxsize=max(1, GSI_INGEST_QUEUE_MAX))
 
 # Stats
 stats = {
@@ -50,6 +75,166 @@ stats = {
     'last_update': None  # datetime
 }
 
+# DB writer group-commit stats (updated by gsi_handler.db_writer_worker)
+db_writer_stats = {
+    'batches': 0,             # int - committed batches
+    'tasks': 0,               # int - tasks processed (ok + failed)
+    'failed_tasks': 0,        # int - tasks rolled back to their savepoint
+    'last_batch_size': 0,     # int
+    'max_batch_size': 0,      # int
+    'last_collect_ms': 0.0,   # float - time from first dequeue to batch close
+    'last_commit_ms': 0.0,    # float - time spent in COMMIT
+    'max_commit_ms': 0.0,     # float
+    'last_batch_lag_ms': 0.0, # float - oldest task of the batch: enqueue to commit finished
+    'max_batch_lag_ms': 0.0,  # float
+    'last_commit_at': None    # datetime
+}
+
+
+# GSI ingest pipeline stats (updated by gsi_handler.enqueue_gsi_payload / gsi_ingest_worker)
+ingest_stats = {
+    'enqueued': 0,            # int - packets accepted by /upload
+    'processed': 0,           # int - packets processed by the ingest worker
+    'failed': 0,              # int - packets whose processing raised
+    'dropped_oldest': 0,      # int - queued packets discarded to make room (drop_oldest)
+    'dropped_newest': 0,      # int - incoming packets rejected (drop_newest / block timeout)
+    'duplicate_states': 0,    # int - player states dropped by the sequence pre-filter (same sequence_number)
+    'stale_states': 0,        # int - player states dropped by the sequence pre-filter (older sequence_number)
+    'unchanged_states': 0,    # int - public states identical to the previous one apart from sequence_number
+    'max_depth': 0,           # int - highest queue depth seen at enqueue
+    'last_wait_ms': 0.0,      # float - time the last packet spent queued
+    'max_wait_ms': 0.0,       # float
+    'last_process_ms': 0.0,   # float - process_gsi_data time for the last packet
+    'max_process_ms': 0.0     # float
+}
+
+
+# ==========================================
+# Pre-match Buffer
+# ==========================================
+
+class PreMatchBuffer:
+    """
+    GSI states seen while no match is active (menus, spectating, lobby loading).
+    
+    Public states are kept as one entry per account (highest sequence_number wins), so the
+    unique-player count is len() and memory is bounded by the number of accounts seen. Accounts
+    not heard from for max_age are evicted, and the least recently heard-from accounts go first
+    when the estimated size passes max_bytes. Private states are a bounded deque (the bootstrap
+    filter in process_buffered_data needs more than just the latest one).
+    """
+    
+    def __init__(self, max_age_seconds: int = 300, max_bytes: int = 4 * 1024 * 1024, max_private_entries: int = 256):
+        self.max_age = timedelta(seconds=max(1, max_age_seconds))
+        self.max_bytes = max_bytes
+        # account_id -> [gsi_state, state_timestamp, sequence_number, first_seen, last_seen, size_bytes]
+        # ordered by last_seen (least recently heard-from first)
+        self.public: "OrderedDict[int, list]" = OrderedDict()
+        self.public_bytes = 0
+        # (gsi_state, timestamp) tuples
+        self.private: deque = deque(maxlen=max(1, max_private_entries))
+        self.stats = {
+            'public_packets': 0,     # int - public states offered to the buffer
+            'private_packets': 0,    # int - private states offered to the buffer
+            'evicted_by_age': 0,     # int - accounts dropped for inactivity
+            'evicted_by_bytes': 0,   # int - accounts dropped to stay under max_bytes
+            'private_dropped': 0,    # int - private states dropped (age or deque bound)
+        }
+    
+    @staticmethod
+    def _estimate_size(gsi_state: Dict) -> int:
+        return len(json.dumps(gsi_state, default=str))
+    
+    def add_public(self, account_id: int, gsi_state: Dict, timestamp: datetime) -> bool:
+        """Buffer a public state. Returns True if the account was not in the buffer yet."""
+        self.stats['public_packets'] += 1
+        sequence = gsi_state.get('sequence_number', 0)
+        entry = self.public.get(account_id)
+        is_new_player = entry is None
+        if is_new_player:
+            size = self._estimate_size(gsi_state)
+            self.public[account_id] = [gsi_state, timestamp, sequence, timestamp, timestamp, size]
+            self.public_bytes += size
+        else:
+            if sequence > entry[2]:
+                size = self._estimate_size(gsi_state)
+                self.public_bytes += size - entry[5]
+                entry[0], entry[1], entry[2], entry[5] = gsi_state, timestamp, sequence, size
+            entry[4] = timestamp
+            self.public.move_to_end(account_id)
+        self.evict(timestamp)
+        return is_new_player
+    
+    def add_private(self, gsi_state: Dict, timestamp: datetime) -> None:
+        self.stats['private_packets'] += 1
+        if len(self.private) == self.private.maxlen:
+            self.stats['private_dropped'] += 1
+        self.private.append((gsi_state, timestamp))
+    
+    def evict(self, now: datetime) -> None:
+        """Drop accounts/private states older than max_age, then accounts over max_bytes."""
+        cutoff = now - self.max_age
+        while self.public:
+            account_id, entry = next(iter(self.public.items()))
+            if entry[4] >= cutoff:
+                break
+            self._pop_oldest()
+            self.stats['evicted_by_age'] += 1
+        while self.public_bytes > self.max_bytes and len(self.public) > 1:
+            self._pop_oldest()
+            self.stats['evicted_by_bytes'] += 1
+        while self.private and self.private[0][1] < cutoff:
+            self.private.popleft()
+            self.stats['private_dropped'] += 1
+    
+    def _pop_oldest(self) -> None:
+        _, entry = self.public.popitem(last=False)
+        self.public_bytes -= entry[5]
+    
+    @property
+    def unique_player_count(self) -> int:
+        return len(self.public)
+    
+    def latest_public_states(self) -> Dict[int, tuple]:
+        """account_id -> (gsi_state, timestamp, sequence_number) of the highest sequence seen."""
+        return {account_id: (entry[0], entry[1], entry[2]) for account_id, entry in self.public.items()}
+    
+    def drain(self):
+        """
+        Hand the buffered data to match bootstrap and clear the buffer.
+        
+        Returns:
+            tuple: (latest_public_states, private_states, earliest_public_time)
+        """
+        latest_public = self.latest_public_states()
+        earliest_public_time = min((entry[3] for entry in self.public.values()), default=None)
+        private_states = list(self.private)
+        self.clear()
+        return latest_public, private_states, earliest_public_time
+    
+    def clear(self) -> None:
+        self.public = OrderedDict()
+        self.public_bytes = 0
+        self.private.clear()
+    
+    def metrics(self) -> Dict:
+        return {
+            **self.stats,
+            'public_players': len(self.public),
+            'public_bytes': self.public_bytes,
+            'private_entries': len(self.private),
+            'max_bytes': self.max_bytes,
+            'max_age_seconds': int(self.max_age.total_seconds()),
+        }
+
+
+def _new_prematch_buffer() -> PreMatchBuffer:
+    return PreMatchBuffer(
+        max_age_seconds=PREMATCH_BUFFER_MAX_AGE_SECONDS,
+        max_bytes=PREMATCH_BUFFER_MAX_BYTES,
+        max_private_entries=PREMATCH_PRIVATE_BUFFER_MAX_ENTRIES,
+    )
+
 
 # ==========================================
 # MatchState Class
@@ -60,9 +245,20 @@ class MatchState:
         self.match_id = None            # needs to be calculated.
         self.match_start = None         # needs to be calculated.
         self.private_player_account_id = None   # Auto-detected from player_slot matching
-        self.latest_processed_private_player_state = {}        # "account_id" : {} -> latest processed private_player_state (client owner)
-        self.latest_processed_public_player_states = {}        # "account_id" : {} -> latest processed public_player_state
+        self.latest_processed_private_player_state = {}        # PrivatePlayerState -> latest processed private_player_state (client owner), {} until the first one
+        self.latest_processed_public_player_states = {}        # "account_id" : PublicPlayerState -> latest processed public_player_state
         self.sequences = {}             # account_id -> last_sequence_number
+        self.public_state_fingerprints = {}  # account_id -> public_state_fingerprint() of the last processed state
+        
+        # Player indexes, kept in step with latest_processed_public_player_states by index_public_state()
+        self.indexed_players = {}       # account_id -> (player_slot, final_place) as last indexed
+        self.slot_to_account = {}       # player_slot -> account_id
+        self.alive_accounts = {}        # account_id -> None (insertion-ordered set of final_place == 0)
+        self.eliminated_accounts = set()  # account_ids with final_place > 0
+        self.placements = {}            # final_place -> account_id
+        self._slot_partition = None     # cached (alive_slots, eliminated_slots), rebuilt after index changes
+        self.hero_pool = HeroPoolTracker()  # remaining shared-pool copies, updated per processed public state
+        self.timeline = MatchTimeline()     # per-player columnar history of processed public states
 
         # Round tracking
         self.tracked_player_account_id = None   # The "source of truth" player (account_id)
@@ -70,11 +266,8 @@ class MatchState:
         self.round_number = 1           # Start at round 1
         self.round_phase = 'prep'       # Start in prep phase
     
-        # Buffer is used in match start logic only
-        # public_player_buffer: (gsi_state, timestamp, account_id) tuples
-        self.public_player_buffer = []
-        # private_player_buffer: (gsi_state, timestamp) tuples
-        self.private_player_buffer = []
+        # Buffer is used in match start logic only (latest public state per account + recent private states)
+        self.prematch_buffer = _new_prematch_buffer()
         
         # Match counts for players (calculated at match start)
         self.player_match_counts = {}  # account_id -> match_count
@@ -101,8 +294,16 @@ class MatchState:
         self.latest_processed_public_player_states = {}
         self.latest_processed_private_player_state = {}
         self.sequences = {}
-        self.public_player_buffer = []
-        self.private_player_buffer = []
+        self.public_state_fingerprints = {}
+        self.indexed_players = {}
+        self.slot_to_account = {}
+        self.alive_accounts = {}
+        self.eliminated_accounts = set()
+        self.placements = {}
+        self._slot_partition = None
+        self.hero_pool = HeroPoolTracker()
+        self.timeline = MatchTimeline()
+        self.prematch_buffer = _new_prematch_buffer()
         self.player_match_counts = {}
         
         # Reset round tracking
@@ -122,16 +323,53 @@ class MatchState:
         self.latest_matchup_prediction = None
         self.gsi_emulated = False
 
+    def index_public_state(self, account_id: int, state) -> None:
+        """Update the slot/placement indexes for a newly stored (or edited) public player state."""
+        slot = state.get('player_slot')
+        final_place = state.get('final_place') or 0
+        previous = self.indexed_players.get(account_id)
+        if previous == (slot, final_place):
+            return
+        
+        if previous is not None:
+            previous_slot, previous_place = previous
+            if self.slot_to_account.get(previous_slot) == account_id:
+                del self.slot_to_account[previous_slot]
+            if self.placements.get(previous_place) == account_id:
+                del self.placements[previous_place]
+        
+        self.indexed_players[account_id] = (slot, final_place)
+        if slot is not None:
+            self.slot_to_account[slot] = account_id
+        if final_place > 0:
+            self.placements[final_place] = account_id
+            self.alive_accounts.pop(account_id, None)
+            self.eliminated_accounts.add(account_id)
+        else:
+            self.eliminated_accounts.discard(account_id)
+            self.alive_accounts.setdefault(account_id, None)
+        self._slot_partition = None
+    
+    def alive_and_eliminated_slots(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Sorted player slots of alive and eliminated players (players without a slot are left out)."""
+        if self._slot_partition is None:
+            alive = []
+            eliminated = []
+            for slot, final_place in self.indexed_players.values():
+                if slot is None:
+                    continue
+                (eliminated if final_place > 0 else alive).append(int(slot))
+            self._slot_partition = (tuple(sorted(alive)), tuple(sorted(eliminated)))
+        return self._slot_partition
+
     def reset_for_new_match_preserve_buffers(self):
         """Reset active match runtime state but keep pre-match buffers for bootstrap processing."""
         # Keep buffered pre-match states so process_buffered_data can consume them.
-        buffered_public = self.public_player_buffer
-        buffered_private = self.private_player_buffer
+        prematch_buffer = self.prematch_buffer
 
         self.reset()
 
-        self.public_player_buffer = buffered_public
-        self.private_player_buffer = buffered_private
+        self.prematch_buffer = prematch_buffer
 
 
 # Global match state
@@ -194,11 +432,7 @@ def detect_and_record_combat(account_id: int, current_state: Dict, previous_stat
         result = 'unknown'
     
     # Get opponent account_id
-    opponent_account_id = None
-    for opp_account_id, opp_state in match_state.latest_processed_public_player_states.items():
-        if opp_state.get('player_slot') == opponent_slot:
-            opponent_account_id = opp_account_id
-            break
+    opponent_account_id = match_state.slot_to_account.get(opponent_slot)
     
     if opponent_account_id is None:
         # Opponent not found, can't create record
@@ -275,10 +509,7 @@ def update_round_from_combat_type(account_id: int, combat_type: int):
     if prev_combat_type == 0 and combat_type != 0:
         match_state.round_phase = 'combat'
         # Snapshot alive player count at the start of combat for next-round prediction context
-        alive_count = 0
-        for player in match_state.latest_processed_public_player_states.values():
-            if player.get('final_place', 0) == 0:
-                alive_count += 1
+        alive_count = len(match_state.alive_accounts)
         match_state.previous_alive_player_count = alive_count if alive_count > 0 else None
         # Start collecting oriented pairs for the current combat round
         match_state.previous_round_oriented_pairs = set()
@@ -302,11 +533,43 @@ def update_round_from_combat_type(account_id: int, combat_type: int):
 # State Processing Functions
 # ==========================================
 
-def process_and_store_gsi_public_player_state(account_id: int, gsi_public_player_state: Dict, timestamp: datetime) -> Dict:
+# Raw public_player_state fields that make up a processed snapshot (everything but sequence_number)
+_PUBLIC_STATE_FINGERPRINT_FIELDS = (
+    'persona_name', 'bot_persona_name', 'player_slot', 'is_human_player',
+    'health', 'gold', 'level', 'xp', 'next_level_xp',
+    'wins', 'losses', 'win_streak', 'lose_streak', 'net_worth', 'final_place',
+    'combat_type', 'combat_result', 'combat_duration', 'opponent_player_slot',
+    'board_unit_limit', 'units', 'item_slots', 'synergies',
+    'underlord', 'underlord_selected_talents',
+    'event_tier', 'owns_event', 'is_mirrored_match',
+    'connection_status', 'disconnected_time',
+    'vs_opponent_wins', 'vs_opponent_losses', 'vs_opponent_draws',
+    'brawny_kills_float', 'city_prestige_level', 'rank_tier', 'global_leaderboard_rank', 'platform',
+    'board_buddy', 'lobby_team',
+)
+
+
+def public_state_fingerprint(gsi_public_player_state: Dict) -> tuple:
+    """Fingerprint of the meaningful fields of a raw public player state plus the current round.
+    
+    A tuple of the raw field values - compared with == (C-level, nested lists/dicts included),
+    never serialized or hashed, so building it costs one lookup per field.
+    """
+    get = gsi_public_player_state.get
+    return (match_state.round_number, match_state.round_phase) + tuple(get(field) for field in _PUBLIC_STATE_FINGERPRINT_FIELDS)
+
+
+def is_unchanged_public_state(account_id: int, gsi_public_player_state: Dict) -> bool:
+    """True if the state matches the last processed state for this player (only sequence_number moved)."""
+    previous = match_state.public_state_fingerprints.get(account_id)
+    return previous is not None and previous == public_state_fingerprint(gsi_public_player_state)
+
+
+def process_and_store_gsi_public_player_state(account_id: int, gsi_public_player_state: Dict, timestamp: datetime) -> PublicPlayerState:
     """Process raw GSI public player state data and store in match state.
     
     Returns:
-        Dict: Processed public player state data
+        PublicPlayerState: Processed public player state data
     """
     # Update round tracking based on combat_type transitions
     update_round_from_combat_type(account_id, gsi_public_player_state.get('combat_type'))
@@ -316,88 +579,92 @@ def process_and_store_gsi_public_player_state(account_id: int, gsi_public_player
     
     # Build full player state with comprehensive data
     # Use GSI data directly - missing fields will be None (no hardcoded fallbacks)
-    processed_public_player_state = {
+    processed_public_player_state = PublicPlayerState(
         # Basic player info
-        'account_id': account_id,  # Normalized account_id (int) - bots end with "000", humans use raw account_id
-        'persona_name': gsi_public_player_state.get('persona_name'),  # Only for humans
-        'bot_persona_name': gsi_public_player_state.get('bot_persona_name'),  # Only for bots
-        'player_slot': gsi_public_player_state.get('player_slot'),
-        'is_human_player': gsi_public_player_state.get('is_human_player'),
+        account_id=account_id,  # Normalized account_id (int) - bots end with "000", humans use raw account_id
+        persona_name=gsi_public_player_state.get('persona_name'),  # Only for humans
+        bot_persona_name=gsi_public_player_state.get('bot_persona_name'),  # Only for bots
+        player_slot=gsi_public_player_state.get('player_slot'),
+        is_human_player=gsi_public_player_state.get('is_human_player'),
         
         # Core stats
-        'health': gsi_public_player_state.get('health'),
-        'gold': gsi_public_player_state.get('gold'),
-        'level': gsi_public_player_state.get('level'),
-        'xp': gsi_public_player_state.get('xp'),
-        'next_level_xp': gsi_public_player_state.get('next_level_xp'),
+        health=gsi_public_player_state.get('health'),
+        gold=gsi_public_player_state.get('gold'),
+        level=gsi_public_player_state.get('level'),
+        xp=gsi_public_player_state.get('xp'),
+        next_level_xp=gsi_public_player_state.get('next_level_xp'),
         
         # Match performance
-        'wins': gsi_public_player_state.get('wins'),
-        'losses': gsi_public_player_state.get('losses'),
-        'win_streak': gsi_public_player_state.get('win_streak'),
-        'lose_streak': gsi_public_player_state.get('lose_streak'),
-        'net_worth': gsi_public_player_state.get('net_worth'),
-        'final_place': gsi_public_player_state.get('final_place'),
+        wins=gsi_public_player_state.get('wins'),
+        losses=gsi_public_player_state.get('losses'),
+        win_streak=gsi_public_player_state.get('win_streak'),
+        lose_streak=gsi_public_player_state.get('lose_streak'),
+        net_worth=gsi_public_player_state.get('net_worth'),
+        final_place=gsi_public_player_state.get('final_place'),
         
         # Combat data
-        'combat_type': gsi_public_player_state.get('combat_type'),
-        'combat_result': gsi_public_player_state.get('combat_result'),
-        'combat_duration': gsi_public_player_state.get('combat_duration'),
-        'opponent_player_slot': gsi_public_player_state.get('opponent_player_slot'),
+        combat_type=gsi_public_player_state.get('combat_type'),
+        combat_result=gsi_public_player_state.get('combat_result'),
+        combat_duration=gsi_public_player_state.get('combat_duration'),
+        opponent_player_slot=gsi_public_player_state.get('opponent_player_slot'),
         
         # Board and units
-        'board_unit_limit': gsi_public_player_state.get('board_unit_limit'),
-        'units': gsi_public_player_state.get('units'),
-        'item_slots': gsi_public_player_state.get('item_slots'),
-        'synergies': gsi_public_player_state.get('synergies'),
+        board_unit_limit=gsi_public_player_state.get('board_unit_limit'),
+        units=records_from_gsi(UnitRecord, gsi_public_player_state.get('units')),
+        item_slots=records_from_gsi(ItemSlotRecord, gsi_public_player_state.get('item_slots')),
+        synergies=records_from_gsi(SynergyRecord, gsi_public_player_state.get('synergies')),
         
         # Underlord data
-        'underlord': gsi_public_player_state.get('underlord'),
-        'underlord_selected_talents': gsi_public_player_state.get('underlord_selected_talents'),
+        underlord=gsi_public_player_state.get('underlord'),
+        underlord_selected_talents=gsi_public_player_state.get('underlord_selected_talents'),
         
         # Event and special data
-        'event_tier': gsi_public_player_state.get('event_tier'),
-        'owns_event': gsi_public_player_state.get('owns_event'),
-        'is_mirrored_match': gsi_public_player_state.get('is_mirrored_match'),
+        event_tier=gsi_public_player_state.get('event_tier'),
+        owns_event=gsi_public_player_state.get('owns_event'),
+        is_mirrored_match=gsi_public_player_state.get('is_mirrored_match'),
         
         # Connection status
-        'connection_status': gsi_public_player_state.get('connection_status'),
-        'disconnected_time': gsi_public_player_state.get('disconnected_time'),
+        connection_status=gsi_public_player_state.get('connection_status'),
+        disconnected_time=gsi_public_player_state.get('disconnected_time'),
         
         # VS opponent stats
-        'vs_opponent_wins': gsi_public_player_state.get('vs_opponent_wins'),
-        'vs_opponent_losses': gsi_public_player_state.get('vs_opponent_losses'),
-        'vs_opponent_draws': gsi_public_player_state.get('vs_opponent_draws'),
+        vs_opponent_wins=gsi_public_player_state.get('vs_opponent_wins'),
+        vs_opponent_losses=gsi_public_player_state.get('vs_opponent_losses'),
+        vs_opponent_draws=gsi_public_player_state.get('vs_opponent_draws'),
         
         # Special mechanics
-        'brawny_kills_float': gsi_public_player_state.get('brawny_kills_float'),
+        brawny_kills_float=gsi_public_player_state.get('brawny_kills_float'),
 
         # Player data
-        'city_prestige_level': gsi_public_player_state.get('city_prestige_level'),
-        'rank_tier': gsi_public_player_state.get('rank_tier'),
-        'global_leaderboard_rank': gsi_public_player_state.get('global_leaderboard_rank'),
-        'platform': gsi_public_player_state.get('platform'),
+        city_prestige_level=gsi_public_player_state.get('city_prestige_level'),
+        rank_tier=gsi_public_player_state.get('rank_tier'),
+        global_leaderboard_rank=gsi_public_player_state.get('global_leaderboard_rank'),
+        platform=gsi_public_player_state.get('platform'),
         
         # Board buddy
-        'board_buddy': gsi_public_player_state.get('board_buddy'),
+        board_buddy=gsi_public_player_state.get('board_buddy'),
         
         # Lobby info
-        'lobby_team': gsi_public_player_state.get('lobby_team'),
+        lobby_team=gsi_public_player_state.get('lobby_team'),
         
         # Technical
-        'sequence_number': gsi_public_player_state.get('sequence_number'),
-        'timestamp': timestamp.isoformat(),
+        sequence_number=gsi_public_player_state.get('sequence_number'),
+        timestamp=timestamp.isoformat(),
         
         # Round tracking
-        'round_number': match_state.round_number,
-        'round_phase': match_state.round_phase,
+        round_number=match_state.round_number,
+        round_phase=match_state.round_phase,
         
         # Match count (how many previous matches we've seen this player in)
-        'match_count': match_state.player_match_counts.get(account_id, 0)
-    }
+        match_count=match_state.player_match_counts.get(account_id, 0)
+    )
     
     # Store in match state
     match_state.latest_processed_public_player_states[account_id] = processed_public_player_state
+    match_state.public_state_fingerprints[account_id] = public_state_fingerprint(gsi_public_player_state)
+    match_state.index_public_state(account_id, processed_public_player_state)
+    match_state.hero_pool.update_player(account_id, processed_public_player_state.units)
+    match_state.timeline.append(account_id, processed_public_player_state, timestamp)
     
     # Detect combat completion (if we have previous state)
     if previous_state is not None:
@@ -406,39 +673,39 @@ def process_and_store_gsi_public_player_state(account_id: int, gsi_public_player
     return processed_public_player_state
 
 
-def process_and_store_gsi_private_player_state(gsi_private_player_state: Dict, timestamp: datetime) -> Dict:
+def process_and_store_gsi_private_player_state(gsi_private_player_state: Dict, timestamp: datetime) -> PrivatePlayerState:
     """Process raw GSI private player state data and store in match state.
     
     Returns:
-        Dict: Processed private player state data
+        PrivatePlayerState: Processed private player state data
     """
     # Build comprehensive private player state
-    processed_private_player_state = {
+    processed_private_player_state = PrivatePlayerState(
         # Basic info
-        'player_slot': gsi_private_player_state.get('player_slot'),
-        'sequence_number': gsi_private_player_state.get('sequence_number'),
+        player_slot=gsi_private_player_state.get('player_slot'),
+        sequence_number=gsi_private_player_state.get('sequence_number'),
         
         # Shop & Economy
-        'shop_units': gsi_private_player_state.get('shop_units'),
-        'shop_locked': gsi_private_player_state.get('shop_locked'),
-        'reroll_cost': gsi_private_player_state.get('reroll_cost'),
-        'gold_earned_this_round': gsi_private_player_state.get('gold_earned_this_round'),
-        'shop_generation_id': gsi_private_player_state.get('shop_generation_id'),
+        shop_units=gsi_private_player_state.get('shop_units'),
+        shop_locked=gsi_private_player_state.get('shop_locked'),
+        reroll_cost=gsi_private_player_state.get('reroll_cost'),
+        gold_earned_this_round=gsi_private_player_state.get('gold_earned_this_round'),
+        shop_generation_id=gsi_private_player_state.get('shop_generation_id'),
         
         # Underlord Selection
-        'can_select_underlord': gsi_private_player_state.get('can_select_underlord'),
-        'underlord_picker_offering': gsi_private_player_state.get('underlord_picker_offering'),
+        can_select_underlord=gsi_private_player_state.get('can_select_underlord'),
+        underlord_picker_offering=gsi_private_player_state.get('underlord_picker_offering'),
         
         # Challenges & Rewards
-        #'challenges': gsi_private_player_state.get('challenges'),
-        #'unclaimed_reward_count': gsi_private_player_state.get('unclaimed_reward_count'),
-        #'oldest_unclaimed_reward': gsi_private_player_state.get('oldest_unclaimed_reward'),
-        'used_item_reward_reroll_this_round': gsi_private_player_state.get('used_item_reward_reroll_this_round'),
-        #'grants_rewards': gsi_private_player_state.get('grants_rewards'),
+        #challenges=gsi_private_player_state.get('challenges'),
+        #unclaimed_reward_count=gsi_private_player_state.get('unclaimed_reward_count'),
+        #oldest_unclaimed_reward=gsi_private_player_state.get('oldest_unclaimed_reward'),
+        used_item_reward_reroll_this_round=gsi_private_player_state.get('used_item_reward_reroll_this_round'),
+        #grants_rewards=gsi_private_player_state.get('grants_rewards'),
         
         # Timestamp
-        'timestamp': timestamp.isoformat()
-    }
+        timestamp=timestamp.isoformat()
+    )
     
     # Store in match state (only one private player - client owner)
     match_state.latest_processed_private_player_state = processed_private_player_state
@@ -446,30 +713,206 @@ def process_and_store_gsi_private_player_state(gsi_private_player_state: Dict, t
     return processed_private_player_state
 
 
+# ==========================================
+# Realtime Stream (keyframes + deltas)
+# ==========================================
+
+class MatchUpdateStream:
+    """Turns full match frames into a keyframe/delta WebSocket stream.
+    
+    Every frame gets a monotonically increasing frame number. A full 'match_update' keyframe
+    goes out for the first frame of a match, every keyframe_interval frames and whenever a
+    keyframe is requested; all other frames are sent as 'match_delta' and only carry the
+    players/fields that changed since the previous frame. Hero pool counts follow the same
+    rule per hero: keyframes carry every count, deltas only the heroes whose count moved.
+    """
+    
+    # Top-level frame fields that are sent whole when they change
+    HEADER_FIELDS = ('match', 'private_player_account_id', 'current_round', 'gsi_emulated', 'matchup_prediction', 'shop_odds')
+    
+    def __init__(self, keyframe_interval: int = 100):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.reset()
+    
+    def reset(self):
+        """Forget the last frame - the next frame will be a keyframe."""
+        self.match_id = None
+        self.frame = 0
+        self.frames_since_keyframe = 0
+        self.keyframe_requested = False
+        self.last_public_states = {}    # account_id -> shallow copy of the last sent state
+        self.last_private_state = None  # shallow copy of the last sent private state
+        self.last_header = {}           # HEADER_FIELDS -> last sent value
+        self.last_hero_pool = None      # unit_id -> PoolCount as last sent
+    
+    def request_keyframe(self):
+        """Force the next broadcast frame to be a full keyframe."""
+        self.keyframe_requested = True
+    
+    def _needs_keyframe(self, match_id: str) -> bool:
+        return (
+            self.keyframe_requested
+            or self.frame == 0
+            or match_id != self.match_id
+            or self.frames_since_keyframe >= self.keyframe_interval
+        )
+    
+    @staticmethod
+    def _changed_fields(previous: Optional[Dict], current: Dict) -> Dict:
+        if previous is None:
+            return dict(current)
+        return {key: value for key, value in current.items() if key not in previous or previous[key] != value}
+    
+    def _remember(self, match_id: str, public_states: Dict, private_state: Optional[Dict], header: Dict):
+        self.match_id = match_id
+        self.last_public_states = {account_id: dict(state) for account_id, state in public_states.items()}
+        self.last_private_state = dict(private_state) if private_state else private_state
+        self.last_header = dict(header)
+    
+    def _keyframe_payload(self, public_states: Dict, private_state: Optional[Dict], header: Dict, timestamp: float,
+                          hero_pool: Optional[Dict] = None) -> Dict:
+        payload = {
+            **header,
+            'public_player_states': list(public_states.values()),
+            'private_player_state': private_state,
+            'timestamp': timestamp,
+            'frame': self.frame,
+            'keyframe': True,
+        }
+        if hero_pool is not None:
+            payload['hero_pool'] = dict(hero_pool)
+        return payload
+    
+    def next_frame(self, match_id: str, public_states: Dict, private_state: Optional[Dict], header: Dict, timestamp: float,
+                   hero_pool: Optional[HeroPoolTracker] = None) -> Tuple[str, Dict]:
+        """
+        Build the next frame.
+        
+        Returns:
+            tuple: (event_name, payload) - ('match_update', keyframe) or ('match_delta', delta)
+        """
+        if self._needs_keyframe(match_id):
+            if match_id != self.match_id:
+                self.frame = 0
+            self.frame += 1
+            self.frames_since_keyframe = 0
+            self.keyframe_requested = False
+            self.last_hero_pool = hero_pool.counts() if hero_pool is not None else None
+            payload = self._keyframe_payload(public_states, private_state, header, timestamp, self.last_hero_pool)
+            self._remember(match_id, public_states, private_state, header)
+            return 'match_update', payload
+        
+        self.frame += 1
+        self.frames_since_keyframe += 1
+        delta = {
+            'match_id': match_id,
+            'frame': self.frame,
+            'base_frame': self.frame - 1,
+            'keyframe': False,
+            'timestamp': timestamp,
+        }
+        
+        changed_players = {}
+        for account_id, state in public_states.items():
+            changed = self._changed_fields(self.last_public_states.get(account_id), state)
+            if changed:
+                changed_players[str(account_id)] = changed
+        if changed_players:
+            delta['public_player_states'] = changed_players
+        removed = [account_id for account_id in self.last_public_states if account_id not in public_states]
+        if removed:
+            delta['removed_account_ids'] = removed
+        
+        if private_state != self.last_private_state:
+            if private_state is None or self.last_private_state is None:
+                delta['private_player_state'] = private_state
+            else:
+                delta['private_player_state'] = self._changed_fields(self.last_private_state, private_state)
+        
+        for field in self.HEADER_FIELDS:
+            if field in header:
+                if field not in self.last_header or self.last_header[field] != header[field]:
+                    delta[field] = header[field]
+            elif field in self.last_header:
+                # Dropped from the header (e.g. no prediction this round) - clear it on the client
+                delta[field] = None
+        
+        if hero_pool is not None:
+            last_pool = self.last_hero_pool
+            if last_pool is None:
+                self.last_hero_pool = last_pool = {}
+            changed_pool = {}
+            for unit_id, remaining in hero_pool.remaining.items():
+                sent = last_pool.get(unit_id)
+                if sent is None or sent['remaining'] != max(0, remaining):
+                    changed_pool[unit_id] = last_pool[unit_id] = hero_pool.count(unit_id)
+            if changed_pool:
+                delta['hero_pool'] = changed_pool
+        
+        self._remember(match_id, public_states, private_state, header)
+        return 'match_delta', delta
+    
+    def client_keyframe(self) -> Optional[Dict]:
+        """Rebuild the current frame as a keyframe for a single (re)connecting client."""
+        if self.frame == 0 or self.match_id is None:
+            return None
+        return self._keyframe_payload(self.last_public_states, self.last_private_state, self.last_header, time.time(), self.last_hero_pool)
+
+
+match_update_stream = MatchUpdateStream(keyframe_interval=MATCH_UPDATE_KEYFRAME_INTERVAL)
+
+
 def emit_realtime_update():
-    """Emit real-time update directly from in-memory game state."""
-    if not match_state.match_id or len(connected_clients) == 0:
+    """Emit real-time update directly from in-memory game state (keyframe or delta frame)."""
+    if not match_state.match_id:
+        return
+    if len(connected_clients) == 0:
+        # Nobody is tracking the stream - the next client starts from a fresh keyframe
+        match_update_stream.reset()
         return
     
-    # Build update payload from memory
-    update_data = {
+    # Build frame header from memory
+    header = {
         'match': {
             'match_id': match_state.match_id,
             'started_at': match_state.match_start.isoformat() if match_state.match_start else None,
             'player_count': len(match_state.latest_processed_public_player_states)
         },
-        'public_player_states': list(match_state.latest_processed_public_player_states.values()),
-        'private_player_state': match_state.latest_processed_private_player_state,  # Private data for client owner
         'private_player_account_id': match_state.private_player_account_id,  # Resolved by player_slot matching
         'current_round': {
             'round_number': match_state.round_number,
             'round_phase': match_state.round_phase
         },
-        'timestamp': time.time(),
         'gsi_emulated': match_state.gsi_emulated,
     }
     
-    # Add combat results if there are new combats
+    # Add matchup prediction data for the current round
+    try:
+        prediction_payload = matchup_predictor_service.get_current_prediction(match_state)
+        if prediction_payload is not None:
+            header['matchup_prediction'] = prediction_payload
+    except Exception as e:
+        print(f"[MATCHUP PREDICTOR] Failed to compute prediction: {e}")
+    
+    # Shop odds for the private player (cached per pool version + level, so unchanged frames reuse the same payload)
+    try:
+        shop_odds_payload = shop_odds_engine.get_current_odds(match_state, summary=True)
+        if shop_odds_payload is not None:
+            header['shop_odds'] = shop_odds_payload
+    except Exception as e:
+        print(f"[SHOP ODDS] Failed to compute shop odds: {e}")
+    
+    # Socket edge: slotted player states become plain dicts here
+    event_name, update_data = match_update_stream.next_frame(
+        match_state.match_id,
+        {account_id: as_dict(state) for account_id, state in match_state.latest_processed_public_player_states.items()},
+        as_dict(match_state.latest_processed_private_player_state),  # Private data for client owner
+        header,
+        time.time(),
+        hero_pool=match_state.hero_pool,
+    )
+    
+    # Add combat results if there are new combats (events - never part of the delta baseline)
     if match_state.new_combats_this_update:
         # Convert to JSON-serializable format (account_id as string key for JSON)
         combat_results = {}
@@ -478,17 +921,115 @@ def emit_realtime_update():
         update_data['combat_results'] = combat_results
         # Clear after adding to payload
         match_state.new_combats_this_update = {}
-
-    # Add matchup prediction data for the current round
-    try:
-        prediction_payload = matchup_predictor_service.get_current_prediction(match_state)
-        if prediction_payload is not None:
-            update_data['matchup_prediction'] = prediction_payload
-    except Exception as e:
-        print(f"[MATCHUP PREDICTOR] Failed to compute prediction: {e}")
     
     # Emit immediately - broadcast to ALL connected clients!
-    socketio.emit('match_update', update_data, to=None)
+    socketio.emit(event_name, update_data, to=None)
+
+
+def emit_keyframe_to_client(sid):
+    """Send the current frame as a full keyframe to one client (new connection or resync request)."""
+    if not match_state.match_id:
+        return
+    
+    payload = match_update_stream.client_keyframe()
+    if payload is None:
+        # Nothing broadcast for this match yet - start the stream with a keyframe for everyone
+        match_update_stream.request_keyframe()
+        match_update_scheduler.flush()
+        return
+    socketio.emit('match_update', payload, to=sid)
+
+
+class MatchUpdateScheduler:
+    """
+    Coalesces realtime broadcasts.
+    
+    GSI handlers mark the state dirty instead of emitting. The first update after a quiet
+    period is flushed immediately (leading edge); updates arriving within the rate window are
+    folded into a single trailing flush. player_changes are buffered per player and merged
+    across the window, combat results keep accumulating in match_state.new_combats_this_update
+    until the flush picks them up. All methods except the timer callback expect data_lock held.
+    """
+    
+    def __init__(self, max_rate_hz: float = 10.0):
+        self.min_interval = 1.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+        self._dirty = False
+        self._last_flush = 0.0   # time.monotonic() of the last flush
+        self._timer = None       # pending trailing-flush timer
+        self._pending_changes = {}  # (match_id, account_id) -> merged player_changes payload
+        self.stats = {
+            'requests': 0,   # int - mark_dirty() calls
+            'flushes': 0,    # int - broadcasts sent
+            'coalesced': 0,  # int - requests folded into a later flush
+        }
+    
+    def queue_player_changes(self, match_id: str, account_id: int, changes: List[Dict], timestamp: datetime, gsi_emulated: bool):
+        """Buffer a player_changes event; changes for the same player are merged until the next flush."""
+        key = (match_id, account_id)
+        pending = self._pending_changes.get(key)
+        if pending is None:
+            self._pending_changes[key] = {
+                'match_id': match_id,
+                'account_id': account_id,
+                'changes': list(changes),
+                'timestamp': timestamp.isoformat(),
+                'gsi_emulated': gsi_emulated,
+            }
+        else:
+            pending['changes'].extend(changes)
+            pending['timestamp'] = timestamp.isoformat()
+    
+    def mark_dirty(self):
+        """Request a broadcast - flush now if the rate window allows it, otherwise schedule one."""
+        self.stats['requests'] += 1
+        self._dirty = True
+        if self._timer is not None:
+            self.stats['coalesced'] += 1
+            return
+        wait = self._last_flush + self.min_interval - time.monotonic()
+        if wait <= 0:
+            self.flush()
+            return
+        self.stats['coalesced'] += 1
+        timer = threading.Timer(wait, self._trailing_flush)
+        timer.args = (timer,)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+    
+    def _trailing_flush(self, timer):
+        with data_lock:
+            if self._timer is not timer:
+                return  # Cancelled or superseded by a forced flush
+            self._timer = None
+            if self._dirty:
+                self.flush()
+    
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def flush(self):
+        """Emit buffered player_changes and the current frame right away (e.g. before match end)."""
+        self._cancel_timer()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self.stats['flushes'] += 1
+        
+        pending_changes, self._pending_changes = self._pending_changes, {}
+        for payload in pending_changes.values():
+            socketio.emit('player_changes', payload, to=None)
+        emit_realtime_update()
+    
+    def reset(self):
+        """Drop anything pending (match abandoned)."""
+        self._cancel_timer()
+        self._dirty = False
+        self._pending_changes = {}
+
+
+match_update_scheduler = MatchUpdateScheduler(max_rate_hz=MATCH_UPDATE_MAX_RATE_HZ)
 
 
 # ==========================================
@@ -548,26 +1089,24 @@ def check_match_end(match_id: str, timestamp: datetime, persist_to_db: bool = Tr
     if not match_state.latest_processed_public_player_states:
         return False
     
-    # Count players with final_place > 0
-    eliminated = [p for p in match_state.latest_processed_public_player_states.values() if p.get('final_place', 0) > 0]
-    still_playing = [p for p in match_state.latest_processed_public_player_states.values() if p.get('final_place', 0) == 0]
+    # Placement indexes are maintained by MatchState.index_public_state - no scans here
+    alive_accounts = match_state.alive_accounts
+    placements = match_state.placements
     
     # Check if someone got 2nd place
-    second_place = [p for p in match_state.latest_processed_public_player_states.values() if p.get('final_place', 0) == 2]
-    if second_place:
+    if 2 in placements:
         # Check if winner (final_place = 1) already exists
-        winner = [p for p in match_state.latest_processed_public_player_states.values() if p.get('final_place', 0) == 1]
-        
-        if not winner and still_playing:
+        if 1 not in placements and alive_accounts:
             # No winner yet, assign it to the remaining player
-            winner_player = still_playing[0]
-            winner_id = winner_player['account_id']
-            print(f"[MATCH END] Player {second_place[0]['account_id']} got 2nd, marking {winner_id} as winner")
+            winner_id = next(iter(alive_accounts))
+            print(f"[MATCH END] Player {placements[2]} got 2nd, marking {winner_id} as winner")
             
             # Queue match end transaction to avoid race conditions
             try:
                 # Update in-memory state immediately
-                match_state.latest_processed_public_player_states[winner_id]['final_place'] = 1
+                winner_state = match_state.latest_processed_public_player_states[winner_id]
+                winner_state['final_place'] = 1
+                match_state.index_public_state(winner_id, winner_state)
                 
                 # Queue all match end operations as a single transaction
                 if persist_to_db:
@@ -581,9 +1120,7 @@ def check_match_end(match_id: str, timestamp: datetime, persist_to_db: bool = Tr
                 return False
     
     # After any final_place update, check if ALL players have final places
-    # Recalculate still_playing in case it changed
-    still_playing = [p for p in match_state.latest_processed_public_player_states.values() if p.get('final_place', 0) == 0]
-    if len(still_playing) == 0 and len(match_state.latest_processed_public_player_states) > 0:
+    if not alive_accounts:
         print(f"[MATCH END] All {len(match_state.latest_processed_public_player_states)} players have final places - ending match")
         # All players have final places, just update match end time
         if persist_to_db:
@@ -604,6 +1141,8 @@ def abandon_match(match_id: str, timestamp: datetime, reason: str = "Manual", pe
     
     # Reset match state to allow new game detection
     match_state.reset()
+    match_update_stream.reset()
+    match_update_scheduler.reset()
 
     # Clear change detector buffer and previous states for abandoned match
     change_detector.clear_match(match_id)
@@ -621,41 +1160,12 @@ def abandon_match(match_id: str, timestamp: datetime, reason: str = "Manual", pe
 # Buffer Management Functions
 # ==========================================
 
-def cleanup_buffers():
+def cleanup_buffers(now: Optional[datetime] = None):
     """
-    Clean up buffers to prevent excessive memory usage.
-    Since validation happens on entry, all entries are already valid.
-    Only cleanup needed: limit buffer size and keep latest private state.
+    Evict stale pre-match buffer entries.
+    Buffering already evicts on every insert; this also covers quiet periods with no public packets.
     """
-    # For public player buffer, limit size to prevent memory issues
-    # Keep most recent entries (in case match detection is delayed)
-    MAX_PUBLIC_BUFFER_SIZE = 1000
-    if len(match_state.public_player_buffer) > MAX_PUBLIC_BUFFER_SIZE:
-        # Keep the most recent entries
-        removed_count = len(match_state.public_player_buffer) - MAX_PUBLIC_BUFFER_SIZE
-        match_state.public_player_buffer = match_state.public_player_buffer[-MAX_PUBLIC_BUFFER_SIZE:]
-        print(f"[BUFFER CLEANUP] Removed {removed_count} old entries from public_player_buffer (size limit)")
-    
-    # For private player buffer, keep only the latest entry (private state is simpler)
-    # This prevents accumulation of old private states
-    if len(match_state.private_player_buffer) > 1:
-        # Find the latest by sequence number
-        latest_private = None
-        latest_sequence = -1
-        latest_time = None
-        
-        for gsi_private_state, private_time in match_state.private_player_buffer:
-            private_sequence = gsi_private_state.get('sequence_number', 0)
-            if private_sequence > latest_sequence:
-                latest_sequence = private_sequence
-                latest_private = gsi_private_state
-                latest_time = private_time
-        
-        if latest_private is not None:
-            removed_count = len(match_state.private_player_buffer) - 1
-            if removed_count > 0:
-                print(f"[BUFFER CLEANUP] Removed {removed_count} stale entries from private_player_buffer")
-            match_state.private_player_buffer = [(latest_private, latest_time)]
+    match_state.prematch_buffer.evict(now or datetime.now())
 
 
 def _resolve_private_player_account_id(gsi_private_player_state: Dict):
@@ -667,40 +1177,20 @@ def _resolve_private_player_account_id(gsi_private_player_state: Dict):
     if private_slot is None:
         return
 
-    for account_id, public_state in match_state.latest_processed_public_player_states.items():
-        if public_state.get('player_slot') == private_slot:
-            match_state.private_player_account_id = account_id
-            print(f"[GSI] Auto-detected private player account_id: {account_id} (player_slot: {private_slot})")
-            return
+    account_id = match_state.slot_to_account.get(private_slot)
+    if account_id is not None:
+        match_state.private_player_account_id = account_id
+        print(f"[GSI] Auto-detected private player account_id: {account_id} (player_slot: {private_slot})")
+        return
 
     print(f"[GSI] WARNING: Could not resolve private player account_id for player_slot {private_slot}")
 
 
 def process_buffered_data(match_id: str, timestamp: datetime, persist_to_db: bool = True):
     """Process buffered data for newly started match. Derives confirmed players from buffer."""
-    # Copy buffers to local variables before clearing to prevent race conditions
-    # This ensures we only process data that was buffered before match started
-    public_buffer = match_state.public_player_buffer[:]
-    private_buffer = match_state.private_player_buffer[:]
-    
-    # Clear buffers immediately to prevent any new data from being mixed in
-    match_state.public_player_buffer = []
-    match_state.private_player_buffer = []
-    
-    # Derive confirmed players from buffer (should be 8 unique players)
-    # Buffer format: (gsi_state, timestamp, account_id) tuples
-    confirmed_players = set(acc_id for _, _, acc_id in public_buffer)
-    
-    # Process public player states - find and store latest state for each player in one pass
-    latest_public_player_states = {}  # account_id -> (gsi_state, time, sequence)
-    
-    for gsi_buf_state, buf_time, buf_account_id in public_buffer:
-        # Only process confirmed players (all data in buffer should be valid since we validated on entry)
-        if buf_account_id in confirmed_players:
-            buf_sequence = gsi_buf_state.get('sequence_number', 0)
-            if (buf_account_id not in latest_public_player_states or 
-                buf_sequence > latest_public_player_states[buf_account_id][2]):
-                latest_public_player_states[buf_account_id] = (gsi_buf_state, buf_time, buf_sequence)
+    # Take the buffered data and clear the buffer immediately so no new data gets mixed in
+    # The buffer already holds only the latest state (highest sequence) per confirmed player
+    latest_public_player_states, private_buffer, earliest_public_time = match_state.prematch_buffer.drain()
     
     # Process all latest public player states
     for account_id, (gsi_state, time, sequence) in latest_public_player_states.items():
@@ -711,12 +1201,10 @@ def process_buffered_data(match_id: str, timestamp: datetime, persist_to_db: boo
         print(f"[BUFFER] Queued buffered public snapshot for player {account_id}, match {match_id}")
     
     # Process private player states — pick one bootstrap snapshot for shop + slot resolution.
-    # (1) Timestamp: drop packets received before any public packet in this lobby batch.
+    # (1) Timestamp: drop packets received before the first public packet of the buffered players.
     # (2) shop_generation_id must be 0 or 1 — late-match stragglers carry much higher IDs.
     # (3) Among remaining, take the newest snapshot in the low-sequence cluster (new-match era),
     #     not global max sequence (which favors stale post-match packets).
-    earliest_public_time = min(buf_time for _, buf_time, _ in public_buffer) if public_buffer else None
-
     stale_time_count = 0
     rejected_shop_gen_count = 0
     candidates = []  # (gsi_state, private_time, sequence_number)
@@ -2,96 +2,328 @@
 GSI Handler - GSI data processing and database writer
 Handles incoming GSI payloads and delegates to game_state for processing
 """
+import time
 from datetime import datetime
+from queue import Empty, Full
 from .game_state import (
-    match_state, db, stats, db_write_queue, data_lock,
+    match_state, db, stats, db_write_queue, db_writer_stats, data_lock,
+    gsi_ingest_queue, ingest_stats,
     process_and_store_gsi_public_player_state, process_and_store_gsi_private_player_state,
-    emit_realtime_update, start_new_match, process_buffered_data, check_match_end,
-    abandon_match, _resolve_private_player_account_id
+    match_update_scheduler, match_update_stream, start_new_match, process_buffered_data, check_match_end, cleanup_buffers,
+    abandon_match, _resolve_private_player_account_id, is_unchanged_public_state
 )
 from .utils import generate_bot_account_id, is_valid_new_player
-from .config import socketio
+from .config import (
+    socketio, DB_WRITER_BATCH_MAX_TASKS, DB_WRITER_BATCH_MAX_WAIT_MS,
+    GSI_INGEST_OVERFLOW_POLICY, GSI_INGEST_BLOCK_TIMEOUT_MS,
+)
 from .change_detector import change_detector
 
 
+def _apply_db_write_task(task) -> bool:
+    """Apply one non-insert writer task inside its own savepoint. Returns True on success."""
+    # Handle different task types - only support new format with task type
+    if not (isinstance(task, tuple) and len(task) >= 2 and isinstance(task[0], str)):
+        print(f"[DB Writer] ERROR: Invalid task format: {task}")
+        print(f"[DB Writer] Expected format: (task_type, ...) where task_type is a string")
+        return False  # Skip invalid tasks
+    
+    task_type = task[0]
+    try:
+        with db.savepoint('task'):
+            if task_type == 'insert_snapshot':
+                # Insert task: (task_type, match_id, player_category, account_id, player_data, timestamp)
+                _, match_id, player_category, account_id, player_data, timestamp = task
+                db.insert_snapshot(match_id, player_category, account_id, player_data, timestamp)
+            
+            elif task_type == 'insert_changes':
+                # Change events: (task_type, match_id, account_id, sequence_number, round_number, round_phase, changes)
+                _, match_id, account_id, sequence_number, round_number, round_phase, changes = task
+                db.insert_changes(match_id, account_id, sequence_number, round_number, round_phase, changes)
+            
+            elif task_type == 'update_final_place':
+                # Update final place task: (task_type, match_id, account_id, final_place)
+                _, match_id, account_id, final_place = task
+                db.update_match_player_final_place(match_id, account_id, final_place)
+            
+            elif task_type == 'update_player_final_place':
+                # Update player final place in snapshots: (task_type, match_id, account_id, final_place, timestamp)
+                _, match_id, account_id, final_place, timestamp = task
+                db.update_player_final_place(match_id, account_id, final_place, timestamp)
+            
+            elif task_type == 'update_match_end':
+                # Update match end time: (task_type, match_id, timestamp)
+                _, match_id, timestamp = task
+                db.update_match_end_time(match_id, timestamp)
+                db.finalize_match_summary(match_id)
+            
+            elif task_type == 'match_end_transaction':
+                # Complete match end transaction: (task_type, match_id, winner_id, timestamp)
+                # All match end operations share one savepoint, so they land together or not at all
+                _, match_id, winner_id, timestamp = task
+                db.update_player_final_place(match_id, winner_id, 1, timestamp)
+                db.update_match_player_final_place(match_id, winner_id, 1)
+                db.update_match_end_time(match_id, timestamp)
+                db.finalize_match_summary(match_id)
+                print(f"[DB Writer] Match end transaction completed for {match_id}")
+            
+            elif task_type == 'delete_match':
+                # Delete match: (task_type, match_id)
+                _, match_id = task
+                db.delete_match(match_id)
+                print(f"[DB Writer] Match {match_id} deleted")
+            
+            else:
+                print(f"[DB Writer] Unknown task type: {task_type}")
+        return True
+    except Exception as e:
+        print(f"[DB Writer] Task {task_type} failed and was rolled back: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def _flush_snapshot_inserts(insert_tasks) -> int:
+    """
+    Write a run of consecutive insert_snapshot tasks with one executemany per table.
+    If the grouped insert fails, fall back to one savepoint per task so a single bad
+    snapshot does not take the rest of the group down with it.
+    
+    Returns:
+        int: Number of failed tasks
+    """
+    if not insert_tasks:
+        return 0
+    
+    try:
+        with db.savepoint('snapshot_group'):
+            db.insert_snapshots_many([task[1:] for task in insert_tasks])
+        return 0
+    except Exception as e:
+        print(f"[DB Writer] Grouped insert of {len(insert_tasks)} snapshot(s) failed ({e}), retrying one by one")
+    
+    failed = 0
+    for task in insert_tasks:
+        if not _apply_db_write_task(task):
+            failed += 1
+    return failed
+
+
+def _is_insert_snapshot_task(task) -> bool:
+    return isinstance(task, tuple) and len(task) == 6 and task[0] == 'insert_snapshot'
+
+
+def _collect_db_write_batch():
+    """
+    Block for the first task, then keep draining the queue until the batch holds
+    DB_WRITER_BATCH_MAX_TASKS tasks or DB_WRITER_BATCH_MAX_WAIT_MS has passed.
+    
+    Returns:
+        tuple: (tasks, stop_requested, collect_started, oldest_enqueued) - perf_counter() values;
+        oldest_enqueued is when the first (longest-waiting) task was queued
+    """
+    oldest_enqueued, first_task = db_write_queue.get()
+    collect_started = time.perf_counter()
+    if first_task is None:
+        db_write_queue.task_done()
+        return [], True, collect_started, oldest_enqueued
+    
+    batch = [first_task]
+    max_tasks = max(1, DB_WRITER_BATCH_MAX_TASKS)
+    deadline = collect_started + max(0, DB_WRITER_BATCH_MAX_WAIT_MS) / 1000.0
+    while len(batch) < max_tasks:
+        remaining = deadline - time.perf_counter()
+        try:
+            if remaining > 0:
+                _, task = db_write_queue.get(timeout=remaining)
+            else:
+                # Window closed - only take what is already queued
+                _, task = db_write_queue.get_nowait()
+        except Empty:
+            break
+        if task is None:
+            db_write_queue.task_done()
+            return batch, True, collect_started, oldest_enqueued
+        batch.append(task)
+    
+    return batch, False, collect_started, oldest_enqueued
+
+
+def _commit_db_write_batch(batch, collect_started: float, oldest_enqueued: float) -> None:
+    """Apply a batch of writer tasks in one transaction and commit once."""
+    collect_ms = (time.perf_counter() - collect_started) * 1000.0
+    failed = 0
+    insert_count = 0
+    
+    try:
+        db.begin()
+        pending_inserts = []
+        for task in batch:
+            if _is_insert_snapshot_task(task):
+                pending_inserts.append(task)
+                continue
+            # Keep task order: flush queued inserts before anything that may depend on them
+            failed += _flush_snapshot_inserts(pending_inserts)
+            insert_count += len(pending_inserts)
+            pending_inserts = []
+            if not _apply_db_write_task(task):
+                failed += 1
+        failed += _flush_snapshot_inserts(pending_inserts)
+        insert_count += len(pending_inserts)
+        
+        commit_started = time.perf_counter()
+        db.conn.commit()
+        commit_ms = (time.perf_counter() - commit_started) * 1000.0
+    except Exception as e:
+        print(f"[DB Writer] Error: batch of {len(batch)} task(s) failed to commit: {e}")
+        # Rollback on error to ensure clean state
+        try:
+            db.rollback()
+        except Exception:
+            pass  # Ignore rollback errors
+        import traceback
+        traceback.print_exc()
+        failed = len(batch)
+        commit_ms = 0.0
+    finally:
+        for _ in batch:
+            db_write_queue.task_done()
+    
+    # Enqueue-to-commit lag of the task that waited longest (includes its time in db_write_queue)
+    lag_ms = (time.perf_counter() - oldest_enqueued) * 1000.0
+    db_writer_stats['batches'] += 1
+    db_writer_stats['tasks'] += len(batch)
+    db_writer_stats['failed_tasks'] += failed
+    db_writer_stats['last_batch_size'] = len(batch)
+    db_writer_stats['max_batch_size'] = max(db_writer_stats['max_batch_size'], len(batch))
+    db_writer_stats['last_collect_ms'] = round(collect_ms, 3)
+    db_writer_stats['last_commit_ms'] = round(commit_ms, 3)
+    db_writer_stats['max_commit_ms'] = max(db_writer_stats['max_commit_ms'], round(commit_ms, 3))
+    db_writer_stats['last_batch_lag_ms'] = round(lag_ms, 3)
+    db_writer_stats['max_batch_lag_ms'] = max(db_writer_stats['max_batch_lag_ms'], round(lag_ms, 3))
+    db_writer_stats['last_commit_at'] = datetime.now()
+    
+    print(
+        f"[DB Writer] Committed batch of {len(batch)} task(s) ({insert_count} snapshot(s), {failed} failed) "
+        f"in {commit_ms:.1f}ms commit / {lag_ms:.1f}ms lag, queue size: {db_write_queue.qsize()}"
+    )
+
+
 def db_writer_worker():
-    """Background thread to write to database (SQLite thread-safe)."""
+    """Background thread to write to database (SQLite thread-safe).
+    
+    Group commit: every wakeup drains the pending tasks into one batch, writes runs of
+    insert_snapshot tasks with executemany, isolates every other task in its own savepoint
+    and commits once per batch.
+    """
     while True:
         try:
-            task = db_write_queue.get()
-            if task is None:
+            batch, stop_requested, collect_started, oldest_enqueued = _collect_db_write_batch()
+            if batch:
+                # Hold the writer lock for the whole batch so no other commit lands mid-transaction
+                with db.write_lock:
+                    _commit_db_write_batch(batch, collect_started, oldest_enqueued)
+            if stop_requested:
                 break
-            
-            # Handle different task types - only support new format with task type
-            if isinstance(task, tuple) and len(task) >= 2 and isinstance(task[0], str):
-                task_type = task[0]
-                
-                if task_type == 'insert_snapshot':
-                    # New insert task: (task_type, match_id, player_category, account_id, player_data, timestamp)
-                    _, match_id, player_category, account_id, player_data, timestamp = task
-                    try:
-                        snapshot_id = db.insert_snapshot(match_id, player_category, account_id, player_data, timestamp)
-                        print(f"[DB Writer] Inserted {player_category} snapshot {snapshot_id} for match {match_id}, player {account_id}")
-                    except Exception as e:
-                        print(f"[DB Writer] Failed to insert snapshot: {e}")
-                        raise
-                
-                elif task_type == 'update_final_place':
-                    # Update final place task: (task_type, match_id, account_id, final_place)
-                    _, match_id, account_id, final_place = task
-                    db.update_match_player_final_place(match_id, account_id, final_place)
-                
-                elif task_type == 'update_player_final_place':
-                    # Update player final place in snapshots: (task_type, match_id, account_id, final_place, timestamp)
-                    _, match_id, account_id, final_place, timestamp = task
-                    db.update_player_final_place(match_id, account_id, final_place, timestamp)
-                
-                elif task_type == 'update_match_end':
-                    # Update match end time: (task_type, match_id, timestamp)
-                    _, match_id, timestamp = task
-                    db.update_match_end_time(match_id, timestamp)
-                
-                elif task_type == 'match_end_transaction':
-                    # Complete match end transaction: (task_type, match_id, winner_id, timestamp)
-                    _, match_id, winner_id, timestamp = task
-                    # Perform all match end operations in a single transaction
-                    try:
-                        db.update_player_final_place(match_id, winner_id, 1, timestamp)
-                        db.update_match_player_final_place(match_id, winner_id, 1)
-                        db.update_match_end_time(match_id, timestamp)
-                        print(f"[DB Writer] Match end transaction completed for {match_id}")
-                    except Exception as e:
-                        print(f"[DB Writer] Match end transaction failed: {e}")
-                        db.conn.rollback()
-                        raise
-                
-                elif task_type == 'delete_match':
-                    # Delete match: (task_type, match_id)
-                    _, match_id = task
-                    db.delete_match(match_id)
-                    print(f"[DB Writer] Match {match_id} deleted")
-                
-                else:
-                    print(f"[DB Writer] Unknown task type: {task_type}")
-            else:
-                print(f"[DB Writer] ERROR: Invalid task format: {task}")
-                print(f"[DB Writer] Expected format: (task_type, ...) where task_type is a string")
-                continue  # Skip invalid tasks
-            
-            # Commit after each successful task
-            db.conn.commit()
-            db_write_queue.task_done()
         except Exception as e:
             print(f"[DB Writer] Error: {e}")
-            # Rollback on error to ensure clean state
-            try:
-                db.conn.rollback()
-            except:
-                pass  # Ignore rollback errors
             import traceback
             traceback.print_exc()
 
 
+def enqueue_gsi_payload(gsi_payload, persist_to_db=True) -> bool:
+    """
+    Queue a GSI packet for the ingest worker (called by /upload).
+    
+    A full queue is handled per GSI_INGEST_OVERFLOW_POLICY. Replay packets (persist_to_db=False)
+    always block instead - the replay tool can wait, and dropping would corrupt the replayed match.
+    
+    Returns:
+        bool: True if the packet was queued
+    """
+    item = (gsi_payload, persist_to_db, time.perf_counter())
+    policy = GSI_INGEST_OVERFLOW_POLICY if persist_to_db else 'replay'
+    try:
+        if policy == 'replay':
+            gsi_ingest_queue.put(item)
+        elif policy == 'block':
+            gsi_ingest_queue.put(item, timeout=GSI_INGEST_BLOCK_TIMEOUT_MS / 1000.0)
+        elif policy == 'drop_newest':
+            gsi_ingest_queue.put_nowait(item)
+        else:
+            # drop_oldest: make room by discarding the packet that has waited longest
+            while True:
+                try:
+                    gsi_ingest_queue.put_nowait(item)
+                    break
+                except Full:
+                    try:
+                        gsi_ingest_queue.get_nowait()
+                        gsi_ingest_queue.task_done()
+                        ingest_stats['dropped_oldest'] += 1
+                    except Empty:
+                        pass
+    except Full:
+        ingest_stats['dropped_newest'] += 1
+        print(f"[GSI] Ingest queue full ({gsi_ingest_queue.qsize()}), dropped incoming packet")
+        return False
+    
+    ingest_stats['enqueued'] += 1
+    depth = gsi_ingest_queue.qsize()
+    if depth > ingest_stats['max_depth']:
+        ingest_stats['max_depth'] = depth
+    return True
+
+
+def gsi_ingest_worker():
+    """Background thread that processes queued GSI packets one at a time, in arrival order."""
+    while True:
+        item = gsi_ingest_queue.get()
+        try:
+            if item is None:  # Shutdown signal
+                break
+            gsi_payload, persist_to_db, enqueued_at = item
+            started = time.perf_counter()
+            wait_ms = (started - enqueued_at) * 1000.0
+            try:
+                process_gsi_data(gsi_payload, persist_to_db)
+            except Exception as e:
+                ingest_stats['failed'] += 1
+                print(f"[GSI] Error processing packet: {e}")
+                import traceback
+                traceback.print_exc()
+            process_ms = (time.perf_counter() - started) * 1000.0
+            
+            ingest_stats['processed'] += 1
+            ingest_stats['last_wait_ms'] = wait_ms
+            ingest_stats['max_wait_ms'] = max(ingest_stats['max_wait_ms'], wait_ms)
+            ingest_stats['last_process_ms'] = process_ms
+            ingest_stats['max_process_ms'] = max(ingest_stats['max_process_ms'], process_ms)
+        finally:
+            gsi_ingest_queue.task_done()
+
+
+def _public_player_account_id(gsi_public_player_state):
+    """Account ID for a public player state - generated for bots, raw for humans."""
+    if gsi_public_player_state.get('is_human_player') is False:
+        return generate_bot_account_id(gsi_public_player_state)
+    return gsi_public_player_state.get('account_id')
+
+
+def _is_stale_sequence(last_sequence, sequence_num):
+    """
+    Sequence pre-filter check: True if a state with sequence_num was already superseded.
+    Counts the drop as duplicate (same sequence) or stale (older sequence).
+    """
+    if last_sequence is None or sequence_num is None or sequence_num > last_sequence:
+        return False
+    if sequence_num == last_sequence:
+        ingest_stats['duplicate_states'] += 1
+    else:
+        ingest_stats['stale_states'] += 1
+    return True
+
+
 def extract_player_states_from_payload(gsi_payload, timestamp):
     """
     Extract and separate private/public player states from GSI payload structure.
@@ -99,8 +331,14 @@ def extract_player_states_from_payload(gsi_payload, timestamp):
     The GSI payload has a nested structure: blocks -> data array -> player states
     Each data object contains either 'private_player_state' or 'public_player_state' key.
     
+    While a match is active, states whose sequence_number is not newer than the last
+    processed one (or an earlier state in the same payload) are dropped here, before
+    any per-state processing. Only sequence_number and the identity fields are read.
+    
     Returns:
-        tuple: (gsi_private_player_states, gsi_public_player_states) where each is a list of (gsi_player_state_data, timestamp) tuples
+        tuple: (gsi_private_player_states, gsi_public_player_states) where private entries are
+        (gsi_player_state_data, timestamp) tuples and public entries are
+        (gsi_player_state_data, timestamp, account_id) tuples
     """
     gsi_private_player_states = []
     gsi_public_player_states = []
@@ -108,6 +346,11 @@ def extract_player_states_from_payload(gsi_payload, timestamp):
     if 'block' not in gsi_payload:
         return gsi_private_player_states, gsi_public_player_states
     
+    # Sequence pre-filter only applies to an active match (the pre-match buffer keeps its own latest-by-sequence)
+    filter_sequences = match_state.match_id is not None
+    sequences = match_state.sequences
+    payload_sequences = {}  # account_id / 'private_sequence' -> highest sequence accepted from this payload
+    
     # Process all block objects in the "block" array
     for block_object in gsi_payload['block']:
         # Skip block objects that don't have "data" key
@@ -127,12 +370,28 @@ def extract_player_states_from_payload(gsi_payload, timestamp):
             # Extract private player state
             if has_private_player_state:
                 gsi_private_player_state = data_object['private_player_state']
+                if filter_sequences:
+                    sequence_num = gsi_private_player_state.get('sequence_number')
+                    last_sequence = payload_sequences.get('private_sequence', sequences.get('private_sequence'))
+                    if _is_stale_sequence(last_sequence, sequence_num):
+                        continue
+                    payload_sequences['private_sequence'] = sequence_num
                 gsi_private_player_states.append((gsi_private_player_state, timestamp))
             
             # Extract public player state
             if has_public_player_state:
                 gsi_public_player_state = data_object['public_player_state']
-                gsi_public_player_states.append((gsi_public_player_state, timestamp))
+                try:
+                    account_id = _public_player_account_id(gsi_public_player_state)
+                except ValueError:
+                    account_id = None  # Malformed bot state - let process_public_player_state report it
+                if filter_sequences and account_id is not None:
+                    sequence_num = gsi_public_player_state.get('sequence_number')
+                    last_sequence = payload_sequences.get(account_id, sequences.get(account_id))
+                    if _is_stale_sequence(last_sequence, sequence_num):
+                        continue
+                    payload_sequences[account_id] = sequence_num
+                gsi_public_player_states.append((gsi_public_player_state, timestamp, account_id))
     
     return gsi_private_player_states, gsi_public_player_states
 
@@ -146,7 +405,7 @@ def process_private_player_state(gsi_private_player_state, timestamp, persist_to
     """
     # No active match - buffer private state separately
     if match_state.match_id is None:
-        match_state.private_player_buffer.append((gsi_private_player_state, timestamp))
+        match_state.prematch_buffer.add_private(gsi_private_player_state, timestamp)
         return False
     
     # Active match mode
@@ -174,21 +433,19 @@ def process_private_player_state(gsi_private_player_state, timestamp, persist_to
     return True
 
 
-def process_public_player_state(gsi_public_player_state, timestamp, persist_to_db=True):
+def process_public_player_state(gsi_public_player_state, timestamp, persist_to_db=True, account_id=None):
     """
     Process public player state - handles both buffering and active match.
     
+    Args:
+        account_id: Account ID already resolved by extract_player_states_from_payload (resolved here if None)
+    
     Returns:
         bool: True if update occurred (state was processed), False otherwise
     """
     # Get account_id - for bots generate it, for humans use raw data
-    is_human = gsi_public_player_state.get('is_human_player')
-    if is_human is False:
-        # Bot player - generate account_id
-        account_id = generate_bot_account_id(gsi_public_player_state)
-    else:
-        # Human player - use account_id directly from raw data
-        account_id = gsi_public_player_state.get('account_id')
+    if account_id is None:
+        account_id = _public_player_account_id(gsi_public_player_state)
     
     # No active match - buffering mode
     if match_state.match_id is None:
@@ -196,37 +453,24 @@ def process_public_player_state(gsi_public_player_state, timestamp, persist_to_d
         if not is_valid_new_player(gsi_public_player_state):
             return False  # Discard invalid data, don't ban player
         
-        # Check current unique players before adding
-        unique_players_before = set(acc_id for _, _, acc_id in match_state.public_player_buffer)
-        is_new_player = account_id not in unique_players_before
-        
-        # Add valid data to buffer (with account_id for tracking unique players)
-        match_state.public_player_buffer.append((gsi_public_player_state, timestamp, account_id))
-        
-        # Check for 8 unique players in buffer
-        unique_players = set(acc_id for _, _, acc_id in match_state.public_player_buffer)
-        unique_count = len(unique_players)
+        # Add valid data to buffer (latest state per account, tracks unique players)
+        buffer = match_state.prematch_buffer
+        is_new_player = buffer.add_public(account_id, gsi_public_player_state, timestamp)
+        unique_count = buffer.unique_player_count
         
         # Log buffering progress
         if is_new_player:
-            print(f"[BUFFER] New player found: {account_id} ({unique_count}/8 unique players in buffer, {len(match_state.public_player_buffer)} total entries)")
+            print(f"[BUFFER] New player found: {account_id} ({unique_count}/8 unique players in buffer, {buffer.public_bytes} bytes buffered)")
         else:
-            print(f"[BUFFER] Update for existing player: {account_id} ({unique_count}/8 unique players in buffer, {len(match_state.public_player_buffer)} total entries)")
+            print(f"[BUFFER] Update for existing player: {account_id} ({unique_count}/8 unique players in buffer, {buffer.public_bytes} bytes buffered)")
         
         if unique_count == 8:
             print(f"[BUFFER] Match detected! Found 8 unique players. Processing buffer...")
-            # Match detected - extract latest state for each of the 8 players
-            # Build dict of latest state per player (by sequence number)
-            latest_states = {}  # account_id -> (gsi_state, timestamp, sequence)
-            
-            for gsi_state, buf_timestamp, buf_account_id in match_state.public_player_buffer:
-                sequence = gsi_state.get('sequence_number', 0)
-                if (buf_account_id not in latest_states or 
-                    sequence > latest_states[buf_account_id][2]):
-                    latest_states[buf_account_id] = (gsi_state, buf_timestamp, sequence)
+            # Match detected - the buffer holds the latest state (by sequence number) for each of the 8 players
+            latest_states = buffer.latest_public_states()  # account_id -> (gsi_state, timestamp, sequence)
             
             # Extract confirmed players and their data
-            confirmed_players = list(unique_players)
+            confirmed_players = list(latest_states)
             match_players_data = [latest_states[acc_id][0] for acc_id in confirmed_players]
             
             print(f"[BUFFER] Starting match with players: {confirmed_players}")
@@ -237,9 +481,7 @@ def process_public_player_state(gsi_public_player_state, timestamp, persist_to_d
             # Process all buffered data for the confirmed players
             process_buffered_data(match_id, timestamp, persist_to_db=persist_to_db)
             
-            # Emit initial state
-            emit_realtime_update()
-            
+            # Initial state goes out with the broadcast scheduled by process_gsi_data
             return True
         
         return False
@@ -272,6 +514,11 @@ def process_public_player_state(gsi_public_player_state, timestamp, persist_to_d
     # Update sequence tracker
     match_state.sequences[account_id] = sequence_num
     
+    # Nothing but the sequence number moved - skip change detection, persistence and broadcast
+    if is_unchanged_public_state(account_id, gsi_public_player_state):
+        ingest_stats['unchanged_states'] += 1
+        return False
+    
     # Update in-memory state and get processed data
     processed_public_state = process_and_store_gsi_public_player_state(account_id, gsi_public_player_state, timestamp)
     
@@ -296,16 +543,27 @@ def process_public_player_state(gsi_public_player_state, timestamp, persist_to_d
         # Add changes to buffer (automatically done by detect_changes, but we need to add them)
         if detected_changes:
             for change in detected_changes:
-                change_detector.add_change(match_state.match_id, change)
+                change_detector.add_change(
+                    match_state.match_id,
+                    change,
+                    round_number=processed_public_state.get('round_number'),
+                    round_phase=processed_public_state.get('round_phase')
+                )
             
-            # Emit player_changes WebSocket event
-            socketio.emit('player_changes', {
-                'match_id': match_state.match_id,
-                'account_id': account_id,
-                'changes': detected_changes,
-                'timestamp': timestamp.isoformat(),
-                'gsi_emulated': match_state.gsi_emulated,
-            }, to=None)
+            # Persist through the DB writer so historical queries don't have to replay snapshots
+            if persist_to_db:
+                db_write_queue.put((
+                    'insert_changes', match_state.match_id, account_id,
+                    processed_public_state.get('sequence_number'),
+                    processed_public_state.get('round_number'),
+                    processed_public_state.get('round_phase'),
+                    detected_changes,
+                ))
+            
+            # Buffer player_changes WebSocket event (merged and sent with the next broadcast)
+            match_update_scheduler.queue_player_changes(
+                match_state.match_id, account_id, detected_changes, timestamp, match_state.gsi_emulated
+            )
     
     # Update previous state for next comparison
     change_detector.update_previous_state(match_state.match_id, account_id, processed_public_state)
@@ -319,8 +577,8 @@ def process_public_player_state(gsi_public_player_state, timestamp, persist_to_d
         
         if check_match_end(match_state.match_id, timestamp, persist_to_db=persist_to_db):
             print(f"[MATCH END] Clearing game state")
-            # Send final update to frontend before resetting
-            emit_realtime_update()
+            # Send final update (and anything coalesced) to frontend before resetting
+            match_update_scheduler.flush()
             # Notify frontend that match ended
             socketio.emit('match_ended', {
                 'match_id': match_state.match_id,
@@ -331,6 +589,8 @@ def process_public_player_state(gsi_public_player_state, timestamp, persist_to_d
             change_detector.clear_match(match_state.match_id)
             # Now reset the state
             match_state.reset()
+            match_update_stream.reset()
+            match_update_scheduler.reset()
     
     return True
 
@@ -354,11 +614,14 @@ def process_gsi_data(gsi_payload, persist_to_db=True):
                 any_updates = True
         
         # Process all public player states
-        for gsi_public_player_state, state_timestamp in gsi_public_player_states:
-            if process_public_player_state(gsi_public_player_state, state_timestamp, persist_to_db=persist_to_db):
+        for gsi_public_player_state, state_timestamp, account_id in gsi_public_player_states:
+            if process_public_player_state(gsi_public_player_state, state_timestamp, persist_to_db=persist_to_db, account_id=account_id):
                 any_updates = True
         
-        # Emit WebSocket update if there were updates
+        # Schedule WebSocket update if there were updates (coalesced to MATCH_UPDATE_MAX_RATE_HZ)
         if any_updates and match_state.match_id:
-            emit_realtime_update()
+            match_update_scheduler.mark_dirty()
+        elif match_state.match_id is None:
+            # Still buffering - drop pre-match entries that went stale
+            cleanup_buffers(timestamp)
 
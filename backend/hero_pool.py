@@ -0,0 +1,148 @@
+"""
+Hero Pool Tracker - remaining shared-pool copies per hero for the active match
+
+Same rules as frontend/src/utils/poolCalculator.ts (cardsPerTier, rank -> copies 1/3/9,
+draft-pool heroes only), but kept incrementally: every processed public state replaces
+only that player's contribution, so an update walks one player's units instead of all
+eight.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional
+
+# Total cards per tier in the pool
+CARDS_PER_TIER = {1: 30, 2: 20, 3: 18, 4: 12, 5: 10}
+# Pool copies held by a unit of each rank
+RANK_POOL_UNITS = {1: 1, 2: 3, 3: 9}
+# Contraptions share unit ids with heroes' range but are not drafted from the pool
+CONTRAPTION_UNIT_IDS = frozenset((117, 143, 127))
+
+_ROOT = Path(__file__).resolve().parents[1]
+_HEROES_DATA_CANDIDATES = (
+    _ROOT / 'frontend' / 'public' / 'underlords_heroes.json',
+    _ROOT / 'frontend' / 'dist' / 'underlords_heroes.json',
+)
+
+_hero_tiers: Optional[Dict[int, int]] = None
+_hero_tiers_lock = Lock()
+# Pool versions are unique across trackers, so (version, ...) cache keys never collide between matches
+_pool_versions = itertools.count(1)
+
+
+def is_draft_pool_hero(unit_id: int) -> bool:
+    """Draft-pool heroes only (excludes underlords and contraptions)."""
+    return unit_id <= 1000 and unit_id not in CONTRAPTION_UNIT_IDS
+
+
+def load_hero_tiers(path: str | Path) -> Dict[int, int]:
+    """unit_id -> draftTier for every draft-pool hero in an underlords_heroes.json file."""
+    heroes = json.loads(Path(path).read_text(encoding='utf-8')).get('heroes') or {}
+    tiers = {}
+    for hero in heroes.values():
+        unit_id = hero.get('id')
+        tier = hero.get('draftTier')
+        if unit_id is None or tier is None or not is_draft_pool_hero(unit_id):
+            continue
+        tiers[int(unit_id)] = int(tier)
+    return tiers
+
+
+def hero_tiers() -> Dict[int, int]:
+    """Hero tiers from HEROES_DATA_PATH or the frontend's underlords_heroes.json (loaded once)."""
+    global _hero_tiers
+    if _hero_tiers is None:
+        with _hero_tiers_lock:
+            if _hero_tiers is None:
+                override = os.getenv('HEROES_DATA_PATH')
+                candidates = (Path(override),) if override else _HEROES_DATA_CANDIDATES
+                tiers: Dict[int, int] = {}
+                for path in candidates:
+                    if path.exists():
+                        try:
+                            tiers = load_hero_tiers(path)
+                            break
+                        except (OSError, ValueError) as e:
+                            print(f"[HERO POOL] Could not load {path}: {e}")
+                else:
+                    print(f"[HERO POOL] underlords_heroes.json not found - pool counts disabled")
+                _hero_tiers = tiers
+    return _hero_tiers
+
+
+def pool_units_by_hero(units: Optional[Iterable[Any]]) -> Dict[int, int]:
+    """unit_id -> pool copies held, for one player's units (dicts or UnitRecords)."""
+    held: Dict[int, int] = {}
+    for unit in units or ():
+        unit_id = unit.get('unit_id')
+        if unit_id is None:
+            continue
+        copies = RANK_POOL_UNITS.get(unit.get('rank') or 1, 0)
+        if copies:
+            held[unit_id] = held.get(unit_id, 0) + copies
+    return held
+
+
+class HeroPoolTracker:
+    """Remaining pool copies per hero, updated one player state at a time."""
+
+    def __init__(self, tiers: Optional[Dict[int, int]] = None):
+        self._tiers: Optional[Dict[int, int]] = None  # unit_id -> draftTier, loaded on first use
+        self.remaining: Dict[int, int] = {}           # unit_id -> remaining copies (draft-pool heroes only)
+        self.player_units: Dict[int, Dict[int, int]] = {}  # account_id -> unit_id -> copies held
+        self.version = next(_pool_versions)           # changes on every pool change (cache key for shop odds)
+        if tiers is not None:
+            self._load(tiers)
+
+    def _load(self, tiers: Dict[int, int]) -> None:
+        self._tiers = tiers
+        self.remaining = {unit_id: CARDS_PER_TIER.get(tier, 0) for unit_id, tier in tiers.items()}
+        self.version = next(_pool_versions)
+
+    @property
+    def tiers(self) -> Dict[int, int]:
+        if self._tiers is None:
+            self._load(hero_tiers())
+        return self._tiers
+
+    def total(self, unit_id: int) -> int:
+        return CARDS_PER_TIER.get(self.tiers.get(unit_id), 0)
+
+    def _apply(self, previous: Dict[int, int], current: Dict[int, int]) -> None:
+        remaining = self.remaining
+        for unit_id in previous.keys() | current.keys():
+            delta = current.get(unit_id, 0) - previous.get(unit_id, 0)
+            if delta and unit_id in remaining:
+                remaining[unit_id] -= delta
+
+    def update_player(self, account_id: int, units: Optional[Iterable[Any]]) -> None:
+        """Replace one player's contribution with the units from their latest state."""
+        self.tiers  # make sure totals are loaded before the first delta
+        held = pool_units_by_hero(units)
+        previous = self.player_units.get(account_id, {})
+        if held == previous:
+            return
+        self.player_units[account_id] = held
+        self._apply(previous, held)
+        self.version = next(_pool_versions)
+
+    def count(self, unit_id: int) -> Dict[str, int]:
+        """{'remaining', 'total'} like the frontend PoolCount (remaining never below zero)."""
+        return {'remaining': max(0, self.remaining.get(unit_id, 0)), 'total': self.total(unit_id)}
+
+    def counts(self) -> Dict[int, Dict[str, int]]:
+        """unit_id -> PoolCount for every draft-pool hero."""
+        self.tiers
+        return {unit_id: self.count(unit_id) for unit_id in self.remaining}
+
+
+def pool_counts_from_states(states: Iterable[Any]) -> Dict[int, Dict[str, int]]:
+    """One-off pool counts from a set of player states (e.g. the latest DB snapshot per player)."""
+    tracker = HeroPoolTracker()
+    for index, state in enumerate(states):
+        tracker.update_player(state.get('account_id', index), state.get('units'))
+    return tracker.counts()
@@ -0,0 +1,275 @@
+"""
+Binary model file (models.bin) - same tables as models.json, loadable without parsing.
+
+Layout (little-endian):
+    header      MAGIC, version u16, table count u16, reserved u32
+    directory   per table: name length u16, name (utf-8), entry count u32, index offset u32
+    indexes     per table: entry count x (key hash u32, key offset u32, key length u32,
+                value offset u32, value length u32), sorted by (hash, key bytes)
+    data        encoded keys and values
+
+Keys and values use a small tagged encoding (None/bool/int/float/str/tuple/dict, lists are
+stored as tuples; small ints and short tuples get 1-byte forms). A lookup encodes the tuple
+key, binary-searches the table index by crc32 of the encoded key and decodes only the
+matching value, so opening a file is just an mmap.
+
+Convert an existing models.json:
+    python binary_format.py models.json models.bin
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+MAGIC = b"UMPB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI")
+_NAME_LEN = struct.Struct("<H")
+_DIRECTORY_ENTRY = struct.Struct("<II")
+_INDEX_ENTRY = struct.Struct("<IIIII")
+_U8 = struct.Struct("<B")
+_I8 = struct.Struct("<b")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_TAG_NONE = b"N"
+_TAG_TRUE = b"T"
+_TAG_FALSE = b"F"
+_TAG_SMALL_INT = b"b"
+_TAG_INT = b"i"
+_TAG_FLOAT = b"f"
+_TAG_STR = b"s"
+_TAG_SHORT_TUPLE = b"t"
+_TAG_TUPLE = b"l"
+_TAG_DICT = b"d"
+
+_MISSING = object()
+
+
+def encode_value(value: Any) -> bytes:
+    out = bytearray()
+    _encode_into(value, out)
+    return bytes(out)
+
+
+def _encode_into(value: Any, out: bytearray) -> None:
+    if value is None:
+        out += _TAG_NONE
+    elif value is True:
+        out += _TAG_TRUE
+    elif value is False:
+        out += _TAG_FALSE
+    elif isinstance(value, int):
+        if -128 <= value <= 127:
+            out += _TAG_SMALL_INT
+            out += _I8.pack(value)
+        else:
+            out += _TAG_INT
+            out += _I64.pack(value)
+    elif isinstance(value, float):
+        out += _TAG_FLOAT
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        out += _TAG_STR
+        out += _U32.pack(len(encoded))
+        out += encoded
+    elif isinstance(value, (tuple, list)):
+        if len(value) < 256:
+            out += _TAG_SHORT_TUPLE
+            out += _U8.pack(len(value))
+        else:
+            out += _TAG_TUPLE
+            out += _U32.pack(len(value))
+        for item in value:
+            _encode_into(item, out)
+    elif isinstance(value, dict):
+        out += _TAG_DICT
+        out += _U32.pack(len(value))
+        for key, item in value.items():
+            _encode_into(key, out)
+            _encode_into(item, out)
+    else:
+        raise ValueError(f"Cannot encode model value of type {type(value).__name__}")
+
+
+def _decode(buf: Any, offset: int) -> Tuple[Any, int]:
+    tag = buf[offset:offset + 1]
+    offset += 1
+    if tag == _TAG_SMALL_INT:
+        return _I8.unpack_from(buf, offset)[0], offset + 1
+    if tag == _TAG_SHORT_TUPLE or tag == _TAG_TUPLE:
+        if tag == _TAG_SHORT_TUPLE:
+            count = buf[offset]
+            offset += 1
+        else:
+            (count,) = _U32.unpack_from(buf, offset)
+            offset += 4
+        items = []
+        for _ in range(count):
+            item, offset = _decode(buf, offset)
+            items.append(item)
+        return tuple(items), offset
+    if tag == _TAG_INT:
+        return _I64.unpack_from(buf, offset)[0], offset + 8
+    if tag == _TAG_NONE:
+        return None, offset
+    if tag == _TAG_STR:
+        (length,) = _U32.unpack_from(buf, offset)
+        offset += 4
+        return bytes(buf[offset:offset + length]).decode("utf-8"), offset + length
+    if tag == _TAG_TRUE:
+        return True, offset
+    if tag == _TAG_FALSE:
+        return False, offset
+    if tag == _TAG_FLOAT:
+        return _F64.unpack_from(buf, offset)[0], offset + 8
+    if tag == _TAG_DICT:
+        (count,) = _U32.unpack_from(buf, offset)
+        offset += 4
+        result = {}
+        for _ in range(count):
+            key, offset = _decode(buf, offset)
+            result[key], offset = _decode(buf, offset)
+        return result, offset
+    raise ValueError(f"Corrupt model file: unknown tag {tag!r}")
+
+
+def decode_value(buf: Any, offset: int = 0) -> Any:
+    return _decode(buf, offset)[0]
+
+
+class BinaryModelTable:
+    """Read-only, dict-like view of one table in a models.bin buffer (tuple keys)."""
+
+    def __init__(self, buf: Any, count: int, index_offset: int):
+        self._buf = buf
+        self._count = count
+        self._index_offset = index_offset
+        self._memo: Dict[Any, Any] = {}  # tuple key -> decoded value (or _MISSING)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int, int]:
+        return _INDEX_ENTRY.unpack_from(self._buf, self._index_offset + position * _INDEX_ENTRY.size)
+
+    def _find(self, key: Any) -> Any:
+        encoded = encode_value(key)
+        key_hash = zlib.crc32(encoded)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key_hash:
+                lo = mid + 1
+            else:
+                hi = mid
+        buf = self._buf
+        while lo < self._count:
+            entry_hash, key_offset, key_length, value_offset, _ = self._entry(lo)
+            if entry_hash != key_hash:
+                break
+            if buf[key_offset:key_offset + key_length] == encoded:
+                return decode_value(buf, value_offset)
+            lo += 1
+        return _MISSING
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = self._memo[key]
+        except KeyError:
+            value = self._memo[key] = self._find(key)
+        except TypeError:  # unhashable key (lists) - never cached
+            value = self._find(key)
+        return default if value is _MISSING else value
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        for position in range(self._count):
+            _, key_offset, _, value_offset, _ = self._entry(position)
+            yield decode_value(self._buf, key_offset), decode_value(self._buf, value_offset)
+
+
+def write_model_file(models: Dict[str, Dict[str, Any]], path: str | Path) -> None:
+    """Write serialize_key()-keyed model tables (the models.json payload) as models.bin."""
+    names = list(models)
+    directory_size = sum(_NAME_LEN.size + len(name.encode("utf-8")) + _DIRECTORY_ENTRY.size for name in names)
+    index_start = _HEADER.size + directory_size
+    data_start = index_start + sum(len(models[name]) for name in names) * _INDEX_ENTRY.size
+
+    data = bytearray()
+    directory = bytearray()
+    indexes = bytearray()
+    for name in names:
+        entries: List[Tuple[int, bytes, int, int, int]] = []
+        for key, value in models[name].items():
+            encoded_key = encode_value(json.loads(key))
+            key_offset = data_start + len(data)
+            data += encoded_key
+            encoded_value = encode_value(value)
+            value_offset = data_start + len(data)
+            data += encoded_value
+            entries.append((zlib.crc32(encoded_key), encoded_key, key_offset, value_offset, len(encoded_value)))
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+
+        encoded_name = name.encode("utf-8")
+        directory += _NAME_LEN.pack(len(encoded_name)) + encoded_name
+        directory += _DIRECTORY_ENTRY.pack(len(entries), index_start + len(indexes))
+        for key_hash, encoded_key, key_offset, value_offset, value_length in entries:
+            indexes += _INDEX_ENTRY.pack(key_hash, key_offset, len(encoded_key), value_offset, value_length)
+
+    payload = _HEADER.pack(MAGIC, VERSION, len(names), 0) + directory + indexes + data
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def load_model_file(path: str | Path) -> Dict[str, BinaryModelTable]:
+    """Map a models.bin file and return its tables (nothing is decoded until looked up)."""
+    with open(path, "rb") as handle:
+        try:
+            buf: Any = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            buf = handle.read()
+
+    if len(buf) < _HEADER.size:
+        raise ValueError("Model file is truncated.")
+    magic, version, table_count, _ = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a matchup predictor model file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported model file version: {version}")
+
+    tables: Dict[str, BinaryModelTable] = {}
+    offset = _HEADER.size
+    for _ in range(table_count):
+        (name_length,) = _NAME_LEN.unpack_from(buf, offset)
+        offset += _NAME_LEN.size
+        name = bytes(buf[offset:offset + name_length]).decode("utf-8")
+        offset += name_length
+        count, index_offset = _DIRECTORY_ENTRY.unpack_from(buf, offset)
+        offset += _DIRECTORY_ENTRY.size
+        tables[name] = BinaryModelTable(buf, count, index_offset)
+    return tables
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 3:
+        print("usage: python binary_format.py <models.json> <models.bin>")
+        return 2
+    models = json.loads(Path(argv[1]).read_text(encoding="utf-8"))
+    write_model_file(models, argv[2])
+    print(f"wrote {argv[2]}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -15,6 +15,7 @@ from comprehensive_round_predictor import (
     load_clean_views,
 )
 from predictor import DeterministicMatchupPredictor
+from binary_format import write_model_file
 
 
 def main() -> None:
@@ -43,6 +44,10 @@ def main() -> None:
     out_path = Path(__file__).resolve().parent / "models.json"
     out_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
     print(f"wrote {out_path}")
+    # Binary copy for fast startup - written after models.json so it is the newer file
+    bin_path = out_path.with_suffix(".bin")
+    write_model_file(payload, bin_path)
+    print(f"wrote {bin_path}")
     print({k: len(v) for k, v in payload.items()})
 
 
@@ -50,17 +50,51 @@ def round_index(round_number: int, offset: int, cycle_length: int = 25) -> int:
 
 
 class DeterministicMatchupPredictor:
-    def __init__(self, models: Dict[str, Dict[str, Signature]]):
+    def __init__(self, models: Dict[str, Dict[str, Signature]], compiled: Optional[Dict[str, Any]] = None):
         normalized = {
             name: {k: self._freeze_signature(v) for k, v in table.items()}
             for name, table in models.items()
         }
         self.models = {"table8": dict(DEFAULT_TABLE8), **normalized}
+        if compiled is None:
+            # Same tables re-keyed once by the decoded key parts, so lookups skip json.dumps
+            compiled = {name: self.compile_table(table) for name, table in normalized.items()}
+        self.compiled = compiled
 
     @staticmethod
     def serialize_key(*parts: Any) -> str:
         return json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
 
+    @staticmethod
+    def tuple_key(*parts: Any) -> Tuple[Any, ...]:
+        """Hashable equivalent of serialize_key(*parts): lists/tuples are frozen to tuples."""
+        return DeterministicMatchupPredictor._freeze_key(parts)
+
+    @staticmethod
+    def _freeze_key(value: Any) -> Any:
+        if isinstance(value, (tuple, list)):
+            return tuple(DeterministicMatchupPredictor._freeze_key(v) for v in value)
+        return value
+
+    @classmethod
+    def _hashable(cls, value: Any) -> Any:
+        # Callers normally pass frozen tuples already - only walk the value when it isn't hashable
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return cls._freeze_key(value)
+
+    @classmethod
+    def compile_table(cls, table: Dict[str, Signature]) -> Dict[Tuple[Any, ...], Signature]:
+        """Re-key a serialize_key()-keyed table by tuple_key()."""
+        compiled: Dict[Tuple[Any, ...], Signature] = {}
+        for key, value in table.items():
+            compiled[cls._freeze_key(json.loads(key))] = value
+        if len(compiled) != len(table):
+            raise ValueError("Model table has keys that collide once decoded.")
+        return compiled
+
     @staticmethod
     def _to_full_oriented_structure(oriented_pairs: Signature) -> Signature:
         pairs = tuple(tuple(pair) for pair in oriented_pairs)
@@ -76,11 +110,22 @@ class DeterministicMatchupPredictor:
 
     @classmethod
     def from_model_file(cls, path: str | Path) -> "DeterministicMatchupPredictor":
+        if Path(path).suffix == ".bin":
+            return cls.from_binary_file(path)
         payload = json.loads(Path(path).read_text(encoding="utf-8"))
         if not isinstance(payload, dict):
             raise ValueError("Model file must contain a JSON object.")
         return cls(models=payload)
 
+    @classmethod
+    def from_binary_file(cls, path: str | Path) -> "DeterministicMatchupPredictor":
+        """Load models.bin (see binary_format.py) - tables are memory-mapped and decoded on lookup."""
+        try:
+            from .binary_format import load_model_file
+        except ImportError:  # used as a standalone folder (see README)
+            from binary_format import load_model_file
+        return cls(models={}, compiled=load_model_file(path))
+
     def predict_matchups(
         self,
         *,
@@ -93,6 +138,9 @@ class DeterministicMatchupPredictor:
         streak_step: Optional[int] = None,
         eliminated_player_slots: Optional[Tuple[int, ...]] = None,
     ) -> PredictionResult:
+        # Compiled tables are keyed by plain tuples (see compile_table)
+        previous_full_oriented_structure = self._hashable(previous_full_oriented_structure)
+
         if alive_player_count == 8:
             schedule_index = round_index(current_round_number, schedule_offset)
             pred = self.models.get("table8", {}).get(str(schedule_index))
@@ -105,33 +153,33 @@ class DeterministicMatchupPredictor:
 
         if alive_player_count == 7:
             if is_entry:
-                key = self.serialize_key(tuple(alive_player_slots), previous_full_oriented_structure)
-                pred = self.models.get("entry7", {}).get(key)
+                key = (tuple(alive_player_slots), previous_full_oriented_structure)
+                pred = self.compiled.get("entry7", {}).get(key)
                 if pred is None:
                     return PredictionResult(False, None, "entry7", "missing_entry7_key", (tuple(alive_player_slots), previous_full_oriented_structure))
                 return PredictionResult(True, pred, "entry7", "ok", (tuple(alive_player_slots), previous_full_oriented_structure))
-            key = self.serialize_key(previous_full_oriented_structure, schedule_index)
-            pred = self.models.get("trans7", {}).get(key)
+            key = (previous_full_oriented_structure, schedule_index)
+            pred = self.compiled.get("trans7", {}).get(key)
             if pred is None:
                 return PredictionResult(False, None, "trans7", "missing_trans7_key", (previous_full_oriented_structure, schedule_index))
             return PredictionResult(True, pred, "trans7", "ok", (previous_full_oriented_structure, schedule_index))
 
         if alive_player_count == 6:
             if is_entry:
-                key = self.serialize_key(tuple(alive_player_slots), previous_full_oriented_structure)
-                pred = self.models.get("entry6", {}).get(key)
+                key = (tuple(alive_player_slots), previous_full_oriented_structure)
+                pred = self.compiled.get("entry6", {}).get(key)
                 if pred is None:
                     return PredictionResult(False, None, "entry6", "missing_entry6_key", (tuple(alive_player_slots), previous_full_oriented_structure))
                 return PredictionResult(True, pred, "entry6", "ok", (tuple(alive_player_slots), previous_full_oriented_structure))
-            key = self.serialize_key(previous_full_oriented_structure, int(streak_step or 0))
-            pred = self.models.get("trans6", {}).get(key)
+            key = (previous_full_oriented_structure, int(streak_step or 0))
+            pred = self.compiled.get("trans6", {}).get(key)
             if pred is None:
                 return PredictionResult(False, None, "trans6", "missing_trans6_key", (previous_full_oriented_structure, int(streak_step or 0)))
             return PredictionResult(True, pred, "trans6", "ok", (previous_full_oriented_structure, int(streak_step or 0)))
 
         if 2 <= alive_player_count <= 5:
             if is_entry and previous_alive_player_count is not None:
-                entry_key = self.serialize_key(
+                entry_key = (
                     previous_alive_player_count,
                     alive_player_count,
                     tuple(alive_player_slots),
@@ -139,62 +187,62 @@ class DeterministicMatchupPredictor:
                     schedule_index,
                     tuple(eliminated_player_slots or ()),
                 )
-                pred = self.models.get("entry_other", {}).get(entry_key)
+                pred = self.compiled.get("entry_other", {}).get(entry_key)
                 if pred is not None:
                     return PredictionResult(True, pred, "entry_other", "ok", (entry_key,))
 
-                b1 = self.models.get("entry_b1", {}).get(entry_key)
+                b1 = self.compiled.get("entry_b1", {}).get(entry_key)
                 if b1 is not None:
                     return PredictionResult(True, b1, "entry_b1", "ok", (entry_key,))
 
-                entry_key_b2 = self.serialize_key(
+                entry_key_b2 = (
                     previous_alive_player_count,
                     alive_player_count,
                     tuple(alive_player_slots),
                     previous_full_oriented_structure,
                 )
-                b2 = self.models.get("entry_b2", {}).get(entry_key_b2)
+                b2 = self.compiled.get("entry_b2", {}).get(entry_key_b2)
                 if b2 is not None:
                     return PredictionResult(True, b2, "entry_b2", "ok", (entry_key_b2,))
 
-                entry_key_b3 = self.serialize_key(
+                entry_key_b3 = (
                     previous_alive_player_count,
                     alive_player_count,
                     previous_full_oriented_structure,
                 )
-                b3 = self.models.get("entry_b3", {}).get(entry_key_b3)
+                b3 = self.compiled.get("entry_b3", {}).get(entry_key_b3)
                 if b3 is not None:
                     return PredictionResult(True, b3, "entry_b3", "ok", (entry_key_b3,))
                 return PredictionResult(False, None, "entry_other", "missing_entry_other_key", (entry_key,))
 
-            trans_key = self.serialize_key(
+            trans_key = (
                 alive_player_count,
                 tuple(alive_player_slots),
                 previous_full_oriented_structure,
                 int(streak_step or 0),
                 schedule_index,
             )
-            pred = self.models.get("trans_other", {}).get(trans_key)
+            pred = self.compiled.get("trans_other", {}).get(trans_key)
             if pred is not None:
                 return PredictionResult(True, pred, "trans_other", "ok", (trans_key,))
 
-            trans_key_b1 = self.serialize_key(alive_player_count, previous_full_oriented_structure, int(streak_step or 0), schedule_index)
-            b1 = self.models.get("trans_b1", {}).get(trans_key_b1)
+            trans_key_b1 = (alive_player_count, previous_full_oriented_structure, int(streak_step or 0), schedule_index)
+            b1 = self.compiled.get("trans_b1", {}).get(trans_key_b1)
             if b1 is not None:
                 return PredictionResult(True, b1, "trans_b1", "ok", (trans_key_b1,))
 
-            trans_key_b2 = self.serialize_key(alive_player_count, tuple(alive_player_slots), previous_full_oriented_structure, int(streak_step or 0))
-            b2 = self.models.get("trans_b2", {}).get(trans_key_b2)
+            trans_key_b2 = (alive_player_count, tuple(alive_player_slots), previous_full_oriented_structure, int(streak_step or 0))
+            b2 = self.compiled.get("trans_b2", {}).get(trans_key_b2)
             if b2 is not None:
                 return PredictionResult(True, b2, "trans_b2", "ok", (trans_key_b2,))
 
-            trans_key_b3 = self.serialize_key(alive_player_count, previous_full_oriented_structure, int(streak_step or 0))
-            b3 = self.models.get("trans_b3", {}).get(trans_key_b3)
+            trans_key_b3 = (alive_player_count, previous_full_oriented_structure, int(streak_step or 0))
+            b3 = self.compiled.get("trans_b3", {}).get(trans_key_b3)
             if b3 is not None:
                 return PredictionResult(True, b3, "trans_b3", "ok", (trans_key_b3,))
 
-            trans_key_b4 = self.serialize_key(alive_player_count, previous_full_oriented_structure)
-            b4 = self.models.get("trans_b4", {}).get(trans_key_b4)
+            trans_key_b4 = (alive_player_count, previous_full_oriented_structure)
+            b4 = self.compiled.get("trans_b4", {}).get(trans_key_b4)
             if b4 is not None:
                 return PredictionResult(True, b4, "trans_b4", "ok", (trans_key_b4,))
             return PredictionResult(False, None, "trans_other", "missing_trans_other_key", (trans_key,))
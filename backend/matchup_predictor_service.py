@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from pathlib import Path
+from threading import Lock
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from .matchup_predictor import DeterministicMatchupPredictor
@@ -8,27 +11,71 @@ from .matchup_predictor import DeterministicMatchupPredictor
 
 class MatchupPredictorService:
     MAX_FUTURE_ROUNDS = 25
+    # Prediction inputs only change a few times per round; keep the last few payloads around
+    CACHE_SIZE = 64
 
     def __init__(self) -> None:
-        model_path = Path(__file__).resolve().parent / "matchup_predictor" / "models.json"
-        self.predictor = DeterministicMatchupPredictor.from_model_file(model_path)
+        model_dir = Path(__file__).resolve().parent / "matchup_predictor"
+        self.model_path = model_dir / "models.json"
+        self.binary_model_path = model_dir / "models.bin"
+        # Loaded on first prediction so importing the backend does not pay for it
+        self._predictor: Optional[DeterministicMatchupPredictor] = None
+        self._load_lock = Lock()
+        self._cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def predictor(self) -> DeterministicMatchupPredictor:
+        if self._predictor is None:
+            with self._load_lock:
+                if self._predictor is None:
+                    self._predictor = self._load_predictor()
+        return self._predictor
+
+    def _binary_model_is_current(self) -> bool:
+        try:
+            binary_mtime = self.binary_model_path.stat().st_mtime
+        except OSError:
+            return False
+        try:
+            return binary_mtime >= self.model_path.stat().st_mtime
+        except OSError:
+            return True  # models.json missing - the binary file is all there is
+
+    def _load_predictor(self) -> DeterministicMatchupPredictor:
+        started = time.perf_counter()
+        path = self.model_path
+        predictor = None
+        if self._binary_model_is_current():
+            try:
+                predictor = DeterministicMatchupPredictor.from_binary_file(self.binary_model_path)
+                path = self.binary_model_path
+            except (OSError, ValueError) as e:
+                print(f"[MATCHUP PREDICTOR] Could not load {self.binary_model_path.name}, falling back to {self.model_path.name}: {e}")
+        if predictor is None:
+            predictor = DeterministicMatchupPredictor.from_model_file(self.model_path)
+        print(f"[MATCHUP PREDICTOR] Loaded {path.name} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return predictor
+
+    def cache_stats(self) -> Dict[str, int]:
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "max_size": self.CACHE_SIZE,
+            }
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
 
     @staticmethod
     def _alive_and_eliminated_slots(match_state: Any) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
-        alive: List[int] = []
-        eliminated: List[int] = []
-        for player in match_state.latest_processed_public_player_states.values():
-            slot = player.get("player_slot")
-            if slot is None:
-                continue
-            if player.get("final_place", 0) == 0:
-                alive.append(int(slot))
-            else:
-                eliminated.append(int(slot))
-
-        alive_sorted = tuple(sorted(alive))
-        eliminated_sorted = tuple(sorted(eliminated))
-        return alive_sorted, eliminated_sorted
+        # Maintained incrementally by MatchState.index_public_state
+        return match_state.alive_and_eliminated_slots()
 
     @staticmethod
     def _build_previous_structure(match_state: Any) -> Optional[Tuple[Tuple[Tuple[int, int], ...], Tuple[Any, ...]]]:
@@ -49,6 +96,49 @@ class MatchupPredictorService:
             return None
 
         previous_structure = self._build_previous_structure(match_state)
+        cache_key = (
+            alive_slots,
+            eliminated_slots,
+            match_state.round_number,
+            match_state.round_phase,
+            match_state.schedule_offset,
+            match_state.previous_alive_player_count,
+            previous_structure,
+            match_state.streak_step,
+        )
+        with self._cache_lock:
+            payload = self._cache.get(cache_key)
+            if payload is not None:
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        if payload is not None:
+            match_state.latest_matchup_prediction = payload
+            return payload
+
+        payload = self._compute_prediction(
+            match_state=match_state,
+            alive_slots=alive_slots,
+            eliminated_slots=eliminated_slots,
+            previous_structure=previous_structure,
+        )
+        with self._cache_lock:
+            self._cache[cache_key] = payload
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        match_state.latest_matchup_prediction = payload
+        return payload
+
+    def _compute_prediction(
+        self,
+        *,
+        match_state: Any,
+        alive_slots: Tuple[int, ...],
+        eliminated_slots: Tuple[int, ...],
+        previous_structure: Optional[Tuple[Tuple[Tuple[int, int], ...], Tuple[Any, ...]]],
+    ) -> Dict[str, Any]:
+        alive_count = len(alive_slots)
         result = self.predictor.predict_matchups(
             alive_player_count=alive_count,
             current_round_number=match_state.round_number,
@@ -70,7 +160,7 @@ class MatchupPredictorService:
             previous_structure=previous_structure,
         )
 
-        payload = {
+        return {
             "known": result.known,
             "tier": result.tier,
             "reason": result.reason,
@@ -84,8 +174,6 @@ class MatchupPredictorService:
             "streak_step": match_state.streak_step,
             "future_rounds": future_rounds,
         }
-        match_state.latest_matchup_prediction = payload
-        return payload
 
     @staticmethod
     def _prediction_to_pairs(prediction: Any) -> List[List[int]]:
@@ -0,0 +1,288 @@
+"""
+Player State Models - compact slotted records for the in-memory match state
+
+Processed public/private player states used to be fresh ~50-key dicts per packet. These
+dataclasses keep the same field names with __slots__ storage; units, item slots and
+synergies become typed records. All records keep the dict read API (get, [], in, keys,
+items) so code shared with DB snapshot dicts (change detection, bench organizer, replay)
+works on both. Conversion back to plain dicts happens at the API/socket/DB edges only,
+via as_dict() (cached per player state), to_dict() or json_default().
+"""
+from dataclasses import dataclass, fields
+from typing import Any, ClassVar, Dict, FrozenSet, List, Optional, Tuple
+
+
+class _Missing:
+    """Marks a GSI field that was absent (kept distinct from an explicit null)."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+class GsiRecord:
+    """Dict-compatible read API for slotted records. Unknown GSI keys are kept in `extra`."""
+    __slots__ = ()
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
+    _FIELD_SET: ClassVar[FrozenSet[str]] = frozenset()
+
+    @classmethod
+    def from_gsi(cls, raw: Dict):
+        """Build a record from a raw GSI dict (records are returned unchanged)."""
+        if not isinstance(raw, dict):
+            return raw
+        get = raw.get
+        record = cls(*[get(name, MISSING) for name in cls._FIELDS])
+        if not raw.keys() <= cls._FIELD_SET:
+            record.extra = {key: value for key, value in raw.items() if key not in cls._FIELD_SET}
+        return record
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+        elif self.extra:
+            value = self.extra.get(key, MISSING)
+        else:
+            value = MISSING
+        return default if value is MISSING else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def keys(self) -> List[str]:
+        return list(self.to_dict(deep=False))
+
+    def items(self):
+        return self.to_dict(deep=False).items()
+
+    def to_dict(self, deep: bool = True) -> Dict:
+        """Plain dict with the original GSI keys (absent fields stay absent)."""
+        result = {}
+        for name in self._FIELDS:
+            value = getattr(self, name)
+            if value is MISSING:
+                continue
+            if deep and type(value) is list and value and isinstance(value[0], GsiRecord):
+                value = [item.to_dict() for item in value]
+            result[name] = value
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+
+class _CachedDictRecord(GsiRecord):
+    """
+    Top-level player states: as_dict() converts each state once and reuses the dict while the
+    state is unchanged, so frames that resend an unchanged player do not rebuild it. Item
+    assignment clears the cache; attribute assignment does not (it is only used while building).
+    """
+    __slots__ = ('_dict',)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._dict = None
+        GsiRecord.__setitem__(self, key, value)
+
+    def cached_dict(self) -> Dict:
+        """to_dict(), computed once per state - shared between callers, treat it as read-only."""
+        try:
+            cached = self._dict
+        except AttributeError:
+            cached = None
+        if cached is None:
+            cached = self._dict = self.to_dict()
+        return cached
+
+
+def _gsi_record(cls):
+    """Class decorator: slotted dataclass + field table for the GsiRecord API."""
+    cls = dataclass(slots=True)(cls)
+    cls._FIELDS = tuple(field.name for field in fields(cls) if field.name != 'extra')
+    cls._FIELD_SET = frozenset(cls._FIELDS)
+    return cls
+
+
+@_gsi_record
+class UnitRecord(GsiRecord):
+    """One entry of public_player_state.units."""
+    unit_id: Any = MISSING
+    entindex: Any = MISSING
+    rank: Any = MISSING
+    position: Any = MISSING             # {'x': int, 'y': int} (y == -1 is the bench)
+    keywords: Any = MISSING
+    gold_value: Any = MISSING
+    kill_count: Any = MISSING
+    kill_streak: Any = MISSING
+    float_kill_count: Any = MISSING
+    duel_bonus_damage: Any = MISSING
+    unit_cap_cost: Any = MISSING
+    can_be_sold: Any = MISSING
+    can_move_to_bench: Any = MISSING
+    recommended_for_placement: Any = MISSING
+    is_placeable_item: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+@_gsi_record
+class ItemSlotRecord(GsiRecord):
+    """One entry of public_player_state.item_slots."""
+    slot_index: Any = MISSING
+    item_id: Any = MISSING
+    assigned_unit_entindex: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+@_gsi_record
+class SynergyRecord(GsiRecord):
+    """One entry of public_player_state.synergies."""
+    keyword: Any = MISSING
+    unique_unit_count: Any = MISSING
+    bench_additional_unique_unit_count: Any = MISSING
+    extra: Optional[Dict] = None
+
+
+def records_from_gsi(record_cls, raw_list: Optional[List]) -> Optional[List]:
+    """Convert a GSI list of dicts to records (None stays None)."""
+    if raw_list is None:
+        return None
+    from_gsi = record_cls.from_gsi
+    return [from_gsi(raw) for raw in raw_list]
+
+
+@_gsi_record
+class PublicPlayerState(_CachedDictRecord):
+    """Processed public player state (see game_state.process_and_store_gsi_public_player_state)."""
+    # Basic player info
+    account_id: Any = None
+    persona_name: Any = None
+    bot_persona_name: Any = None
+    player_slot: Any = None
+    is_human_player: Any = None
+
+    # Core stats
+    health: Any = None
+    gold: Any = None
+    level: Any = None
+    xp: Any = None
+    next_level_xp: Any = None
+
+    # Match performance
+    wins: Any = None
+    losses: Any = None
+    win_streak: Any = None
+    lose_streak: Any = None
+    net_worth: Any = None
+    final_place: Any = None
+
+    # Combat data
+    combat_type: Any = None
+    combat_result: Any = None
+    combat_duration: Any = None
+    opponent_player_slot: Any = None
+
+    # Board and units
+    board_unit_limit: Any = None
+    units: Optional[List[UnitRecord]] = None
+    item_slots: Optional[List[ItemSlotRecord]] = None
+    synergies: Optional[List[SynergyRecord]] = None
+
+    # Underlord data
+    underlord: Any = None
+    underlord_selected_talents: Any = None
+
+    # Event and special data
+    event_tier: Any = None
+    owns_event: Any = None
+    is_mirrored_match: Any = None
+
+    # Connection status
+    connection_status: Any = None
+    disconnected_time: Any = None
+
+    # VS opponent stats
+    vs_opponent_wins: Any = None
+    vs_opponent_losses: Any = None
+    vs_opponent_draws: Any = None
+
+    # Special mechanics
+    brawny_kills_float: Any = None
+
+    # Player data
+    city_prestige_level: Any = None
+    rank_tier: Any = None
+    global_leaderboard_rank: Any = None
+    platform: Any = None
+
+    # Board buddy
+    board_buddy: Any = None
+
+    # Lobby info
+    lobby_team: Any = None
+
+    # Technical
+    sequence_number: Any = None
+    timestamp: Any = None
+
+    # Round tracking
+    round_number: Any = None
+    round_phase: Any = None
+
+    # Match count (how many previous matches we've seen this player in)
+    match_count: Any = None
+    extra: Optional[Dict] = None
+
+
+@_gsi_record
+class PrivatePlayerState(_CachedDictRecord):
+    """Processed private player state (see game_state.process_and_store_gsi_private_player_state)."""
+    # Basic info
+    player_slot: Any = None
+    sequence_number: Any = None
+
+    # Shop & Economy
+    shop_units: Any = None
+    shop_locked: Any = None
+    reroll_cost: Any = None
+    gold_earned_this_round: Any = None
+    shop_generation_id: Any = None
+
+    # Underlord Selection
+    can_select_underlord: Any = None
+    underlord_picker_offering: Any = None
+
+    # Challenges & Rewards
+    used_item_reward_reroll_this_round: Any = None
+
+    # Timestamp
+    timestamp: Any = None
+    extra: Optional[Dict] = None
+
+
+def as_dict(state: Any) -> Any:
+    """Edge conversion: records to plain dicts (cached for player states), anything else unchanged."""
+    if isinstance(state, _CachedDictRecord):
+        return state.cached_dict()
+    return state.to_dict() if isinstance(state, GsiRecord) else state
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps(default=...) hook so records serialize without an explicit conversion pass."""
+    if isinstance(value, GsiRecord):
+        return value.to_dict(deep=False)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -7,13 +7,22 @@ from flask import request, jsonify, send_from_directory
 from flask_socketio import emit
 from datetime import datetime
 import json
-from .game_state import match_state, db, db_write_queue, connected_clients, stats, abandon_match, emit_realtime_update, data_lock
-from .gsi_handler import process_gsi_data
+from .game_state import match_state, db, db_write_queue, db_writer_stats, gsi_ingest_queue, ingest_stats, connected_clients, stats, abandon_match, emit_keyframe_to_client, match_update_scheduler, data_lock
+from .gsi_handler import enqueue_gsi_payload
 from .config import app, socketio, PRODUCTION, FRONTEND_BUILD_DIR, GSI_HOST, GSI_PORT
-from .change_detector import change_detector
+from .change_detector import change_detector, REPLAY_SNAPSHOT_FIELDS
+from .matchup_predictor_service import matchup_predictor_service
+from .hero_pool import pool_counts_from_states
+from .timeline import parse_timeline_fields, timeline_downsampler
+from .player_state import as_dict
+from .shop_odds import shop_odds_engine, dependency_error as shop_odds_dependency_error, DEFAULT_REROLLS
 from .bench_organizer import organize_bench, BenchOrganizerError
 
 
+# Largest page /api/matches serves in one response
+MATCHES_PAGE_MAX = 500
+
+
 def _gsi_replay_header_truthy():
     """True when client requests GSI replay mode (no DB writes for this upload path)."""
     v = (request.headers.get('X-GSI-Replay') or '').strip().lower()
@@ -34,22 +43,12 @@ def _parse_snapshot_timestamp(value):
 
 def _get_latest_snapshot_timestamp(match_id):
     try:
-        snapshots = db.get_match_snapshots(match_id)
+        latest = db.get_latest_snapshot_meta(match_id)
     except Exception as e:
-        print(f"[WARN] Failed to load snapshots for abandon timestamp ({match_id}): {e}")
+        print(f"[WARN] Failed to load latest snapshot for abandon timestamp ({match_id}): {e}")
         return None
 
-    latest_snapshot = None
-    latest_sort_key = None
-    for snapshot in snapshots:
-        sequence = snapshot.get('sequence_number') or 0
-        snapshot_time = _parse_snapshot_timestamp(snapshot.get('timestamp'))
-        sort_key = (int(sequence), snapshot_time or datetime.min)
-        if latest_sort_key is None or sort_key > latest_sort_key:
-            latest_sort_key = sort_key
-            latest_snapshot = snapshot_time
-
-    return latest_snapshot
+    return _parse_snapshot_timestamp(latest['timestamp']) if latest else None
 
 
 # Serve React App (Production mode)
@@ -90,8 +89,8 @@ def get_status():
 def health_check():
     """Enhanced health check endpoint."""
     try:
-        # Check database connection
-        db.conn.execute("SELECT 1")
+        # Check database connection (read pool - never waits on the writer)
+        db.check_health()
         db_status = "healthy"
     except Exception as e:
         db_status = f"unhealthy: {str(e)}"
@@ -101,6 +100,21 @@ def health_check():
         'timestamp': datetime.now().isoformat(),
         'database': db_status,
         'queue_size': db_write_queue.qsize(),
+        'db_writer': {
+            **db_writer_stats,
+            'last_commit_at': db_writer_stats['last_commit_at'].isoformat() if db_writer_stats['last_commit_at'] else None
+        },
+        'ingest': {
+            **ingest_stats,
+            'depth': gsi_ingest_queue.qsize(),
+            'capacity': gsi_ingest_queue.maxsize,
+        },
+        'broadcast': match_update_scheduler.stats,
+        'matchup_predictor_cache': matchup_predictor_service.cache_stats(),
+        'shop_odds_cache': shop_odds_engine.cache_stats(),
+        'timeline_cache': timeline_downsampler.cache_stats(),
+        'snapshot_blobs': db.blob_cache_stats(),
+        'prematch_buffer': match_state.prematch_buffer.metrics(),
         'connected_clients': len(connected_clients),
         'active_match': match_state.match_id is not None,
         'gsi_endpoint': f"http://{GSI_HOST}:{GSI_PORT}/upload"
@@ -128,8 +142,7 @@ def abandon_match_endpoint():
 @app.route('/api/matches/<match_id>/abandon', methods=['POST'])
 def abandon_specific_match_endpoint(match_id):
     """Manually abandon a specific in-progress match id."""
-    all_matches = db.get_all_matches()
-    match_meta = next((m for m in all_matches if m.get('match_id') == match_id), None)
+    match_meta = db.get_match(match_id)
     if not match_meta:
         return jsonify({'error': 'Match not found'}), 404
 
@@ -154,12 +167,35 @@ def abandon_specific_match_endpoint(match_id):
 
 @app.route('/api/matches', methods=['GET'])
 def get_matches():
-    """Get list of all matches."""
-    matches = db.get_all_matches()
+    """
+    Get list of matches, newest first.
+    
+    Query params (all optional): limit (page size, max MATCHES_PAGE_MAX; no limit = all matches),
+    cursor (next_cursor of the previous page), from / to (started_at range, e.g. 2026-01-31),
+    account_id, status (completed | in_progress).
+    """
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, MATCHES_PAGE_MAX))
+    try:
+        matches, next_cursor = db.list_matches(
+            limit=limit,
+            cursor=request.args.get('cursor') or None,
+            started_from=request.args.get('from') or None,
+            started_to=request.args.get('to') or None,
+            account_id=request.args.get('account_id', type=int),
+            status=request.args.get('status') or None,
+        )
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     return jsonify({
         'status': 'success',
         'matches': matches,
-        'count': len(matches)
+        'count': len(matches),
+        'next_cursor': next_cursor
     })
 
 
@@ -219,9 +255,24 @@ def organize_bench_endpoint():
         }), 500
 
 
+# Snapshot fields the match summary reads (same stats and board as the match_summaries table)
+SUMMARY_SNAPSHOT_FIELDS = db.MATCH_SUMMARY_STATS + tuple(field for _, field in db.MATCH_SUMMARY_JSON)
+
+
+def _latest_snapshots_by_account(match_id, to_int) -> Dict[int, Dict]:
+    """Latest public snapshot per player, for matches without materialized summaries (rebuild_match_summaries.py)."""
+    latest_by_account: Dict[int, Dict] = {}
+    try:
+        for snapshot in db.get_latest_player_snapshots(match_id, fields=SUMMARY_SNAPSHOT_FIELDS):
+            latest_by_account[to_int(snapshot.get('account_id'), default=-1)] = snapshot
+    except Exception as snapshot_error:
+        print(f"[WARN] Failed to get snapshots for summary {match_id}: {snapshot_error}")
+    return latest_by_account
+
+
 @app.route('/api/matches/<match_id>/summary', methods=['GET'])
 def get_match_summary(match_id):
-    """Get enriched summary/details for a match using latest snapshots and player metadata."""
+    """Get enriched summary/details for a match (latest player states, player metadata, combat tallies)."""
     try:
         def to_int(value, default=0):
             try:
@@ -231,8 +282,7 @@ def get_match_summary(match_id):
             except (TypeError, ValueError):
                 return default
 
-        all_matches = db.get_all_matches()
-        match_meta = next((m for m in all_matches if m.get('match_id') == match_id), None)
+        match_meta = db.get_match(match_id)
         if not match_meta:
             return jsonify({
                 'status': 'error',
@@ -242,20 +292,34 @@ def get_match_summary(match_id):
         players = match_meta.get('players') or []
         players_by_account = {p.get('account_id'): p for p in players}
 
-        snapshots: List[Dict] = []
-        try:
-            snapshots = db.get_match_snapshots(match_id)
-        except Exception as snapshot_error:
-            print(f"[WARN] Failed to get snapshots for summary {match_id}: {snapshot_error}")
-
+        # Latest state per player: live match state for the active match, the materialized
+        # match_summaries rows for finished matches, snapshots only for matches never finalized
+        combat_summary: Dict[str, Dict[str, int]] = {}
         latest_by_account: Dict[int, Dict] = {}
-        for snapshot in snapshots:
-            account_id = to_int(snapshot.get('account_id'), default=-1)
-            if account_id is None:
-                continue
-            previous = latest_by_account.get(account_id)
-            if previous is None or to_int(snapshot.get('sequence_number'), 0) >= to_int(previous.get('sequence_number'), 0):
-                latest_by_account[account_id] = snapshot
+        with data_lock:
+            is_active_match = match_state.match_id == match_id
+            if is_active_match:
+                for account_id, state in match_state.latest_processed_public_player_states.items():
+                    latest_by_account[to_int(account_id, default=-1)] = as_dict(state)
+                for account_id, combats in match_state.player_combat_history.items():
+                    combat_summary[str(account_id)] = {
+                        'wins': sum(1 for c in combats if c.get('result') == 'win'),
+                        'losses': sum(1 for c in combats if c.get('result') == 'loss'),
+                        'draws': sum(1 for c in combats if c.get('result') == 'draw')
+                    }
+        
+        if not is_active_match:
+            for row in db.get_match_summary_rows(match_id):
+                account_id = to_int(row.get('account_id'), default=-1)
+                if row.get('sequence_number') is not None:
+                    latest_by_account[account_id] = row
+                combat_summary[str(account_id)] = {
+                    'wins': to_int(row.get('combat_wins'), 0),
+                    'losses': to_int(row.get('combat_losses'), 0),
+                    'draws': to_int(row.get('combat_draws'), 0)
+                }
+            if not combat_summary:
+                latest_by_account = _latest_snapshots_by_account(match_id, to_int)
 
         player_summaries: List[Dict] = []
         for account_id, player_meta in players_by_account.items():
@@ -300,18 +364,6 @@ def get_match_summary(match_id):
         partial = not complete
         bot_heavy = player_count > 0 and bot_count > (player_count / 2)
 
-        combat_summary: Dict[str, Dict[str, int]] = {}
-        if match_state.match_id == match_id:
-            for account_id, combats in match_state.player_combat_history.items():
-                win_count = sum(1 for c in combats if c.get('result') == 'win')
-                loss_count = sum(1 for c in combats if c.get('result') == 'loss')
-                draw_count = sum(1 for c in combats if c.get('result') == 'draw')
-                combat_summary[str(account_id)] = {
-                    'wins': win_count,
-                    'losses': loss_count,
-                    'draws': draw_count
-                }
-
         return jsonify({
             'status': 'success',
             'match_id': match_id,
@@ -418,6 +470,165 @@ def get_matchup_prediction(match_id):
         }), 500
 
 
+@app.route('/api/matches/<match_id>/pool', methods=['GET'])
+def get_match_pool(match_id):
+    """Get remaining hero pool counts (unit_id -> {remaining, total}) for a match."""
+    try:
+        with data_lock:
+            is_active_match = match_state.match_id == match_id
+            if is_active_match:
+                pool = match_state.hero_pool.counts()
+        
+        if not is_active_match:
+            # Historical match: final boards from match_summaries, latest snapshots if never finalized
+            latest_states = db.get_match_summary_rows(match_id) or db.get_latest_player_snapshots(match_id, fields=('units',))
+            if not latest_states:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Match not found'
+                }), 404
+            pool = pool_counts_from_states(latest_states)
+        
+        return jsonify({
+            'status': 'success',
+            'match_id': match_id,
+            'is_active_match': is_active_match,
+            'pool': {str(unit_id): count for unit_id, count in pool.items()}
+        })
+    except Exception as e:
+        print(f"[ERROR] Failed to get match pool: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@app.route('/api/matches/<match_id>/odds', methods=['GET'])
+def get_match_odds(match_id):
+    """
+    Get shop-roll odds for every draft-pool hero in an active match.
+    
+    Query params (all optional): account_id (default: private player), level (default: that
+    player's level), reroll_cost (default: from the private state), rerolls (curve length, default 10).
+    """
+    try:
+        dep_error = shop_odds_dependency_error()
+        if dep_error:
+            return jsonify({
+                'status': 'error',
+                'message': dep_error
+            }), 503
+        
+        with data_lock:
+            if match_state.match_id != match_id:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Match not found or not active'
+                }), 404
+            
+            account_id = request.args.get('account_id', type=int, default=match_state.private_player_account_id)
+            public_state = match_state.latest_processed_public_player_states.get(account_id)
+            level = request.args.get('level', type=int)
+            if level is None:
+                level = (public_state.get('level') if public_state else None) or 1
+            reroll_cost = request.args.get('reroll_cost', type=int)
+            private_state = match_state.latest_processed_private_player_state
+            if reroll_cost is None and private_state and account_id == match_state.private_player_account_id:
+                reroll_cost = private_state.get('reroll_cost')
+            odds = shop_odds_engine.get_odds(
+                match_state.hero_pool,
+                level,
+                account_id=account_id,
+                reroll_cost=reroll_cost,
+                rerolls=request.args.get('rerolls', type=int, default=DEFAULT_REROLLS),
+            )
+        
+        return jsonify({
+            'status': 'success',
+            'match_id': match_id,
+            'odds': odds
+        })
+    except Exception as e:
+        print(f"[ERROR] Failed to get match odds: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@app.route('/api/matches/<match_id>/timeline', methods=['GET'])
+def get_match_timeline(match_id):
+    """
+    Get per-player time series (columnar) for a match.
+    
+    Query params (optional): fields (comma-separated, default health,gold,net_worth,level,xp),
+    account_id (repeatable), points (downsample each metric to this budget), method (lttb|minmax,
+    default lttb), x (sequence|time, default sequence). The active match is served from memory;
+    past matches from snapshots (cached). Both go through the same downsampling cache.
+    """
+    try:
+        try:
+            fields = parse_timeline_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
+        account_ids = request.args.getlist('account_id', type=int) or None
+        points = request.args.get('points', type=int)
+        method = request.args.get('method', 'lttb')
+        x_axis = request.args.get('x', 'sequence')
+        
+        def build(timeline):
+            if points is None:
+                return timeline.to_dict(fields, account_ids)
+            return timeline_downsampler.downsample(match_id, timeline, fields, points, method, x_axis, account_ids)
+        
+        try:
+            # Only copy the needed columns under the lock - conversion and downsampling run after it
+            with data_lock:
+                is_active_match = match_state.match_id == match_id
+                if is_active_match:
+                    timeline = match_state.timeline.copy(fields, account_ids)
+            
+            if not is_active_match:
+                timeline = timeline_downsampler.historical_timeline(db, match_id)
+                if timeline is None:
+                    return jsonify({
+                        'status': 'error',
+                        'message': 'Match not found'
+                    }), 404
+            players = build(timeline)
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
+        
+        response = {
+            'status': 'success',
+            'match_id': match_id,
+            'is_active_match': is_active_match,
+            'fields': fields,
+            'players': players
+        }
+        if points is not None:
+            response['downsample'] = {'points': points, 'method': method, 'x': x_axis}
+        return jsonify(response)
+    except Exception as e:
+        print(f"[ERROR] Failed to get match timeline: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
 @app.route('/api/matches/<match_id>/shop_history', methods=['GET'])
 def get_match_shop_history(match_id):
     """Get shop history for a match (one entry per shop_generation_id from DB)."""
@@ -440,90 +651,99 @@ def get_match_shop_history(match_id):
 
 @app.route('/api/matches/<match_id>/changes', methods=['GET'])
 def get_match_changes(match_id):
-    """Get changes for a match (from buffer if active, or calculated from database if historical)."""
+    """
+    Get changes for a match (from buffer if active, or from the match_changes table if historical).
+    
+    Without a cursor returns the newest changes first. With after_change_id and/or since_sequence
+    returns the changes after the cursor oldest first; poll again with next_cursor as after_change_id.
+    """
     try:
         # Get query parameters
         account_id = request.args.get('account_id', type=int)
         limit = request.args.get('limit', default=500, type=int)
         round_number = request.args.get('round_number', type=int)
         round_phase = request.args.get('round_phase', type=str)
+        types_param = request.args.get('types', type=str)
+        change_types = [t.strip() for t in types_param.split(',') if t.strip()] if types_param else None
+        after_change_id = request.args.get('after_change_id', type=int)
+        since_sequence = request.args.get('since_sequence', type=int)
+        has_cursor = after_change_id is not None or since_sequence is not None
         
         # Check if match is active
         is_active_match = match_state.match_id == match_id
         
         if is_active_match:
-            # Active match: Retrieve from in-memory buffer
-            changes = change_detector.get_changes(match_id, account_id=account_id, limit=limit)
+            # Active match: indexed view of the in-memory change log
+            changes = change_detector.get_changes(
+                match_id,
+                account_id=account_id,
+                limit=limit,
+                change_types=change_types,
+                round_number=round_number,
+                round_phase=round_phase,
+                after_change_id=after_change_id,
+                since_sequence=since_sequence
+            )
+            last_change_id = change_detector.last_change_id(match_id)
+        elif db.has_match_changes(match_id):
+            # Historical match: indexed scan of the changes persisted at ingest time
+            changes = db.get_match_changes(
+                match_id,
+                account_id=account_id,
+                change_types=change_types,
+                round_number=round_number,
+                round_phase=round_phase,
+                limit=limit,
+                after_change_id=after_change_id,
+                since_sequence=since_sequence
+            )
+            last_change_id = db.get_last_change_id(match_id)
         else:
-            # Historical match: Calculate from database snapshots
-            changes = []
-            
-            # Get snapshots for the match
+            # Legacy match (recorded before match_changes existed): calculate from database snapshots
+            # Run scripts/backfill_match_changes.py once to persist these
             if account_id is not None:
                 # Get snapshots for specific player
                 snapshots = db.get_player_snapshots(
                     match_id, 
                     account_id, 
                     round_number=round_number, 
-                    round_phase=round_phase
+                    round_phase=round_phase,
+                    fields=REPLAY_SNAPSHOT_FIELDS
                 )
             else:
-                # Get snapshots for all players (or filtered list)
-                account_ids_list = None
-                if account_id is not None:
-                    account_ids_list = [account_id]
-                snapshots = db.get_match_snapshots(match_id, account_ids=account_ids_list)
-            
-            # Need at least 2 snapshots to calculate changes
-            if len(snapshots) < 2:
-                return jsonify({
-                    'status': 'success',
-                    'match_id': match_id,
-                    'changes': [],
-                    'count': 0
-                })
+                snapshots = db.get_match_snapshots(match_id, fields=REPLAY_SNAPSHOT_FIELDS)
             
-            # Group snapshots by account_id
-            snapshots_by_account: Dict[int, List[Dict]] = {}
-            for snapshot in snapshots:
-                acc_id = snapshot['account_id']
-                if acc_id not in snapshots_by_account:
-                    snapshots_by_account[acc_id] = []
-                snapshots_by_account[acc_id].append(snapshot)
-            
-            # Calculate changes by comparing consecutive snapshots for each player
-            for acc_id, player_snapshots in snapshots_by_account.items():
-                # Sort by sequence_number to ensure chronological order
-                player_snapshots.sort(key=lambda s: s['sequence_number'])
-                
-                # Compare each snapshot with the previous one
-                for i in range(1, len(player_snapshots)):
-                    previous_snapshot = player_snapshots[i - 1]
-                    current_snapshot = player_snapshots[i]
-                    
-                    # Detect changes between these two snapshots
-                    detected_changes = change_detector.detect_changes(
-                        previous_snapshot,
-                        current_snapshot,
-                        acc_id,
-                        match_id,
-                        round_number=current_snapshot.get('round_number'),
-                        round_phase=current_snapshot.get('round_phase')
-                    )
-                    
-                    changes.extend(detected_changes)
+            changes = []
+            for _, detected_changes in change_detector.replay_snapshots(match_id, snapshots):
+                changes.extend(detected_changes)
+            last_change_id = changes[-1]['change_id'] if changes else 0
+            if change_types:
+                wanted_types = set(change_types)
+                changes = [c for c in changes if c.get('type') in wanted_types]
+            if after_change_id is not None:
+                changes = [c for c in changes if c['change_id'] > after_change_id]
+            if since_sequence is not None:
+                changes = [c for c in changes if (c.get('current_sequence_number') or 0) > since_sequence]
             
-            # Sort changes by timestamp descending (newest first)
-            changes.sort(key=lambda c: c.get('timestamp', ''), reverse=True)
+            if not has_cursor:
+                # Newest first
+                changes.reverse()
             
             # Apply limit
             if limit is not None:
                 changes = changes[:limit]
         
+        # Cursor for the next poll: last change returned after a cursor, otherwise the newest change overall
+        if has_cursor:
+            next_cursor = changes[-1]['change_id'] if changes else after_change_id
+        else:
+            next_cursor = last_change_id
+        
         return jsonify({
             'status': 'success',
             'match_id': match_id,
             'changes': changes,
+            'next_cursor': next_cursor,
             'count': len(changes)
         })
     
@@ -714,8 +934,9 @@ def receive_gsi_data():
                             'status': 'error',
                             'message': 'Cannot start GSI replay while a live match is active in memory. Abandon the match first.'
                         }), 409
-            # Process in background to not block game (SocketIO-compatible)
-            socketio.start_background_task(process_gsi_data, gsi_payload, persist_to_db)
+            # Hand off to the ingest worker (arrival order, bounded queue) and answer the game right away
+            if not enqueue_gsi_payload(gsi_payload, persist_to_db):
+                return jsonify({"status": "dropped", "message": "GSI ingest queue is full"}), 503
         else:
             print(f"[DEBUG] Received empty GSI data")
         
@@ -740,10 +961,11 @@ def handle_connect():
     print(f'[WebSocket] Total connected clients: {len(connected_clients)}')
     emit('connection_response', {'status': 'connected'})
     
-    # If there's an active match, send current game state immediately
-    if match_state.match_id:
-        print(f'[WebSocket] Sending current game state to new client: {match_state.match_id}')
-        emit_realtime_update()
+    # If there's an active match, send current game state immediately (keyframe to this client only)
+    with data_lock:
+        if match_state.match_id:
+            print(f'[WebSocket] Sending current game state to new client: {match_state.match_id}')
+            emit_keyframe_to_client(request.sid)
 
 
 @socketio.on('disconnect')
@@ -754,6 +976,14 @@ def handle_disconnect():
     print(f'[WebSocket] Remaining connected clients: {len(connected_clients)}')
 
 
+@socketio.on('request_keyframe')
+def handle_request_keyframe():
+    """Client lost track of the delta stream (missed frame) - resend a full keyframe."""
+    print(f'[WebSocket] Keyframe requested by client: {request.sid}')
+    with data_lock:
+        emit_keyframe_to_client(request.sid)
+
+
 @socketio.on('test_connection')
 def handle_test_connection():
     """Test WebSocket connection."""
@@ -0,0 +1,297 @@
+"""
+Shop Odds Engine - shop-roll probabilities and expected gold for every draft-pool hero at once
+
+Same shop model as getHeroShopProbability in frontend/src/utils/poolCalculator.ts: a shop has
+five independent slots, each slot rolls a tier from SHOP_ODDS[level] and then a hero of that
+tier weighted by remaining pool copies. With p = P(one slot shows the hero) the copies seen per
+shop are Binomial(5, p). All heroes are evaluated together as NumPy arrays, assuming the pool
+does not move while rolling and every copy seen is bought.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from math import comb
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - handled with diagnostics
+    np = None
+
+from .hero_pool import RANK_POOL_UNITS, HeroPoolTracker
+
+SHOP_SLOTS = 5
+# Tier probabilities (tier 1..5) per player level - mirrors shopOdds in poolCalculator.ts
+SHOP_ODDS = {
+    1: (0.80, 0.20, 0.00, 0.00, 0.00),
+    2: (0.70, 0.30, 0.00, 0.00, 0.00),
+    3: (0.55, 0.35, 0.10, 0.00, 0.00),
+    4: (0.45, 0.40, 0.15, 0.00, 0.00),
+    5: (0.35, 0.40, 0.25, 0.00, 0.00),
+    6: (0.25, 0.35, 0.35, 0.05, 0.00),
+    7: (0.20, 0.30, 0.40, 0.10, 0.00),
+    8: (0.18, 0.24, 0.35, 0.20, 0.03),
+    9: (0.15, 0.21, 0.30, 0.28, 0.06),
+    10: (0.12, 0.18, 0.28, 0.32, 0.10),
+}
+DEFAULT_REROLL_COST = 2
+DEFAULT_REROLLS = 10
+MAX_REROLLS = 50
+# Copies held when a hero reaches 2 / 3 stars
+STAR_COPIES = {'two_star': RANK_POOL_UNITS[2], 'three_star': RANK_POOL_UNITS[3]}
+
+
+def dependency_error() -> str | None:
+    if np is None:
+        return "Missing Python dependencies: numpy"
+    return None
+
+
+def _clamp_level(level: Any) -> int:
+    try:
+        return min(10, max(1, int(level)))
+    except (TypeError, ValueError):
+        return 1
+
+
+def slot_probabilities(level: int, tiers: "np.ndarray", remaining: "np.ndarray") -> "np.ndarray":
+    """P(one shop slot shows the hero) for every hero: tier odds x share of that tier's remaining copies."""
+    odds = np.asarray(SHOP_ODDS[_clamp_level(level)])
+    tier_remaining = np.bincount(tiers, weights=remaining, minlength=len(odds) + 1)[tiers]
+    share = np.divide(remaining, tier_remaining, out=np.zeros_like(remaining), where=tier_remaining > 0)
+    return odds[tiers - 1] * share
+
+
+def copies_per_shop(p: "np.ndarray") -> "np.ndarray":
+    """(heroes, 6) matrix: P(a shop shows exactly c copies), c = 0..5."""
+    c = np.arange(SHOP_SLOTS + 1)
+    binom = np.array([comb(SHOP_SLOTS, k) for k in c], dtype=float)
+    p = p[:, None]
+    return binom * p ** c * (1.0 - p) ** (SHOP_SLOTS - c)
+
+
+def expected_shops(pmf: "np.ndarray", needed: "np.ndarray") -> "np.ndarray":
+    """
+    Expected shops until `needed` more copies were seen (closed form over the absorbing chain).
+
+    E[j] = (1 + sum_{c=1..min(j,5)} P(c) * E[j-c]) / (1 - P(0)); inf where the hero never shows.
+    """
+    heroes = len(needed)
+    most = int(needed.max()) if heroes else 0
+    table = np.zeros((heroes, most + 1))
+    leave = 1.0 - pmf[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for j in range(1, most + 1):
+            total = np.ones(heroes)
+            for c in range(1, min(j, SHOP_SLOTS) + 1):
+                total += pmf[:, c] * table[:, j - c]
+            table[:, j] = np.where(leave > 0, total / leave, np.inf)
+    return table[np.arange(heroes), needed]
+
+
+def completion_within(pmf: "np.ndarray", needed: "np.ndarray", shops: int) -> "np.ndarray":
+    """(heroes, shops) matrix: P(`needed` more copies were seen within n shops), n = 1..shops."""
+    heroes = len(needed)
+    most = int(needed.max()) if heroes else 0
+    dist = np.zeros((heroes, most + 1))  # P(j copies still needed)
+    dist[np.arange(heroes), needed] = 1.0
+    done = np.empty((heroes, shops))
+    for n in range(shops):
+        step = np.zeros_like(dist)
+        step[:, 0] = dist[:, 0]
+        for c in range(SHOP_SLOTS + 1):
+            weight = pmf[:, c:c + 1]
+            if c < most:
+                step[:, 1:most + 1 - c] += weight * dist[:, c + 1:]
+            if c:
+                step[:, 0] += weight[:, 0] * dist[:, 1:min(c, most) + 1].sum(axis=1)
+        dist = step
+        done[:, n] = dist[:, 0]
+    return done
+
+
+def monte_carlo(p: "np.ndarray", needed: "np.ndarray", shops: int, trials: int = 10000,
+                seed: Optional[int] = None) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Batched simulation of the same model, for validating the closed forms.
+
+    Returns:
+        tuple: ((heroes, shops) P(done within n shops), (heroes,) mean shops over trials done within `shops`)
+    """
+    rng = np.random.default_rng(seed)
+    seen = rng.binomial(SHOP_SLOTS, p[:, None, None], size=(len(p), trials, shops)).cumsum(axis=2)
+    done = seen >= needed[:, None, None]
+    within = done.mean(axis=1)
+    finished = done[:, :, -1]
+    first = done.argmax(axis=2) + 1
+    with np.errstate(invalid='ignore'):
+        mean_shops = np.where(needed == 0, 0.0, (first * finished).sum(axis=1) / finished.sum(axis=1))
+    return within, mean_shops
+
+
+def _rounded(values: "np.ndarray") -> list:
+    """JSON-friendly list: 4 decimals, inf/nan -> None."""
+    rounded = np.round(values, 4)
+    return [None if not np.isfinite(value) else value for value in rounded.tolist()]
+
+
+class ShopOddsEngine:
+    # Keyed by (pool version, level, ...) - the pool version changes on every purchase/sale, so
+    # only the last few payloads are ever hit again
+    CACHE_SIZE = 32
+
+    def __init__(self) -> None:
+        self._cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_stats(self) -> Dict[str, int]:
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "max_size": self.CACHE_SIZE,
+            }
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    @staticmethod
+    def compute(
+        pool: HeroPoolTracker,
+        level: int,
+        owned: Optional[Dict[int, int]] = None,
+        reroll_cost: int = DEFAULT_REROLL_COST,
+        rerolls: int = DEFAULT_REROLLS,
+    ) -> Dict[str, Any]:
+        """
+        Odds for every draft-pool hero (uncached).
+
+        Per hero: P(in the next shop), P(seen within n rerolls), and for 2 and 3 stars the copies
+        still needed (from `owned`), expected rerolls, expected gold (rerolls x reroll_cost + copies
+        x tier cost) and P(reached within n rerolls). None marks an impossible target.
+        """
+        owned = owned or {}
+        tiers_by_hero = pool.tiers
+        unit_ids = list(pool.remaining)
+        tiers = np.fromiter((tiers_by_hero[unit_id] for unit_id in unit_ids), dtype=np.intp, count=len(unit_ids))
+        remaining = np.fromiter((max(0, pool.remaining[unit_id]) for unit_id in unit_ids), dtype=float, count=len(unit_ids))
+        held = np.fromiter((owned.get(unit_id, 0) for unit_id in unit_ids), dtype=np.intp, count=len(unit_ids))
+
+        level = _clamp_level(level)
+        p = slot_probabilities(level, tiers, remaining)
+        pmf = copies_per_shop(p)
+        miss = (1.0 - p)[:, None] ** (SHOP_SLOTS * np.arange(1, rerolls + 1))
+
+        targets = {}
+        for name, copies in STAR_COPIES.items():
+            needed = np.maximum(copies - held, 0)
+            possible = remaining >= needed
+            shops = np.where(possible, expected_shops(pmf, needed), np.inf)
+            gold = shops * reroll_cost + needed * tiers
+            within = np.where(possible[:, None], completion_within(pmf, needed, rerolls), 0.0)
+            targets[name] = (needed, shops, gold, within)
+
+        p_next = _rounded(1.0 - miss[:, 0])
+        p_seen = np.round(1.0 - miss, 4).tolist()
+        star_lists = {
+            name: (needed.tolist(), _rounded(shops), _rounded(gold), np.round(within, 4).tolist())
+            for name, (needed, shops, gold, within) in targets.items()
+        }
+        heroes = {}
+        for index, unit_id in enumerate(unit_ids):
+            hero = {
+                'tier': int(tiers[index]),
+                'remaining': int(remaining[index]),
+                'owned': int(held[index]),
+                'p_next_shop': p_next[index],
+                'p_seen_within': p_seen[index],
+            }
+            for name, (needed, shops, gold, within) in star_lists.items():
+                hero[name] = {
+                    'copies_needed': needed[index],
+                    'expected_rerolls': shops[index],
+                    'expected_gold': gold[index],
+                    'p_within': within[index],
+                }
+            heroes[str(unit_id)] = hero
+        return {
+            'level': level,
+            'reroll_cost': reroll_cost,
+            'rerolls': rerolls,
+            'pool_version': pool.version,
+            'heroes': heroes,
+        }
+
+    def get_odds(
+        self,
+        pool: HeroPoolTracker,
+        level: int,
+        account_id: Optional[int] = None,
+        reroll_cost: Optional[int] = None,
+        rerolls: int = DEFAULT_REROLLS,
+        summary: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cached odds for one player (owned copies come from their units in the pool tracker).
+
+        summary=True returns the compact form sent on the realtime stream: no per-reroll curves,
+        unit_id -> [p_next_shop, expected gold to 2 stars, expected gold to 3 stars].
+        """
+        if np is None:
+            return None
+        level = _clamp_level(level)
+        reroll_cost = DEFAULT_REROLL_COST if reroll_cost is None else int(reroll_cost)
+        rerolls = min(MAX_REROLLS, max(1, int(rerolls)))
+        # Pool versions are unique across trackers; the player's own units are part of the pool
+        cache_key = (pool.version, level, account_id, reroll_cost, rerolls, summary)
+        with self._cache_lock:
+            payload = self._cache.get(cache_key)
+            if payload is not None:
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return payload
+            self.cache_misses += 1
+
+        if summary:
+            odds = self.get_odds(pool, level, account_id, reroll_cost, rerolls)
+            payload = {
+                'level': odds['level'],
+                'reroll_cost': odds['reroll_cost'],
+                'pool_version': odds['pool_version'],
+                'account_id': account_id,
+                'heroes': {
+                    unit_id: [hero['p_next_shop'], hero['two_star']['expected_gold'], hero['three_star']['expected_gold']]
+                    for unit_id, hero in odds['heroes'].items()
+                },
+            }
+        else:
+            owned = pool.player_units.get(account_id, {}) if account_id is not None else {}
+            payload = self.compute(pool, level, owned, reroll_cost, rerolls)
+            payload['account_id'] = account_id
+        with self._cache_lock:
+            self._cache[cache_key] = payload
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return payload
+
+    def get_current_odds(self, match_state: Any, summary: bool = False,
+                         rerolls: int = DEFAULT_REROLLS) -> Optional[Dict[str, Any]]:
+        """Odds for the private player at their current level and reroll cost, or None if unknown."""
+        account_id = match_state.private_player_account_id
+        if not match_state.match_id or account_id is None:
+            return None
+        public_state = match_state.latest_processed_public_player_states.get(account_id)
+        if public_state is None:
+            return None
+        private_state = match_state.latest_processed_private_player_state
+        reroll_cost = private_state.get('reroll_cost') if private_state else None
+        return self.get_odds(match_state.hero_pool, public_state.get('level') or 1, account_id, reroll_cost, rerolls,
+                             summary=summary)
+
+
+shop_odds_engine = ShopOddsEngine()
@@ -0,0 +1,154 @@
+"""
+Snapshot JSON Codec - optional compression for the JSON stored in snapshot_blobs
+
+A stored value is either plain JSON text (codec off, and everything written before the codec
+existed) or a versioned binary frame:
+
+    byte 0      format version (FORMAT_ZLIB)
+    bytes 1-2   dictionary id, big-endian (0 = no dictionary)
+    bytes 3..   raw deflate stream of the UTF-8 JSON, primed with that dictionary
+
+Snapshot JSON values are small (a board is a few hundred bytes) and mostly made of the same
+keys and value shapes, so on its own deflate barely helps; a shared dictionary of common
+fragments trained from stored values (train_dictionary) carries that redundancy instead.
+Dictionaries are kept in the database and never changed or deleted, so every frame stays
+decodable after a newer dictionary is trained. Compressors and decompressors are primed with
+their dictionary once and copied per value, which skips re-hashing the dictionary each time.
+"""
+from __future__ import annotations
+
+import re
+import struct
+import zlib
+from collections import Counter
+from threading import Lock
+from typing import Dict, Iterable, Optional, Union
+
+CODECS = ('none', 'zlib')
+FORMAT_ZLIB = 1
+HEADER = struct.Struct('>BH')
+DEFAULT_LEVEL = 6
+# Deflate can only reference the last 32 KB of a dictionary
+MAX_DICTIONARY_BYTES = 32 * 1024
+# Smaller trained dictionaries (few blobs, nothing repeating across them) are not worth storing
+MIN_DICTIONARY_BYTES = 256
+_RAW_DEFLATE = -zlib.MAX_WBITS
+
+# One "key": value pair (scalar value) or "key": before a nested object/array
+_SEGMENT = re.compile(r'"[^"\\]*"\s*:\s*(?:"[^"\\]*"|[^,{}\[\]"]*)')
+# Runs of consecutive segments counted as one fragment (keeps separators like ,"rank": or },{)
+_MAX_SEGMENT_RUN = 4
+_MAX_FRAGMENT_BYTES = 256
+_MAX_CANDIDATES = 20000
+
+StoredJson = Union[str, bytes]
+
+
+class CodecError(ValueError):
+    """Stored JSON that cannot be decoded (unknown format or dictionary)."""
+
+
+def frame_dictionary_id(value: StoredJson) -> Optional[int]:
+    """Dictionary id of a frame, None for plain JSON text."""
+    if isinstance(value, str):
+        return None
+    if len(value) < HEADER.size:
+        raise CodecError(f"Truncated snapshot JSON frame ({len(value)} bytes)")
+    version, dictionary_id = HEADER.unpack_from(value)
+    if version != FORMAT_ZLIB:
+        raise CodecError(f"Unknown snapshot JSON frame version {version}")
+    return dictionary_id
+
+
+class JsonCodec:
+    """Encodes JSON text into zlib frames with one dictionary and compression level."""
+
+    def __init__(self, dictionary: bytes = b'', dictionary_id: int = 0, level: int = DEFAULT_LEVEL):
+        if bool(dictionary) != bool(dictionary_id):
+            raise ValueError("dictionary and dictionary_id go together (id 0 means no dictionary)")
+        self.dictionary_id = dictionary_id
+        self.level = level
+        self._header = HEADER.pack(FORMAT_ZLIB, dictionary_id)
+        options = {'zdict': dictionary} if dictionary else {}
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, _RAW_DEFLATE, 9, zlib.Z_DEFAULT_STRATEGY, **options)
+
+    def encode(self, text: str) -> StoredJson:
+        """Frame for text, or text itself when the frame would not be smaller."""
+        data = text.encode('utf-8')
+        compressor = self._compressor.copy()
+        frame = self._header + compressor.compress(data) + compressor.flush()
+        return frame if len(frame) < len(data) else text
+
+    def is_current(self, value: StoredJson) -> bool:
+        """True if value is already a frame made with this codec's dictionary."""
+        return not isinstance(value, str) and frame_dictionary_id(value) == self.dictionary_id
+
+
+class FrameDecoder:
+    """Decodes stored JSON (frames or plain text) given the dictionaries by id. Thread-safe."""
+
+    def __init__(self):
+        self.dictionaries: Dict[int, bytes] = {}
+        self._primed: Dict[int, object] = {0: zlib.decompressobj(_RAW_DEFLATE)}
+        self._lock = Lock()
+
+    def add_dictionary(self, dictionary_id: int, dictionary: bytes) -> None:
+        with self._lock:
+            self.dictionaries[dictionary_id] = dictionary
+            self._primed[dictionary_id] = zlib.decompressobj(_RAW_DEFLATE, zdict=dictionary)
+
+    def decode(self, value: StoredJson) -> str:
+        dictionary_id = frame_dictionary_id(value)
+        if dictionary_id is None:
+            return value
+        primed = self._primed.get(dictionary_id)
+        if primed is None:
+            raise CodecError(f"Snapshot JSON dictionary {dictionary_id} is not loaded")
+        decompressor = primed.copy()
+        try:
+            data = decompressor.decompress(memoryview(value)[HEADER.size:]) + decompressor.flush()
+        except zlib.error as e:
+            raise CodecError(f"Corrupt snapshot JSON frame: {e}") from e
+        return data.decode('utf-8')
+
+
+def train_dictionary(samples: Iterable[str], max_bytes: int = MAX_DICTIONARY_BYTES) -> bytes:
+    """
+    Build a deflate dictionary from sample JSON texts.
+
+    Fragments are runs of up to _MAX_SEGMENT_RUN consecutive "key": value segments, counted
+    once per sample and scored by count * length; the best ones are packed until max_bytes,
+    most valuable last (deflate reaches the end of the dictionary with the shortest distances).
+    Empty when no fragment repeats across samples.
+    """
+    counts: Counter = Counter()
+    for text in samples:
+        spans = [match.span() for match in _SEGMENT.finditer(text)]
+        fragments = set()
+        for start_index, (start, _) in enumerate(spans):
+            for end_index in range(start_index, min(start_index + _MAX_SEGMENT_RUN, len(spans))):
+                fragment = text[start:spans[end_index][1]]
+                if len(fragment) > _MAX_FRAGMENT_BYTES:
+                    break
+                fragments.add(fragment)
+        counts.update(fragments)
+
+    ranked = sorted(
+        ((count * len(fragment), fragment) for fragment, count in counts.items() if count > 1 and len(fragment) > 3),
+        reverse=True
+    )[:_MAX_CANDIDATES]
+    chosen = []
+    packed = ''
+    size = 0
+    for _, fragment in ranked:
+        if size >= max_bytes - 4:
+            break
+        if fragment in packed:
+            continue
+        encoded_size = len(fragment.encode('utf-8'))
+        if size + encoded_size > max_bytes:
+            continue
+        chosen.append(fragment)
+        packed += fragment
+        size += encoded_size
+    return ''.join(reversed(chosen)).encode('utf-8')[-max_bytes:]
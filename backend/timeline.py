@@ -0,0 +1,330 @@
+"""
+Match Timeline - append-only columnar time series per player
+
+The match state only keeps each player's latest public state, so charts over the match
+(health, gold, net_worth, level, xp ...) used to be rebuilt from DB snapshots. A timeline
+keeps one typed array per field per player, appended during ingest. Arrays are preallocated
+and grow geometrically, so appends never copy per packet and a long match costs a few bytes
+per value instead of a dict per snapshot.
+
+The same to_dict() format is produced from DB rows for historical matches (from_rows).
+Charts ask for a point budget instead of the full series: each (player, metric) series is
+downsampled with LTTB or min/max bucketing, and the kept indices are cached, so payload
+size and client render time stay flat however long the match runs.
+"""
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Per-player stat columns that can be requested with ?fields=
+TIMELINE_FIELDS = ('health', 'gold', 'net_worth', 'level', 'xp', 'next_level_xp', 'wins', 'losses', 'win_streak', 'lose_streak')
+DEFAULT_TIMELINE_FIELDS = ('health', 'gold', 'net_worth', 'level', 'xp')
+# Axis columns, always present
+AXIS_FIELDS = ('sequence_number', 'round_number', 'timestamp')
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+# x axis for downsampling: sequence_number or time (timestamp)
+DOWNSAMPLE_AXES = {'sequence': 'sequence_number', 'time': 'timestamp'}
+MIN_DOWNSAMPLE_POINTS = 3
+
+# Stored value for None in the int32 columns (returned as null)
+MISSING_INT = -2 ** 31
+_INITIAL_CAPACITY = 64
+
+_TYPECODES = {'sequence_number': 'q', 'round_number': 'i', 'timestamp': 'd'}
+_TYPECODES.update((name, 'i') for name in TIMELINE_FIELDS)
+
+
+def parse_timeline_fields(value: Optional[str]) -> List[str]:
+    """Fields from a comma-separated ?fields= value (default set when empty). Raises ValueError on unknown names."""
+    if not value:
+        return list(DEFAULT_TIMELINE_FIELDS)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in TIMELINE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown timeline fields: {', '.join(unknown)} (available: {', '.join(TIMELINE_FIELDS)})")
+    return fields
+
+
+def _epoch_seconds(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+    return float('nan')
+
+
+class PlayerTimeline:
+    """One player's columns: AXIS_FIELDS + TIMELINE_FIELDS, `length` valid entries each."""
+    __slots__ = ('length', 'capacity', 'columns')
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self.length = 0
+        self.capacity = capacity
+        self.columns = {name: array(code, bytes(array(code).itemsize * capacity)) for name, code in _TYPECODES.items()}
+
+    def _grow(self) -> None:
+        # Double the capacity: amortized O(1) appends, at most half the slots unused
+        for column in self.columns.values():
+            column.extend(array(column.typecode, bytes(column.itemsize * self.capacity)))
+        self.capacity *= 2
+
+    def append(self, sequence_number: Any, round_number: Any, timestamp: Any, state: Any) -> None:
+        """Append one processed state (PublicPlayerState, snapshot dict or DB row mapping)."""
+        if self.length == self.capacity:
+            self._grow()
+        index = self.length
+        columns = self.columns
+        columns['sequence_number'][index] = MISSING_INT if sequence_number is None else int(sequence_number)
+        columns['round_number'][index] = MISSING_INT if round_number is None else int(round_number)
+        columns['timestamp'][index] = _epoch_seconds(timestamp)
+        get = state.get
+        for name in TIMELINE_FIELDS:
+            value = get(name)
+            columns[name][index] = MISSING_INT if value is None else int(value)
+        self.length = index + 1
+
+    def to_dict(self, fields: Sequence[str] = DEFAULT_TIMELINE_FIELDS,
+                indices: Optional[Sequence[int]] = None) -> Dict[str, List]:
+        """Column name -> list of values (axis columns first; missing values are None), optionally only at `indices`."""
+        length = self.length
+        result = {}
+        for name in (*AXIS_FIELDS, *fields):
+            column = self.columns[name]
+            values = column[:length].tolist() if indices is None else [column[index] for index in indices]
+            if name == 'timestamp':
+                result[name] = [None if value != value else value for value in values]
+            else:
+                result[name] = [None if value == MISSING_INT else value for value in values]
+        return result
+
+    def copy(self, names: Iterable[str]) -> 'PlayerTimeline':
+        """Read-only copy of the `names` columns (valid entries only) - one memcpy per column."""
+        copy = PlayerTimeline.__new__(PlayerTimeline)
+        copy.length = copy.capacity = self.length
+        copy.columns = {name: self.columns[name][:self.length] for name in names}
+        return copy
+
+    def series(self, field: str, x_axis: str = 'sequence') -> Tuple[List[int], List[float], List[float]]:
+        """(indices, x, y) of the points where both x and `field` are present."""
+        xs = self.columns[DOWNSAMPLE_AXES[x_axis]][:self.length].tolist()
+        ys = self.columns[field][:self.length].tolist()
+        kept = [index for index, (x, y) in enumerate(zip(xs, ys)) if y != MISSING_INT and x != MISSING_INT and x == x]
+        return kept, [xs[index] for index in kept], [ys[index] for index in kept]
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], budget: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets: `budget` point indices that keep the visual shape.
+
+    First and last points are always kept; each bucket in between keeps the point forming the
+    largest triangle with the previously kept point and the average of the next bucket.
+    """
+    count = len(xs)
+    if budget >= count or budget < MIN_DOWNSAMPLE_POINTS:
+        return list(range(count))
+    selected = [0]
+    bucket_size = (count - 2) / (budget - 2)
+    previous = 0
+    for bucket in range(budget - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_start, next_end = end, min(int((bucket + 2) * bucket_size) + 1, count)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+        px, py = xs[previous], ys[previous]
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs((px - avg_x) * (ys[index] - py) - (px - xs[index]) * (avg_y - py))
+            if area > best_area:
+                best, best_area = index, area
+        selected.append(best)
+        previous = best
+    selected.append(count - 1)
+    return selected
+
+
+def minmax_indices(xs: Sequence[float], ys: Sequence[float], budget: int) -> List[int]:
+    """Min/max bucketing: first, last, and the min and max point of (budget - 2) // 2 equal-width x buckets."""
+    count = len(xs)
+    if budget >= count or budget < MIN_DOWNSAMPLE_POINTS:
+        return list(range(count))
+    buckets = max(1, (budget - 2) // 2)
+    x_first, x_last = xs[0], xs[-1]
+    width = (x_last - x_first) / buckets or 1.0
+    lows: Dict[int, int] = {}
+    highs: Dict[int, int] = {}
+    for index in range(1, count - 1):
+        bucket = min(buckets - 1, int((xs[index] - x_first) / width))
+        y = ys[index]
+        if bucket not in lows or y < ys[lows[bucket]]:
+            lows[bucket] = index
+        if bucket not in highs or y > ys[highs[bucket]]:
+            highs[bucket] = index
+    return sorted({0, count - 1, *lows.values(), *highs.values()})
+
+
+_DOWNSAMPLERS = {'lttb': lttb_indices, 'minmax': minmax_indices}
+
+
+class MatchTimeline:
+    """account_id -> PlayerTimeline for one match."""
+
+    def __init__(self):
+        self.players: Dict[int, PlayerTimeline] = {}
+
+    def append(self, account_id: int, state: Any, timestamp: Any = None) -> None:
+        timeline = self.players.get(account_id)
+        if timeline is None:
+            timeline = self.players[account_id] = PlayerTimeline()
+        timeline.append(
+            state.get('sequence_number'),
+            state.get('round_number'),
+            state.get('timestamp') if timestamp is None else timestamp,
+            state,
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> 'MatchTimeline':
+        """Build from snapshot rows/dicts ordered by sequence_number (e.g. db.get_match_timeline_rows)."""
+        timeline = cls()
+        for row in rows:
+            timeline.append(row['account_id'], row)
+        return timeline
+
+    def account_ids(self, account_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """All players, or the requested ones that have a timeline."""
+        if account_ids is None:
+            return list(self.players)
+        return [account_id for account_id in account_ids if account_id in self.players]
+
+    def copy(self, fields: Sequence[str] = DEFAULT_TIMELINE_FIELDS,
+             account_ids: Optional[Iterable[int]] = None) -> 'MatchTimeline':
+        """
+        Read-only copy of the axis columns and `fields` for every player or only `account_ids`.
+        Taken under the ingest lock so to_dict / downsampling can run after releasing it.
+        """
+        copy = MatchTimeline()
+        names = (*AXIS_FIELDS, *fields)
+        copy.players = {account_id: self.players[account_id].copy(names) for account_id in self.account_ids(account_ids)}
+        return copy
+
+    def to_dict(self, fields: Sequence[str] = DEFAULT_TIMELINE_FIELDS,
+                account_ids: Optional[Iterable[int]] = None) -> Dict[str, Dict[str, List]]:
+        """account_id (string) -> columns, for every player or only `account_ids`."""
+        return {str(account_id): self.players[account_id].to_dict(fields) for account_id in self.account_ids(account_ids)}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'players': len(self.players),
+            'points': sum(timeline.length for timeline in self.players.values()),
+            'bytes': sum(timeline.nbytes() for timeline in self.players.values()),
+        }
+
+
+class TimelineDownsampler:
+    """
+    Downsampled timeline columns with cached index selections.
+
+    Every (player, metric) series is reduced to `points` indices on its own; a player's
+    columns are then sampled at the union of their metrics' indices, so each metric keeps its
+    own shape and the payload stays under len(fields) x points per player. Selections are
+    cached per (match, player, metric, points, method, axis, series length): an active match
+    only recomputes players whose timeline grew, a finished match never recomputes.
+    """
+    CACHE_SIZE = 1024
+    # Historical matches are rebuilt from SQLite once and kept for repeated chart requests
+    HISTORY_CACHE_SIZE = 8
+
+    def __init__(self) -> None:
+        self._cache: "OrderedDict[Tuple[Any, ...], List[int]]" = OrderedDict()
+        self._history: "OrderedDict[Tuple[str, int], MatchTimeline]" = OrderedDict()
+        self._cache_lock = Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_stats(self) -> Dict[str, int]:
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "max_size": self.CACHE_SIZE,
+                "historical_matches": len(self._history),
+            }
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+            self._history.clear()
+
+    def historical_timeline(self, db: Any, match_id: str) -> Optional[MatchTimeline]:
+        """MatchTimeline for a past match (None if it has no snapshots), cached by snapshot count."""
+        row_count = db.count_match_snapshots(match_id)
+        if not row_count:
+            return None
+        key = (match_id, row_count)
+        with self._cache_lock:
+            timeline = self._history.get(key)
+            if timeline is not None:
+                self._history.move_to_end(key)
+                return timeline
+        timeline = MatchTimeline.from_rows(db.get_match_timeline_rows(match_id))
+        with self._cache_lock:
+            self._history[key] = timeline
+            while len(self._history) > self.HISTORY_CACHE_SIZE:
+                self._history.popitem(last=False)
+        return timeline
+
+    def _indices(self, match_id: str, account_id: int, player: PlayerTimeline, field: str,
+                 points: int, method: str, x_axis: str) -> List[int]:
+        key = (match_id, account_id, field, points, method, x_axis, player.length)
+        with self._cache_lock:
+            indices = self._cache.get(key)
+            if indices is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return indices
+            self.cache_misses += 1
+        kept, xs, ys = player.series(field, x_axis)
+        indices = [kept[index] for index in _DOWNSAMPLERS[method](xs, ys, points)]
+        with self._cache_lock:
+            self._cache[key] = indices
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return indices
+
+    def downsample(self, match_id: str, timeline: MatchTimeline, fields: Sequence[str], points: int,
+                   method: str = 'lttb', x_axis: str = 'sequence',
+                   account_ids: Optional[Iterable[int]] = None) -> Dict[str, Dict[str, List]]:
+        """Same format as MatchTimeline.to_dict, with each metric reduced to about `points` points."""
+        if method not in _DOWNSAMPLERS:
+            raise ValueError(f"Unknown downsample method: {method} (available: {', '.join(DOWNSAMPLE_METHODS)})")
+        if x_axis not in DOWNSAMPLE_AXES:
+            raise ValueError(f"Unknown downsample axis: {x_axis} (available: {', '.join(DOWNSAMPLE_AXES)})")
+        points = max(MIN_DOWNSAMPLE_POINTS, int(points))
+        result = {}
+        for account_id in timeline.account_ids(account_ids):
+            player = timeline.players[account_id]
+            if player.length <= points:
+                result[str(account_id)] = player.to_dict(fields)
+                continue
+            selected = set()
+            for field in fields:
+                selected.update(self._indices(match_id, account_id, player, field, points, method, x_axis))
+            result[str(account_id)] = player.to_dict(fields, sorted(selected))
+        return result
+
+
+timeline_downsampler = TimelineDownsampler()
@@ -2,7 +2,7 @@ import { useMemo, useState, useCallback } from 'react';
 import { PoolBarChart } from '@/components/charts/PoolBarChart';
 import { SynergyIcon } from '@/components/ui/SynergyDisplay';
 import { HeroPortrait } from '@/components/ui';
-import { calculatePoolCounts } from '@/utils/poolCalculator';
+import { usePoolCounts } from '@/hooks/usePoolCounts';
 import { calculateSynergyPoolStats } from '@/utils/synergyPoolCalculator';
 import { calculateSynergyHeroPoolStats } from '@/utils/synergyHeroPoolCalculator';
 import { calculateTierPoolStats } from '@/utils/tierPoolCalculator';
@@ -48,12 +48,13 @@ export const HeroPoolStatsPanel = ({
   const viewMode = viewModeProp ?? internalViewMode;
   const setViewMode = onViewModeChange ?? setInternalViewMode;
 
+  const livePoolCounts = usePoolCounts(players, heroesData);
   const poolCounts = useMemo(() => {
     if (!players.length || !heroesData) {
       return new Map();
     }
-    return calculatePoolCounts(players, heroesData);
-  }, [players, heroesData]);
+    return livePoolCounts;
+  }, [players.length, heroesData, livePoolCounts]);
 
   const synergyPoolStats = useMemo(() => {
     if (!heroesData || poolCounts.size === 0) {
@@ -15,7 +15,7 @@ import {
   updateScoreboardFitToViewport,
 } from '@/store/settingsSlice';
 import { getSynergiesColumnWidth, isSynergyActive } from '@/components/ui/SynergyDisplay/utils';
-import { calculatePoolCounts } from '@/utils/poolCalculator';
+import { usePoolCounts } from '@/hooks/usePoolCounts';
 import type { PlayerState } from '@/types';
 import type { SortField } from '@/features/scoreboard/components/ScoreboardHeader/ScoreboardHeader';
 import './ScoreboardTable.css';
@@ -66,10 +66,7 @@ export const ScoreboardTable = ({
   const contentRef = useRef<HTMLDivElement>(null);
   const { heroesData } = useHeroesDataContext();
 
-  const poolCounts = useMemo(
-    () => calculatePoolCounts(players, heroesData),
-    [players, heroesData]
-  );
+  const poolCounts = usePoolCounts(players, heroesData);
 
   const handleSort = (field: SortField) => {
     if (sortField === field) {
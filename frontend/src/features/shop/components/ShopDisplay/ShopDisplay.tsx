@@ -8,7 +8,7 @@ import synergyStyles from '@/components/ui/SynergyDisplay/data/synergy-styles.js
 import synergyIconMap from '@/components/ui/SynergyDisplay/data/synergy-icon-map.json';
 import type { PrivatePlayerState, PlayerState, Unit } from '@/types';
 import type { HeroesData } from '@/utils/heroHelpers';
-import { calculatePoolCounts } from '@/utils/poolCalculator';
+import { usePoolCounts } from '@/hooks/usePoolCounts';
 import { HeroPoolStatsPanel } from '@/features/hero-pool-stats/components/HeroPoolStatsPanel';
 import { OwnedHeroesChart, type OwnedHeroBarData } from '../OwnedHeroesChart/OwnedHeroesChart';
 import { ShopPanelScaler } from '../ShopPanelScaler/ShopPanelScaler';
@@ -192,9 +192,7 @@ export const ShopDisplay = ({
   );
 
   // Calculate pool counts for all heroes
-  const poolCounts = useMemo(() => {
-    return calculatePoolCounts(players, heroesData);
-  }, [players, heroesData]);
+  const poolCounts = usePoolCounts(players, heroesData);
 
   // Get shop units, ensuring we always have 5 slots
   const shopUnits = useMemo(() => {
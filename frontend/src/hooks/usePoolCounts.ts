@@ -0,0 +1,27 @@
+import { useMemo } from 'react';
+import type { PlayerState } from '@/types';
+import type { HeroesData } from '@/utils/heroHelpers';
+import { calculatePoolCounts, poolCountsFromServer } from '@/utils/poolCalculator';
+import type { PoolCount } from '@/utils/poolCalculator';
+import { useAppSelector } from './redux';
+
+/**
+ * Remaining pool counts for the live match.
+ * Uses the counts the backend tracks incrementally; falls back to walking every player's
+ * units when the stream has not sent them (older backend or heroes data unavailable).
+ */
+export const usePoolCounts = (
+  players: PlayerState[],
+  heroesData: HeroesData | null
+): Map<number, PoolCount> => {
+  const heroPool = useAppSelector((state) => state.match.heroPool);
+  const serverPoolCounts = useMemo(
+    () => (heroPool && Object.keys(heroPool).length > 0 ? poolCountsFromServer(heroPool) : null),
+    [heroPool]
+  );
+  const localPoolCounts = useMemo(
+    () => (serverPoolCounts ? null : calculatePoolCounts(players, heroesData)),
+    [serverPoolCounts, players, heroesData]
+  );
+  return serverPoolCounts ?? localPoolCounts ?? new Map<number, PoolCount>();
+};
@@ -7,7 +7,8 @@ import { useAppSelector, useAppDispatch } from '@/hooks/redux';
 import { useHeroesDataContext } from '@/contexts/HeroesDataContext';
 import { setShopHistory } from '@/store/matchSlice';
 import { apiService } from '@/services/api';
-import { calculatePoolCounts, getHeroesOwnedByPlayer } from '@/utils/poolCalculator';
+import { getHeroesOwnedByPlayer } from '@/utils/poolCalculator';
+import { usePoolCounts } from '@/hooks/usePoolCounts';
 import './ShopPage.css';
 
 export const ShopPage = () => {
@@ -50,10 +51,7 @@ export const ShopPage = () => {
   }, [players, privatePlayerAccountId]);
 
   const level = privatePlayerState?.level ?? 1;
-  const poolCounts = useMemo(
-    () => calculatePoolCounts(players || [], heroesData),
-    [players, heroesData]
-  );
+  const poolCounts = usePoolCounts(players || [], heroesData);
   const ownedUnitIds = useMemo(
     () => getHeroesOwnedByPlayer(privatePlayerState?.units),
     [privatePlayerState?.units]
@@ -1,4 +1,6 @@
 import type { 
+  ApiMatch,
+  ApiMatchesQuery,
   ApiMatchesResponse, 
   ApiAbandonMatchResponse,
   ApiMatchSummaryResponse,
@@ -8,10 +10,15 @@ import type {
   Change,
   Build,
   ShopHistoryEntry,
-  MatchupPrediction
+  MatchupPrediction,
+  HeroPoolCounts,
+  ShopOdds,
+  MatchTimeline,
+  TimelineField
 } from '@/types';
 
 const API_BASE_URL = import.meta.env.DEV ? 'http://localhost:3000' : '';
+const MATCHES_PAGE_SIZE = 200;
 
 class ApiService {
   private async request<T>(endpoint: string, options?: RequestInit): Promise<T> {
@@ -37,8 +44,27 @@ class ApiService {
     }
   }
 
-  async getMatches(): Promise<ApiMatchesResponse> {
-    return this.request<ApiMatchesResponse>('/api/matches');
+  async getMatchesPage(params: ApiMatchesQuery = {}): Promise<ApiMatchesResponse> {
+    const query = new URLSearchParams();
+    for (const [key, value] of Object.entries(params)) {
+      if (value !== undefined) query.set(key, String(value));
+    }
+    const suffix = query.toString() ? `?${query}` : '';
+    return this.request<ApiMatchesResponse>(`/api/matches${suffix}`);
+  }
+
+  // Every match (newest first), fetched page by page
+  async getMatches(filters: Omit<ApiMatchesQuery, 'limit' | 'cursor'> = {}): Promise<ApiMatchesResponse> {
+    const matches: ApiMatch[] = [];
+    let cursor: string | undefined;
+    for (;;) {
+      const page = await this.getMatchesPage({ ...filters, limit: MATCHES_PAGE_SIZE, cursor });
+      if (page.status !== 'success') return page;
+      matches.push(...page.matches);
+      if (!page.next_cursor) break;
+      cursor = page.next_cursor;
+    }
+    return { status: 'success', matches, count: matches.length, next_cursor: null };
   }
 
   async deleteMatch(matchId: string): Promise<{ status: string; message: string }> {
@@ -76,13 +102,18 @@ class ApiService {
     accountId?: number,
     limit?: number,
     roundNumber?: number,
-    roundPhase?: string
-  ): Promise<{ status: string; match_id: string; changes: Change[]; count: number }> {
+    roundPhase?: string,
+    types?: Change['type'][],
+    afterChangeId?: number
+  ): Promise<{ status: string; match_id: string; changes: Change[]; count: number; next_cursor: number | null }> {
     const params = new URLSearchParams();
     if (accountId !== undefined) params.append('account_id', accountId.toString());
     if (limit !== undefined) params.append('limit', limit.toString());
     if (roundNumber !== undefined) params.append('round_number', roundNumber.toString());
     if (roundPhase !== undefined) params.append('round_phase', roundPhase);
+    if (types !== undefined && types.length > 0) params.append('types', types.join(','));
+    // Cursor: only changes after this change_id, oldest first (poll again with next_cursor)
+    if (afterChangeId !== undefined) params.append('after_change_id', afterChangeId.toString());
     
     const queryString = params.toString();
     const endpoint = `/api/matches/${matchId}/changes${queryString ? `?${queryString}` : ''}`;
@@ -126,6 +157,54 @@ class ApiService {
     return response.matchup_prediction;
   }
 
+  async fetchMatchPool(matchId: string): Promise<HeroPoolCounts> {
+    const response = await this.request<{
+      status: string;
+      match_id: string;
+      is_active_match: boolean;
+      pool: HeroPoolCounts;
+    }>(`/api/matches/${matchId}/pool`);
+    return response.pool;
+  }
+
+  async fetchMatchOdds(matchId: string, params: { level?: number; rerolls?: number } = {}): Promise<ShopOdds> {
+    const query = new URLSearchParams();
+    if (params.level !== undefined) query.set('level', String(params.level));
+    if (params.rerolls !== undefined) query.set('rerolls', String(params.rerolls));
+    const suffix = query.toString() ? `?${query}` : '';
+    const response = await this.request<{
+      status: string;
+      match_id: string;
+      odds: ShopOdds;
+    }>(`/api/matches/${matchId}/odds${suffix}`);
+    return response.odds;
+  }
+
+  async fetchMatchTimeline(
+    matchId: string,
+    fields?: TimelineField[],
+    accountIds?: number[],
+    downsample?: { points: number; method?: 'lttb' | 'minmax'; x?: 'sequence' | 'time' }
+  ): Promise<MatchTimeline> {
+    const query = new URLSearchParams();
+    if (fields?.length) query.set('fields', fields.join(','));
+    for (const accountId of accountIds ?? []) query.append('account_id', String(accountId));
+    if (downsample) {
+      query.set('points', String(downsample.points));
+      if (downsample.method) query.set('method', downsample.method);
+      if (downsample.x) query.set('x', downsample.x);
+    }
+    const suffix = query.toString() ? `?${query}` : '';
+    const response = await this.request<{
+      status: string;
+      match_id: string;
+      is_active_match: boolean;
+      fields: TimelineField[];
+      players: MatchTimeline;
+    }>(`/api/matches/${matchId}/timeline${suffix}`);
+    return response.players;
+  }
+
   // Build endpoints
   async getBuilds(): Promise<Build[]> {
     const response = await this.request<{
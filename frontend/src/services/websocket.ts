@@ -4,12 +4,14 @@ import { setConnectionStatus } from '@/store/connectionSlice';
 import { updateMatch, abandonMatch } from '@/store/matchSlice';
 import { addChanges } from '@/store/changesSlice';
 import { setPrediction } from '@/store/matchupPredictorSlice';
-import type { MatchData, WebSocketEvents } from '@/types';
+import type { MatchData, MatchDelta, WebSocketEvents } from '@/types';
 
 class WebSocketService {
   private socket: Socket | null = null;
   private store: Store | null = null;
   private captureNextUpdate: boolean = false;
+  // Last applied frame (without one-shot combat_results) - base for match_delta frames
+  private lastFrame: MatchData | null = null;
 
   initialize(store: Store) {
     // Disconnect existing socket if already initialized to prevent duplicate listeners
@@ -60,21 +62,30 @@ class WebSocketService {
       console.log('[WebSocket] Connection response:', data);
     });
 
+    // Full keyframe
     this.socket.on('match_update', (data: MatchData) => {
       console.log('[WebSocket] Match update received:', data);
-      
-      // Debug capture functionality
-      if (this.captureNextUpdate) {
-        this.captureNextUpdate = false;
-        this.downloadDebugData(data);
+      const baseFrame = { ...data };
+      delete baseFrame.combat_results;
+      this.lastFrame = baseFrame;
+      this.dispatchFrame(data);
+    });
+
+    // Delta frame - only changed players/fields since the previous frame
+    this.socket.on('match_delta', (delta: MatchDelta) => {
+      const merged = this.applyDelta(delta);
+      if (!merged) {
+        // Missed a frame (or no keyframe yet) - ask the backend for a fresh keyframe
+        console.log('[WebSocket] Delta out of sequence, requesting keyframe:', delta.frame);
+        this.socket?.emit('request_keyframe');
+        return;
       }
-      
-      this.store?.dispatch(updateMatch(data));
-      this.store?.dispatch(setPrediction(data.matchup_prediction ?? null));
+      this.dispatchFrame(merged);
     });
 
     this.socket.on('match_abandoned', (data: WebSocketEvents['match_abandoned']) => {
       console.log('[WebSocket] Match abandoned:', data);
+      this.lastFrame = null;
       this.store?.dispatch(abandonMatch());
       this.store?.dispatch(setPrediction(null));
     });
@@ -92,6 +103,76 @@ class WebSocketService {
     });
   }
 
+  private dispatchFrame(data: MatchData) {
+    // Debug capture functionality
+    if (this.captureNextUpdate) {
+      this.captureNextUpdate = false;
+      this.downloadDebugData(data);
+    }
+
+    this.store?.dispatch(updateMatch(data));
+    this.store?.dispatch(setPrediction(data.matchup_prediction ?? null));
+  }
+
+  /**
+   * Apply a delta frame on top of the last frame.
+   * Returns null when the delta does not follow the frame we have.
+   */
+  private applyDelta(delta: MatchDelta): MatchData | null {
+    const base = this.lastFrame;
+    if (!base || base.match.match_id !== delta.match_id || base.frame !== delta.base_frame) {
+      return null;
+    }
+
+    const changedPlayers = delta.public_player_states ?? {};
+    const removed = new Set(delta.removed_account_ids ?? []);
+    const seen = new Set<string>();
+    const players = base.public_player_states
+      .filter((player) => !removed.has(player.account_id))
+      .map((player) => {
+        const key = String(player.account_id);
+        seen.add(key);
+        const changes = changedPlayers[key];
+        return changes ? { ...player, ...changes } : player;
+      });
+    for (const [key, fields] of Object.entries(changedPlayers)) {
+      if (!seen.has(key)) {
+        players.push(fields as MatchData['public_player_states'][number]);
+      }
+    }
+
+    let privatePlayer = base.private_player_state;
+    if (delta.private_player_state !== undefined) {
+      privatePlayer = delta.private_player_state === null || privatePlayer === null
+        ? (delta.private_player_state as MatchData['private_player_state'])
+        : { ...privatePlayer, ...delta.private_player_state };
+    }
+
+    const next: MatchData = {
+      ...base,
+      match: delta.match ?? base.match,
+      public_player_states: players,
+      private_player_state: privatePlayer,
+      private_player_account_id: delta.private_player_account_id !== undefined
+        ? delta.private_player_account_id
+        : base.private_player_account_id,
+      current_round: delta.current_round ?? base.current_round,
+      gsi_emulated: delta.gsi_emulated ?? base.gsi_emulated,
+      matchup_prediction: delta.matchup_prediction !== undefined
+        ? delta.matchup_prediction
+        : base.matchup_prediction,
+      hero_pool: delta.hero_pool ? { ...base.hero_pool, ...delta.hero_pool } : base.hero_pool,
+      shop_odds: delta.shop_odds !== undefined
+        ? delta.shop_odds ?? undefined
+        : base.shop_odds,
+      timestamp: delta.timestamp,
+      frame: delta.frame,
+      keyframe: false,
+    };
+    this.lastFrame = next;
+    return delta.combat_results ? { ...next, combat_results: delta.combat_results } : next;
+  }
+
   testConnection() {
     if (this.socket?.connected) {
       this.socket.emit('test_connection');
@@ -1,5 +1,5 @@
 import { createSlice, PayloadAction } from '@reduxjs/toolkit';
-import type { MatchData, PlayerState, PrivatePlayerState, RoundInfo, MatchInfo, CombatResult, ShopHistoryEntry } from '@/types';
+import type { MatchData, PlayerState, PrivatePlayerState, RoundInfo, MatchInfo, CombatResult, ShopHistoryEntry, HeroPoolCounts } from '@/types';
 
 interface MatchState {
   currentMatch: MatchInfo | null;
@@ -10,6 +10,7 @@ interface MatchState {
   lastUpdate: number | null;
   combatHistory: Record<number, CombatResult[]>;  // account_id -> CombatResult[]
   shopHistory: ShopHistoryEntry[];
+  heroPool: HeroPoolCounts | null;  // Backend-tracked remaining pool (null until the stream sends it)
   combatDisplayMode: 'revealing' | 'main';
 }
 
@@ -38,6 +39,7 @@ const initialState: MatchState = {
   lastUpdate: null,
   combatHistory: {},
   shopHistory: [],
+  heroPool: null,
   combatDisplayMode: getInitialMode(),
 };
 
@@ -58,6 +60,7 @@ const matchSlice = createSlice({
       state.privatePlayerAccountId = payload.private_player_account_id ?? null;
       state.currentRound = payload.current_round;
       state.lastUpdate = payload.timestamp;
+      state.heroPool = payload.hero_pool ?? null;
 
       // Append current shop to history if this generation not already present
       const pp = payload.private_player_state;
@@ -95,6 +98,7 @@ const matchSlice = createSlice({
       state.lastUpdate = null;
       state.combatHistory = {};
       state.shopHistory = [];
+      state.heroPool = null;
     },
     abandonMatch: (state) => {
       // Frontend is stateless - clear all match data when match is abandoned
@@ -110,6 +114,7 @@ const matchSlice = createSlice({
       state.lastUpdate = null;
       state.combatHistory = {};
       state.shopHistory = [];
+      state.heroPool = null;
     },
     setShopHistory: (state, action: PayloadAction<ShopHistoryEntry[]>) => {
       state.shopHistory = action.payload;
@@ -201,6 +201,84 @@ export interface MatchData {
   timestamp: number;
   combat_results?: Record<string, CombatResult[]>;  // account_id (string) -> CombatResult[]
   matchup_prediction?: MatchupPrediction | null;
+  frame?: number;      // Stream frame number (keyframes and deltas share one counter)
+  keyframe?: boolean;  // true for full match_update frames
+  gsi_emulated?: boolean;
+  hero_pool?: HeroPoolCounts;  // Remaining pool copies, tracked by the backend
+  shop_odds?: ShopOddsSummary;  // Private player's shop odds (changes with level / pool)
+}
+
+// unit_id (string) -> remaining/total shared-pool copies
+export type HeroPoolCounts = Record<string, { remaining: number; total: number }>;
+
+// Stream form of the backend shop odds: unit_id (string) -> [P(next shop), expected gold to 2 stars, to 3 stars]
+// (expected gold is null when the target can no longer be reached)
+export interface ShopOddsSummary {
+  level: number;
+  reroll_cost: number;
+  pool_version: number;
+  account_id: number | null;
+  heroes: Record<string, [number | null, number | null, number | null]>;
+}
+
+export interface ShopOddsStarTarget {
+  copies_needed: number;
+  expected_rerolls: number | null;
+  expected_gold: number | null;
+  p_within: number[];  // index n -> P(reached within n + 1 rerolls)
+}
+
+export interface HeroShopOdds {
+  tier: number;
+  remaining: number;
+  owned: number;  // Pool copies the player holds (rank 2 = 3, rank 3 = 9)
+  p_next_shop: number | null;
+  p_seen_within: number[];  // index n -> P(seen within n + 1 rerolls)
+  two_star: ShopOddsStarTarget;
+  three_star: ShopOddsStarTarget;
+}
+
+// /api/matches/<id>/timeline: account_id (string) -> columns (axis columns + requested stats; null = missing)
+export type TimelineField =
+  | 'health' | 'gold' | 'net_worth' | 'level' | 'xp'
+  | 'next_level_xp' | 'wins' | 'losses' | 'win_streak' | 'lose_streak';
+
+export type PlayerTimeline = {
+  sequence_number: (number | null)[];
+  round_number: (number | null)[];
+  timestamp: (number | null)[];  // epoch seconds
+} & Partial<Record<TimelineField, (number | null)[]>>;
+
+export type MatchTimeline = Record<string, PlayerTimeline>;
+
+// /api/matches/<id>/odds
+export interface ShopOdds {
+  level: number;
+  reroll_cost: number;
+  rerolls: number;
+  pool_version: number;
+  account_id: number | null;
+  heroes: Record<string, HeroShopOdds>;
+}
+
+// Delta frame: only players/fields that changed since base_frame
+export interface MatchDelta {
+  match_id: string;
+  frame: number;
+  base_frame: number;
+  keyframe: false;
+  timestamp: number;
+  public_player_states?: Record<string, Partial<PlayerState>>;  // account_id (string) -> changed fields
+  removed_account_ids?: number[];
+  private_player_state?: Partial<PrivatePlayerState> | null;
+  match?: MatchInfo;
+  private_player_account_id?: number | null;
+  current_round?: RoundInfo;
+  gsi_emulated?: boolean;
+  matchup_prediction?: MatchupPrediction | null;
+  combat_results?: Record<string, CombatResult[]>;
+  hero_pool?: HeroPoolCounts;  // Only heroes whose count changed
+  shop_odds?: ShopOddsSummary | null;  // null when the odds are no longer available
 }
 
 // API Response types
@@ -221,6 +299,16 @@ export interface ApiMatchesResponse {
   status: string;
   matches: ApiMatch[];
   count: number;
+  next_cursor?: string | null;  // Pass as ?cursor= for the next page (null on the last page)
+}
+
+export interface ApiMatchesQuery {
+  limit?: number;
+  cursor?: string;
+  from?: string;  // started_at >= (e.g. 2026-01-31)
+  to?: string;    // started_at <
+  account_id?: number;
+  status?: 'completed' | 'in_progress';
 }
 
 export interface MatchSummaryPlayer {
@@ -293,6 +381,7 @@ export interface ApiHealthResponse {
 export interface WebSocketEvents {
   connection_response: { status: string };
   match_update: MatchData;
+  match_delta: MatchDelta;
   match_abandoned: {
     match_id: string;
     reason: string;
@@ -338,6 +427,8 @@ export interface Change {
         'synergy_added' | 'synergy_removed' | 'synergy_level_changed';
   // Player identification
   account_id: number;
+  // Per-match change number (increasing in detection order)
+  change_id?: number;
   // Sequence numbers
   previous_sequence_number?: number;
   current_sequence_number?: number;
@@ -1,4 +1,4 @@
-import type { PlayerState, ShopUnit, Unit } from '@/types';
+import type { HeroPoolCounts, PlayerState, ShopUnit, Unit } from '@/types';
 import type { HeroesData } from './heroHelpers';
 import { isDraftPoolHero } from './heroHelpers';
 
@@ -107,6 +107,17 @@ export function calculatePoolCounts(
   return poolCounts;
 }
 
+/**
+ * Pool counts as tracked by the backend (match stream `hero_pool`), keyed like calculatePoolCounts.
+ */
+export function poolCountsFromServer(heroPool: HeroPoolCounts): Map<number, PoolCount> {
+  const poolCounts = new Map<number, PoolCount>();
+  for (const [unitId, count] of Object.entries(heroPool)) {
+    poolCounts.set(Number(unitId), { remaining: count.remaining, total: count.total });
+  }
+  return poolCounts;
+}
+
 /**
  * Clone pool counts and subtract one remaining for each unit in the current shop.
  * Used for "next reroll" odds (rerolled heroes do not appear in the next shop).
@@ -0,0 +1,82 @@
+"""
+One-time backfill: persist change events for matches recorded before the match_changes table.
+
+Usage (from repo root; stop the backend first or let it idle - writes go through SQLite's busy timeout):
+  python scripts/backfill_match_changes.py                 # every match without persisted changes
+  python scripts/backfill_match_changes.py --match-id ID   # a single match
+  python scripts/backfill_match_changes.py --force         # recompute matches that already have rows
+
+Changes are detected by replaying each match's public snapshots through ChangeDetector,
+the same comparison /api/matches/<id>/changes used to run on every request.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.change_detector import REPLAY_SNAPSHOT_FIELDS, ChangeDetector
+from backend.database import UnderlordsDatabaseManager
+
+
+def backfill_match(db: UnderlordsDatabaseManager, detector: ChangeDetector, match_id: str, force: bool) -> int:
+    if db.has_match_changes(match_id):
+        if not force:
+            return 0
+        db.conn.execute("DELETE FROM match_changes WHERE match_id = ?", (match_id,))
+
+    snapshots = db.get_match_snapshots(match_id, fields=REPLAY_SNAPSHOT_FIELDS)
+    inserted = 0
+    for snapshot, changes in detector.replay_snapshots(match_id, snapshots):
+        inserted += db.insert_changes(
+            match_id,
+            snapshot['account_id'],
+            snapshot.get('sequence_number'),
+            snapshot.get('round_number'),
+            snapshot.get('round_phase'),
+            changes,
+        )
+    return inserted
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Persist change events for existing matches.")
+    parser.add_argument("--db", help="database path (default: underlords_gsi_v5.db in repo root)")
+    parser.add_argument("--match-id", help="only backfill this match")
+    parser.add_argument("--force", action="store_true", help="recompute matches that already have persisted changes")
+    args = parser.parse_args(argv)
+
+    db = UnderlordsDatabaseManager(db_path=args.db, read_pool_size=1)
+    detector = ChangeDetector()
+    try:
+        if args.match_id:
+            match_ids = [args.match_id]
+        else:
+            match_ids = [row[0] for row in db.conn.execute("SELECT match_id FROM matches ORDER BY started_at")]
+
+        total = 0
+        for match_id in match_ids:
+            with db.write_lock:
+                db.begin()
+                try:
+                    inserted = backfill_match(db, detector, match_id, args.force)
+                    db.conn.commit()
+                except Exception:
+                    db.conn.rollback()
+                    raise
+            total += inserted
+            if inserted:
+                print(f"[BACKFILL] {match_id}: {inserted} changes")
+        print(f"[BACKFILL] Done - {total} changes across {len(match_ids)} matches")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
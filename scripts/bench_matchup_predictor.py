@@ -0,0 +1,174 @@
+"""
+Micro-benchmark: JSON-string keyed vs compiled tuple-keyed matchup predictor lookups.
+
+Usage (from repo root):
+  python scripts/bench_matchup_predictor.py [--repeat N]
+
+For every key in backend/matchup_predictor/models.json this
+  1. checks the compiled tuple key serializes back to the original JSON key,
+  2. times a raw table lookup through serialize_key() vs the compiled tuple key,
+  3. replays a predict_matchups() call that hits the key on both paths and checks the
+     results (known, tier, reason, prediction) are identical.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.matchup_predictor import DeterministicMatchupPredictor
+
+MODEL_PATH = ROOT / "backend" / "matchup_predictor" / "models.json"
+
+
+class JsonKeyedTable:
+    """Looks a tuple key up in a JSON-string keyed table the way the predictor used to."""
+
+    def __init__(self, table: Dict[str, Any]):
+        self.table = table
+
+    def get(self, key: Tuple[Any, ...], default: Any = None) -> Any:
+        return self.table.get(DeterministicMatchupPredictor.serialize_key(*key), default)
+
+
+class JsonKeyedPredictor(DeterministicMatchupPredictor):
+    """The pre-compilation lookup path: every key goes through json.dumps."""
+
+    def __init__(self, models: Dict[str, Dict[str, Any]]):
+        super().__init__(models)
+        self.compiled = {name: JsonKeyedTable(table) for name, table in self.models.items()}
+
+
+def _freeze(value: Any) -> Any:
+    return DeterministicMatchupPredictor.tuple_key(*value) if isinstance(value, list) else value
+
+
+def _scenario(table: str, parts: List[Any]) -> Dict[str, Any] | None:
+    """predict_matchups() kwargs whose lookup lands on this table key."""
+    p = [_freeze(part) for part in parts]
+    if table == "entry7":
+        return dict(alive_player_count=7, previous_alive_player_count=8, alive_player_slots=p[0],
+                    previous_full_oriented_structure=p[1], current_round_number=1, schedule_offset=0)
+    if table == "trans7":
+        return dict(alive_player_count=7, previous_alive_player_count=7, alive_player_slots=tuple(range(1, 8)),
+                    previous_full_oriented_structure=p[0], current_round_number=p[1], schedule_offset=0)
+    if table == "entry6":
+        return dict(alive_player_count=6, previous_alive_player_count=7, alive_player_slots=p[0],
+                    previous_full_oriented_structure=p[1], current_round_number=1, schedule_offset=0)
+    if table == "trans6":
+        return dict(alive_player_count=6, previous_alive_player_count=6, alive_player_slots=tuple(range(1, 7)),
+                    previous_full_oriented_structure=p[0], streak_step=p[1], current_round_number=1, schedule_offset=0)
+    if table in ("entry_other", "entry_b1"):
+        return dict(previous_alive_player_count=p[0], alive_player_count=p[1], alive_player_slots=p[2],
+                    previous_full_oriented_structure=p[3], current_round_number=p[4], schedule_offset=0,
+                    eliminated_player_slots=p[5] if len(p) > 5 else ())
+    if table == "entry_b2":
+        return dict(previous_alive_player_count=p[0], alive_player_count=p[1], alive_player_slots=p[2],
+                    previous_full_oriented_structure=p[3], current_round_number=1, schedule_offset=0)
+    if table == "entry_b3":
+        return dict(previous_alive_player_count=p[0], alive_player_count=p[1],
+                    alive_player_slots=tuple(range(1, p[1] + 1)), previous_full_oriented_structure=p[2],
+                    current_round_number=1, schedule_offset=0)
+    if table == "trans_other":
+        return dict(alive_player_count=p[0], previous_alive_player_count=p[0], alive_player_slots=p[1],
+                    previous_full_oriented_structure=p[2], streak_step=p[3], current_round_number=p[4],
+                    schedule_offset=0)
+    if table == "trans_b1":
+        return dict(alive_player_count=p[0], previous_alive_player_count=p[0],
+                    alive_player_slots=tuple(range(1, p[0] + 1)), previous_full_oriented_structure=p[1],
+                    streak_step=p[2], current_round_number=p[3], schedule_offset=0)
+    if table == "trans_b2":
+        return dict(alive_player_count=p[0], previous_alive_player_count=p[0], alive_player_slots=p[1],
+                    previous_full_oriented_structure=p[2], streak_step=p[3], current_round_number=1,
+                    schedule_offset=0)
+    if table == "trans_b3":
+        return dict(alive_player_count=p[0], previous_alive_player_count=p[0],
+                    alive_player_slots=tuple(range(1, p[0] + 1)), previous_full_oriented_structure=p[1],
+                    streak_step=p[2], current_round_number=1, schedule_offset=0)
+    if table == "trans_b4":
+        return dict(alive_player_count=p[0], previous_alive_player_count=p[0],
+                    alive_player_slots=tuple(range(1, p[0] + 1)), previous_full_oriented_structure=p[1],
+                    current_round_number=1, schedule_offset=0)
+    return None
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions (best of N)")
+    args = parser.parse_args()
+
+    models = json.loads(MODEL_PATH.read_text(encoding="utf-8"))
+    compiled = DeterministicMatchupPredictor(models)
+    legacy = JsonKeyedPredictor(models)
+
+    lookups: List[Tuple[str, List[Any]]] = []
+    frozen_lookups: List[Tuple[str, Tuple[Any, ...]]] = []  # keys as callers build them (tuples)
+    mismatches = 0
+    for table, entries in models.items():
+        for key in entries:
+            parts = json.loads(key)
+            lookups.append((table, parts))
+            tuple_key = compiled.tuple_key(*parts)
+            frozen_lookups.append((table, tuple_key))
+            if compiled.serialize_key(*tuple_key) != key:
+                mismatches += 1
+                print(f"[BENCH] key does not round-trip: {table} {key}")
+            if compiled.compiled[table].get(tuple_key) != legacy.models[table].get(key):
+                mismatches += 1
+                print(f"[BENCH] lookup mismatch: {table} {key}")
+
+    def old_lookups() -> None:
+        for table, key in frozen_lookups:
+            legacy.models[table].get(legacy.serialize_key(*key))
+
+    def new_lookups() -> None:
+        for table, key in frozen_lookups:
+            compiled.compiled[table].get(key)
+
+    scenarios = [s for s in (_scenario(table, parts) for table, parts in lookups) if s is not None]
+    for kwargs in scenarios:
+        a = legacy.predict_matchups(**kwargs)
+        b = compiled.predict_matchups(**kwargs)
+        if (a.known, a.tier, a.reason, a.prediction) != (b.known, b.tier, b.reason, b.prediction):
+            mismatches += 1
+            print(f"[BENCH] prediction mismatch for {kwargs}: {a} != {b}")
+
+    def old_predictions() -> None:
+        for kwargs in scenarios:
+            legacy.predict_matchups(**kwargs)
+
+    def new_predictions() -> None:
+        for kwargs in scenarios:
+            compiled.predict_matchups(**kwargs)
+
+    old_lookup_s = _time(old_lookups, args.repeat)
+    new_lookup_s = _time(new_lookups, args.repeat)
+    old_predict_s = _time(old_predictions, args.repeat)
+    new_predict_s = _time(new_predictions, args.repeat)
+
+    print(f"keys: {len(lookups)}  scenarios: {len(scenarios)}  mismatches: {mismatches}")
+    print(f"table lookup   json key: {old_lookup_s / len(lookups) * 1e6:7.2f} us   "
+          f"tuple key: {new_lookup_s / len(lookups) * 1e6:7.2f} us   ({old_lookup_s / new_lookup_s:.1f}x)")
+    print(f"predict        json key: {old_predict_s / len(scenarios) * 1e6:7.2f} us   "
+          f"tuple key: {new_predict_s / len(scenarios) * 1e6:7.2f} us   ({old_predict_s / new_predict_s:.1f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
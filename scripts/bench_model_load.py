@@ -0,0 +1,98 @@
+"""
+Startup benchmark: matchup predictor load time from models.json vs models.bin.
+
+Usage (from repo root):
+  python scripts/bench_model_load.py [--repeat N]
+
+Each load runs in a fresh interpreter (no warm caches inside the process). Reports
+  - import + load of DeterministicMatchupPredictor from each file,
+  - load + first prediction (what the first emit after startup pays),
+and checks every key in models.json resolves to the same value through models.bin.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+MODEL_DIR = ROOT / "backend" / "matchup_predictor"
+
+_CHILD = """
+import sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+from backend.matchup_predictor import DeterministicMatchupPredictor
+predictor = DeterministicMatchupPredictor.from_model_file({path!r})
+loaded = time.perf_counter()
+predictor.predict_matchups(
+    alive_player_count=5, current_round_number=12, schedule_offset=0,
+    alive_player_slots=(1, 2, 3, 4, 5), previous_alive_player_count=5,
+    previous_full_oriented_structure=(((1, 2), (3, 4)), ((5, 1),)), streak_step=1,
+)
+predicted = time.perf_counter()
+print(loaded - started, predicted - started)
+"""
+
+
+def _measure(path: Path, repeat: int) -> tuple[float, float]:
+    best_load = best_first = float("inf")
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(root=str(ROOT), path=str(path))],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        best_load = min(best_load, float(output[0]))
+        best_first = min(best_first, float(output[1]))
+    return best_load, best_first
+
+
+def _verify() -> int:
+    from backend.matchup_predictor import DeterministicMatchupPredictor
+
+    models = json.loads((MODEL_DIR / "models.json").read_text(encoding="utf-8"))
+    from_json = DeterministicMatchupPredictor(models)
+    from_bin = DeterministicMatchupPredictor.from_binary_file(MODEL_DIR / "models.bin")
+    mismatches = 0
+    for table, entries in models.items():
+        if len(from_bin.compiled.get(table, ())) != len(entries):
+            mismatches += 1
+            print(f"[BENCH] entry count differs for {table}")
+        for key in entries:
+            tuple_key = DeterministicMatchupPredictor.tuple_key(*json.loads(key))
+            if from_json.compiled[table].get(tuple_key) != from_bin.compiled[table].get(tuple_key):
+                mismatches += 1
+                print(f"[BENCH] value mismatch: {table} {key}")
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh-process runs per file (best of N)")
+    args = parser.parse_args()
+
+    json_path = MODEL_DIR / "models.json"
+    bin_path = MODEL_DIR / "models.bin"
+    if not bin_path.exists():
+        print(f"{bin_path} not found - run backend/matchup_predictor/binary_format.py first")
+        return 1
+
+    mismatches = _verify()
+    json_load, json_first = _measure(json_path, args.repeat)
+    bin_load, bin_first = _measure(bin_path, args.repeat)
+
+    print(f"models.json  {json_path.stat().st_size:>8} bytes   load: {json_load * 1000:7.2f} ms   "
+          f"load + first prediction: {json_first * 1000:7.2f} ms")
+    print(f"models.bin   {bin_path.stat().st_size:>8} bytes   load: {bin_load * 1000:7.2f} ms   "
+          f"load + first prediction: {bin_first * 1000:7.2f} ms")
+    print(f"speedup (load): {json_load / bin_load:.1f}x   mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
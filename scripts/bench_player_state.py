@@ -0,0 +1,159 @@
+"""
+Benchmark: processed player states as plain dicts (previous approach) vs slotted PlayerState records.
+
+Usage (from repo root):
+  python scripts/bench_player_state.py [--packets N] [--units N] [--retained N] [--repeat N]
+
+The public_player_state from documentation/GSI_data_example.json is padded to --units units and
+re-parsed from JSON for every packet (fresh objects, like Flask hands them to the GSI handler).
+Reports
+  - build time and bytes allocated per packet (tracemalloc),
+  - bytes retained by --retained processed states once the raw packets are gone - the long-session
+    footprint of latest states, change-detector previous states and a DB write queue backlog,
+  - cost of the edge conversion the socket stream pays per state per frame: to_dict() for a new
+    state, the cached as_dict() for a player resent unchanged,
+and checks that to_dict() reproduces the dict built the previous way.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.player_state import (
+    ItemSlotRecord, PublicPlayerState, SynergyRecord, UnitRecord, as_dict, records_from_gsi,
+)
+
+EXAMPLE_PATH = ROOT / "documentation" / "GSI_data_example.json"
+TIMESTAMP = "2026-01-01T00:00:00"
+# Fields process_and_store_gsi_public_player_state fills from somewhere other than the GSI state
+_DERIVED = {'account_id', 'timestamp', 'round_number', 'round_phase', 'match_count'}
+
+
+def _sample_packet(unit_count: int) -> str:
+    payload = json.loads(EXAMPLE_PATH.read_text(encoding="utf-8"))
+    state = payload['block'][0]['data'][0]['public_player_state']
+    template = state['units'][0]
+    units = []
+    for index in range(unit_count):
+        unit = copy.deepcopy(template)
+        unit['entindex'] = 100 + index
+        unit['position'] = {'x': index % 8, 'y': -1 if index >= 8 else index // 8}
+        units.append(unit)
+    state['units'] = units
+    return json.dumps(state)
+
+
+def build_dict(raw: Dict, account_id: int) -> Dict:
+    """The previous processed state: a fresh dict, nested lists shared with the raw packet."""
+    state = {name: raw.get(name) for name in PublicPlayerState._FIELDS}
+    state.update(account_id=account_id, timestamp=TIMESTAMP, round_number=1, round_phase='prep', match_count=0)
+    return state
+
+
+def build_record(raw: Dict, account_id: int) -> PublicPlayerState:
+    """The slotted processed state, as game_state builds it."""
+    get = raw.get
+    state = PublicPlayerState(*[None if name in _DERIVED else get(name) for name in PublicPlayerState._FIELDS])
+    state.units = records_from_gsi(UnitRecord, get('units'))
+    state.item_slots = records_from_gsi(ItemSlotRecord, get('item_slots'))
+    state.synergies = records_from_gsi(SynergyRecord, get('synergies'))
+    state.account_id = account_id
+    state.timestamp = TIMESTAMP
+    state.round_number = 1
+    state.round_phase = 'prep'
+    state.match_count = 0
+    return state
+
+
+def _time_per_packet(build: Callable[[Dict, int], Any], packet: str, packets: int, repeat: int) -> float:
+    raws = [json.loads(packet) for _ in range(packets)]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for index, raw in enumerate(raws):
+            build(raw, index)
+        best = min(best, time.perf_counter() - start)
+    return best / packets
+
+
+def _allocated_per_packet(build: Callable[[Dict, int], Any], packet: str, packets: int) -> float:
+    raws = [json.loads(packet) for _ in range(packets)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = [build(raw, index) for index, raw in enumerate(raws)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del results
+    return allocated / packets
+
+
+def _retained_bytes(build: Callable[[Dict, int], Any], packet: str, retained: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Raw packets are dropped right after processing - only the processed states survive
+    states: List[Any] = [build(json.loads(packet), index) for index in range(retained)]
+    gc.collect()
+    kept = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del states
+    return kept
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--packets", type=int, default=5000, help="packets per timing run")
+    parser.add_argument("--units", type=int, default=10, help="units per player state")
+    parser.add_argument("--retained", type=int, default=2000, help="processed states kept alive")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions (best of N)")
+    args = parser.parse_args()
+
+    packet = _sample_packet(args.units)
+    raw = json.loads(packet)
+    if build_record(raw, 1).to_dict() != build_dict(raw, 1):
+        print("[BENCH] to_dict() does not match the dict-built state")
+        return 1
+
+    results = {}
+    for name, build in (("dict", build_dict), ("slotted", build_record)):
+        results[name] = (
+            _time_per_packet(build, packet, args.packets, args.repeat),
+            _allocated_per_packet(build, packet, args.packets),
+            _retained_bytes(build, packet, args.retained),
+        )
+
+    record = build_record(raw, 1)
+    edge_s = min(
+        _time_per_packet(lambda _raw, _index: record.to_dict(), packet, args.packets, 1)
+        for _ in range(args.repeat)
+    )
+    cached_s = min(
+        _time_per_packet(lambda _raw, _index: as_dict(record), packet, args.packets, 1)
+        for _ in range(args.repeat)
+    )
+
+    print(f"units per state: {args.units}   packet: {len(packet)} bytes of JSON")
+    for name, (build_s, allocated, kept) in results.items():
+        print(f"{name:8} build: {build_s * 1e6:7.2f} us   allocated: {allocated:8.0f} B/packet   "
+              f"retained: {kept / args.retained:8.0f} B/state ({kept / 1024 / 1024:6.1f} MiB for {args.retained})")
+    print(f"slotted to_dict (socket/API edge): {edge_s * 1e6:7.2f} us/state   "
+          f"cached as_dict (unchanged state): {cached_s * 1e6:7.2f} us/state")
+    dict_kept, slotted_kept = results["dict"][2], results["slotted"][2]
+    print(f"retained memory: {dict_kept / slotted_kept:.2f}x smaller with slotted records")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
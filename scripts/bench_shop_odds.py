@@ -0,0 +1,104 @@
+"""
+Benchmark + validation: shop odds engine (closed form) against a batched Monte Carlo.
+
+Usage (from repo root):
+  python scripts/bench_shop_odds.py [--level N] [--rerolls N] [--trials N] [--repeat N] [--seed N]
+
+Builds a mid-game pool (every hero partly drafted by eight players), then reports
+  - uncached compute time for the whole hero list, and the cached lookup time,
+  - max |closed form - simulation| for P(2 / 3 stars within n rerolls),
+  - max relative error of the expected rerolls to 2 stars (simulated over a long horizon).
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.hero_pool import HeroPoolTracker
+from backend.shop_odds import (
+    STAR_COPIES, ShopOddsEngine, completion_within, copies_per_shop, dependency_error,
+    expected_shops, monte_carlo, slot_probabilities,
+)
+
+
+def _sample_pool() -> HeroPoolTracker:
+    pool = HeroPoolTracker()
+    unit_ids = sorted(pool.tiers)
+    for account_id in range(8):
+        units = [{'unit_id': unit_ids[(account_id * 7 + index) % len(unit_ids)], 'rank': 1 + index % 2}
+                 for index in range(8)]
+        pool.update_player(account_id, units)
+    return pool
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--level", type=int, default=7, help="player level")
+    parser.add_argument("--rerolls", type=int, default=10, help="curve length (rerolls)")
+    parser.add_argument("--trials", type=int, default=20000, help="Monte Carlo trials per hero")
+    parser.add_argument("--repeat", type=int, default=20, help="timing repetitions (best of N)")
+    parser.add_argument("--seed", type=int, default=1, help="Monte Carlo seed")
+    args = parser.parse_args()
+
+    dep_error = dependency_error()
+    if dep_error:
+        print(f"[BENCH] {dep_error}")
+        return 1
+
+    import numpy as np
+
+    pool = _sample_pool()
+    if not pool.tiers:
+        print("[BENCH] underlords_heroes.json not found - set HEROES_DATA_PATH")
+        return 1
+
+    owned = pool.player_units[0]
+    compute_s = min(
+        _timed(lambda: ShopOddsEngine.compute(pool, args.level, owned, 2, args.rerolls)) for _ in range(args.repeat)
+    )
+    engine = ShopOddsEngine()
+    engine.get_odds(pool, args.level, 0, rerolls=args.rerolls)
+    cached_s = min(_timed(lambda: engine.get_odds(pool, args.level, 0, rerolls=args.rerolls)) for _ in range(args.repeat))
+
+    unit_ids = list(pool.remaining)
+    tiers = np.array([pool.tiers[unit_id] for unit_id in unit_ids])
+    remaining = np.array([max(0, pool.remaining[unit_id]) for unit_id in unit_ids], dtype=float)
+    held = np.array([owned.get(unit_id, 0) for unit_id in unit_ids])
+    p = slot_probabilities(args.level, tiers, remaining)
+    pmf = copies_per_shop(p)
+    # Only heroes that can show up at this level and have the copies left
+    for name, copies in STAR_COPIES.items():
+        needed = np.maximum(copies - held, 0)
+        live = (p > 0) & (remaining >= needed)
+        closed = completion_within(pmf[live], needed[live], args.rerolls)
+        simulated, _ = monte_carlo(p[live], needed[live], args.rerolls, args.trials, args.seed)
+        print(f"{name:10} P(within n rerolls)  max |closed - simulated|: {np.abs(closed - simulated).max():.4f}"
+              f"   ({live.sum()} heroes x {args.rerolls} rerolls, {args.trials} trials)")
+
+    needed = np.maximum(STAR_COPIES['two_star'] - held, 0)
+    live = (p > 0.01) & (needed > 0)
+    closed = expected_shops(pmf[live], needed[live])
+    horizon = int(closed.max() * 8) + 1
+    _, simulated = monte_carlo(p[live], needed[live], horizon, max(1, args.trials // 10), args.seed)
+    print(f"two_star   expected rerolls max relative error: {(np.abs(closed - simulated) / closed).max():.4f}"
+          f"   (horizon {horizon} rerolls)")
+
+    print(f"heroes: {len(unit_ids)}   level: {args.level}   rerolls: {args.rerolls}")
+    print(f"compute (uncached): {compute_s * 1000:7.3f} ms   cached lookup: {cached_s * 1e6:7.2f} us")
+    return 0
+
+
+def _timed(run) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+"""
+Benchmark: snapshot JSON codec (zlib, with and without a trained dictionary) on the GSI fixtures.
+
+Usage (from repo root):
+  python scripts/bench_snapshot_codec.py [--samples N] [--levels 1,6,9] [--seed N]
+
+The documentation/gsi_documentation_*.json fixtures describe every GSI field (types, presence,
+array lengths, example values) for recorded games. Values of the snapshot JSON columns (units,
+item_slots, synergies, board_buddy, talents, shop_units, picker offering, rewards) are drawn
+from them, deduplicated like snapshot_blobs, and split in half: the dictionary is trained on
+one half and measured on the other. Reports bytes stored vs plain JSON (values that would not
+shrink are stored as text, as the database does) and encode/decode cost per value.
+
+First checks that a database too small to train a dictionary on keeps working with the zlib
+codec: no empty dictionary is stored, and one left by an earlier version is skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.database import UnderlordsDatabaseManager
+from backend.snapshot_codec import FrameDecoder, JsonCodec, train_dictionary
+
+# (player state, GSI field) of every JSON column in the snapshot tables
+JSON_FIELDS = (
+    ('public_player_state', 'units'),
+    ('public_player_state', 'item_slots'),
+    ('public_player_state', 'synergies'),
+    ('public_player_state', 'board_buddy'),
+    ('public_player_state', 'underlord_selected_talents'),
+    ('private_player_state', 'shop_units'),
+    ('private_player_state', 'underlord_picker_offering'),
+    ('private_player_state', 'oldest_unclaimed_reward'),
+)
+_LEAF_DEFAULTS = {'integer': 0, 'float': 0.0, 'boolean': False, 'string': ''}
+
+
+def _synthesize(node: Dict, rng: random.Random):
+    """A value shaped like a fixture field node (presence, array lengths and examples)."""
+    children = node.get('children') or {}
+    kind = node.get('type')
+    if kind == 'object':
+        return {
+            name: _synthesize(child, rng)
+            for name, child in children.items()
+            if rng.random() * 100 < child.get('presence_percentage', 100)
+        }
+    if kind == 'array':
+        lengths = node.get('array_lengths') or [0]
+        element = {'type': 'object', 'children': children} if children else {'type': 'integer', 'examples': list(range(1, 40))}
+        return [_synthesize(element, rng) for _ in range(rng.choice(lengths))]
+    examples = node.get('examples')
+    return rng.choice(examples) if examples else _LEAF_DEFAULTS.get(kind)
+
+
+def load_fixture_values(samples_per_field: int, seed: int) -> Dict[str, List[str]]:
+    """field -> distinct JSON texts drawn from every fixture that describes the field."""
+    rng = random.Random(seed)
+    values: Dict[str, Dict[str, None]] = {field: {} for _, field in JSON_FIELDS}
+    for path in sorted((ROOT / 'documentation').glob('gsi_documentation_*.json')):
+        structure = json.loads(path.read_text(encoding='utf-8'))['structure']
+        states = structure['block']['children']['data']['children']
+        for state, field in JSON_FIELDS:
+            node = (states.get(state, {}).get('children') or {}).get(field)
+            if node is None:
+                continue
+            for _ in range(samples_per_field):
+                values[field][json.dumps(_synthesize(node, rng))] = None
+    return {field: list(texts) for field, texts in values.items() if texts}
+
+
+def check_small_database() -> bool:
+    """Train on 5 distinct blobs, then reopen with the zlib codec (an empty dictionary row added)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'small.db')
+        db = UnderlordsDatabaseManager(db_path=path, read_pool_size=1)
+        trained = None
+        try:
+            with db.write_lock:
+                for index in range(5):
+                    text = json.dumps({f'field_{index}': index})
+                    db.conn.execute(
+                        "INSERT INTO snapshot_blobs (hash, data, size) VALUES (?, ?, ?)",
+                        (index.to_bytes(16, 'big'), text, len(text))
+                    )
+                db.conn.commit()
+                db.set_json_codec('zlib')
+                trained = db.train_json_codec_dictionary()
+                stored = db.conn.execute("SELECT COUNT(*) FROM snapshot_codec_dictionaries").fetchone()[0]
+                # What earlier versions stored in this situation
+                db.conn.execute("INSERT INTO snapshot_codec_dictionaries (data, sample_count) VALUES (?, 5)", (b'',))
+                db.conn.commit()
+        except ValueError as e:
+            print(f"[BENCH] small database: training with the zlib codec fails: {e}")
+            return False
+        finally:
+            db.close()
+        if trained is not None or stored:
+            print(f"[BENCH] small database: dictionary {trained} stored ({stored} rows), expected none")
+            return False
+
+        db = UnderlordsDatabaseManager(db_path=path, read_pool_size=1)
+        try:
+            db._init_json_codec()
+            db.set_json_codec('zlib')
+            stats = db.blob_cache_stats()
+        except ValueError as e:
+            print(f"[BENCH] small database: zlib codec fails after an empty dictionary: {e}")
+            return False
+        finally:
+            db.close()
+        if stats['codec'] != 'zlib' or stats['codec_dictionary_id']:
+            print(f"[BENCH] small database: expected zlib without a dictionary, got {stats['codec']} "
+                  f"(dictionary {stats['codec_dictionary_id']})")
+            return False
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=2000, help="values drawn per field per fixture")
+    parser.add_argument("--levels", default="1,6,9", help="zlib levels to measure")
+    parser.add_argument("--seed", type=int, default=1, help="sampling seed")
+    args = parser.parse_args()
+
+    if not check_small_database():
+        return 1
+    by_field = load_fixture_values(args.samples, args.seed)
+    if not by_field:
+        print("[BENCH] no documentation/gsi_documentation_*.json fixtures found")
+        return 1
+    train: List[str] = []
+    test: Dict[str, List[str]] = {}
+    for field, texts in by_field.items():
+        train.extend(texts[0::2])
+        test[field] = texts[1::2]
+    test_values = [text for texts in test.values() for text in texts]
+    plain_bytes = sum(len(text.encode('utf-8')) for text in test_values)
+
+    started = time.perf_counter()
+    dictionary = train_dictionary(train)
+    train_s = time.perf_counter() - started
+    decoder = FrameDecoder()
+    decoder.add_dictionary(1, dictionary)
+
+    decode_json_us = _per_value_us(lambda: [json.loads(text) for text in test_values], len(test_values))
+    print(f"fixtures: {len(by_field)} fields, {len(train)} training / {len(test_values)} test values, "
+          f"{plain_bytes / 1024:.1f} KB plain JSON (json.loads {decode_json_us:.2f} us/value)")
+    print(f"dictionary: {len(dictionary)} bytes, trained in {train_s * 1000:.0f} ms")
+    print(f"{'codec':<16} {'stored KB':>10} {'ratio':>7} {'encode us':>10} {'decode us':>10}")
+
+    best = None
+    for level in [int(level) for level in args.levels.split(',') if level]:
+        for label, codec in ((f"zlib-{level}", JsonCodec(level=level)),
+                             (f"zlib-{level}+dict", JsonCodec(dictionary, 1, level))):
+            stored = [codec.encode(text) for text in test_values]
+            stored_bytes = sum(len(value.encode('utf-8')) if isinstance(value, str) else len(value) for value in stored)
+            encode_us = _per_value_us(lambda: [codec.encode(text) for text in test_values], len(test_values))
+            decode_us = _per_value_us(lambda: [decoder.decode(value) for value in stored], len(test_values))
+            assert [decoder.decode(value) for value in stored] == test_values
+            ratio = plain_bytes / stored_bytes
+            print(f"{label:<16} {stored_bytes / 1024:>10.1f} {ratio:>6.2f}x {encode_us:>10.2f} {decode_us:>10.2f}")
+            if best is None or ratio > best[0]:
+                best = (ratio, label, codec)
+
+    _, label, codec = best
+    print(f"\nper field ({label}):")
+    for field, texts in test.items():
+        if not texts:
+            continue
+        plain = sum(len(text.encode('utf-8')) for text in texts)
+        stored = sum(len(v.encode('utf-8')) if isinstance(v, str) else len(v) for v in map(codec.encode, texts))
+        print(f"  {field:<28} {len(texts):>6} values {plain / max(1, len(texts)):>7.0f} B avg  {plain / stored:>5.2f}x")
+    return 0
+
+
+def _per_value_us(run, count: int, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best / max(1, count) * 1e6
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+"""
+Move snapshot JSON written before snapshot_blobs into the content-addressed blob table.
+
+Usage (from repo root; stop the backend first):
+  python scripts/migrate_snapshot_blobs.py                 # migrate, then report
+  python scripts/migrate_snapshot_blobs.py --report-only   # just the storage report
+  python scripts/migrate_snapshot_blobs.py --prune         # also drop blobs of deleted matches
+  python scripts/migrate_snapshot_blobs.py --vacuum        # also VACUUM so the file shrinks
+
+New snapshots are deduplicated by the DB writer as they are inserted; this covers rows recorded
+before, whose JSON columns still hold the full text. The migration commits per batch and can
+be interrupted and re-run.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.database import UnderlordsDatabaseManager
+
+
+def _file_size(db_path: str) -> int:
+    return os.path.getsize(db_path) if os.path.exists(db_path) else 0
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MB"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Deduplicate snapshot JSON into snapshot_blobs.")
+    parser.add_argument("--db", help="database path (default: underlords_gsi_v5.db in repo root)")
+    parser.add_argument("--batch-size", type=int, default=2000, help="snapshot rows per commit")
+    parser.add_argument("--report-only", action="store_true", help="print the storage report without migrating")
+    parser.add_argument("--prune", action="store_true", help="delete blobs no snapshot references")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to return freed pages to the OS")
+    args = parser.parse_args(argv)
+
+    db = UnderlordsDatabaseManager(db_path=args.db, read_pool_size=1)
+    size_before = _file_size(db.db_path)
+    try:
+        if not args.report_only:
+            with db.write_lock:
+                moved = db.migrate_snapshot_json_to_blobs(batch_size=max(1, args.batch_size))
+            print(f"[BLOBS] Migrated {moved['rows']} snapshot rows ({moved['values']} JSON values): "
+                  f"{_mb(moved['bytes_before'])} of inline JSON -> {_mb(moved['bytes_stored'])} "
+                  f"in {moved['new_blobs']} new blobs")
+            if args.prune:
+                with db.write_lock:
+                    print(f"[BLOBS] Pruned {db.prune_snapshot_blobs()} unreferenced blobs")
+            if args.vacuum:
+                db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                db.conn.execute("VACUUM")
+
+        report = db.snapshot_blob_report()
+        print(f"[BLOBS] {report['blobs']} blobs ({_mb(report['blob_bytes'])} JSON, {_mb(report['stored_bytes'])} stored, "
+              f"{report['compressed_blobs']} compressed) referenced {report['references']} times "
+              f"({_mb(report['referenced_bytes'])} as plain JSON)")
+        print(f"[BLOBS] Bytes saved (dedup + codec): {_mb(report['bytes_saved'])}")
+        if report['legacy_values']:
+            print(f"[BLOBS] Still inline: {report['legacy_values']} values ({_mb(report['legacy_bytes'])})")
+        if report['orphan_blobs']:
+            print(f"[BLOBS] Unreferenced blobs: {report['orphan_blobs']} (run with --prune)")
+    finally:
+        db.close()
+
+    if not args.report_only:
+        size_after = _file_size(db.db_path)
+        note = "" if args.vacuum else " (freed pages are reused; --vacuum shrinks the file)"
+        print(f"[BLOBS] Database file: {_mb(size_before)} -> {_mb(size_after)}{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
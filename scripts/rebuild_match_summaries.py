@@ -0,0 +1,63 @@
+"""
+Rebuild materialized match summaries (match_summaries table) for existing matches.
+
+Usage (from repo root; stop the backend first or let it idle - writes go through SQLite's busy timeout):
+  python scripts/rebuild_match_summaries.py                 # completed matches without a summary
+  python scripts/rebuild_match_summaries.py --match-id ID   # a single match (completed or not)
+  python scripts/rebuild_match_summaries.py --force         # recompute every completed match
+
+New matches are summarized by the DB writer when they end; this covers matches recorded
+before the table existed, and lets a summary be recomputed after snapshot fixes.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.database import UnderlordsDatabaseManager
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild match_summaries for existing matches.")
+    parser.add_argument("--db", help="database path (default: underlords_gsi_v5.db in repo root)")
+    parser.add_argument("--match-id", help="only rebuild this match")
+    parser.add_argument("--force", action="store_true", help="recompute matches that already have a summary")
+    args = parser.parse_args(argv)
+
+    db = UnderlordsDatabaseManager(db_path=args.db, read_pool_size=1)
+    try:
+        if args.match_id:
+            match_ids = [args.match_id]
+        else:
+            query = "SELECT match_id FROM matches WHERE ended_at IS NOT NULL"
+            if not args.force:
+                query += " AND match_id NOT IN (SELECT DISTINCT match_id FROM match_summaries)"
+            match_ids = [row[0] for row in db.conn.execute(query + " ORDER BY started_at")]
+
+        total = 0
+        for match_id in match_ids:
+            with db.write_lock:
+                db.begin()
+                try:
+                    rows = db.finalize_match_summary(match_id)
+                    db.conn.commit()
+                except Exception:
+                    db.conn.rollback()
+                    raise
+            total += rows
+            if rows:
+                print(f"[SUMMARIES] {match_id}: {rows} players")
+        print(f"[SUMMARIES] Done - {total} player summaries across {len(match_ids)} matches")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
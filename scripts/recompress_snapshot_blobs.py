@@ -0,0 +1,81 @@
+"""
+Re-encode snapshot_blobs with the snapshot JSON codec (optionally training a new dictionary first).
+
+Usage (from repo root; stop the backend first):
+  python scripts/recompress_snapshot_blobs.py --train               # train a dictionary, compress every blob
+  python scripts/recompress_snapshot_blobs.py --codec zlib --level 9
+  python scripts/recompress_snapshot_blobs.py --codec none          # back to plain JSON text
+  python scripts/recompress_snapshot_blobs.py --vacuum              # also VACUUM so the file shrinks
+
+The backend compresses new blobs when SNAPSHOT_JSON_CODEC=zlib, with the newest dictionary at
+startup; this rewrites blobs stored before (or with an older dictionary). Old dictionaries are
+kept, so anything not rewritten still decodes. Run scripts/migrate_snapshot_blobs.py first for
+databases that still hold inline snapshot JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.database import UnderlordsDatabaseManager
+from backend.snapshot_codec import CODECS
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MB"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-encode snapshot_blobs with the snapshot JSON codec.")
+    parser.add_argument("--db", help="database path (default: underlords_gsi_v5.db in repo root)")
+    parser.add_argument("--codec", choices=CODECS, default='zlib', help="target codec (default: zlib)")
+    parser.add_argument("--level", type=int, help="zlib level (default: SNAPSHOT_JSON_CODEC_LEVEL or 6)")
+    parser.add_argument("--train", action="store_true", help="train a new dictionary from the newest blobs first")
+    parser.add_argument("--samples", type=int, default=UnderlordsDatabaseManager.CODEC_TRAINING_SAMPLES,
+                        help="blobs to train the dictionary on")
+    parser.add_argument("--batch-size", type=int, default=2000, help="blobs per commit")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to return freed pages to the OS")
+    args = parser.parse_args(argv)
+
+    db = UnderlordsDatabaseManager(db_path=args.db, read_pool_size=1)
+    size_before = os.path.getsize(db.db_path)
+    try:
+        with db.write_lock:
+            db.set_json_codec(args.codec, args.level)
+            if args.train:
+                dictionary_id = db.train_json_codec_dictionary(max(1, args.samples))
+                if dictionary_id is None:
+                    print("[CODEC] No dictionary trained: too few blobs, or nothing repeats across them")
+                else:
+                    print(f"[CODEC] Trained dictionary {dictionary_id}")
+            stats = db.blob_cache_stats()
+            print(f"[CODEC] Target: {stats['codec']} (dictionary {stats['codec_dictionary_id']})")
+            result = db.recompress_snapshot_blobs(batch_size=max(1, args.batch_size))
+        print(f"[CODEC] Rewrote {result['rewritten']} of {result['blobs']} blobs: "
+              f"{_mb(result['bytes_before'])} -> {_mb(result['bytes_after'])}")
+        if args.vacuum:
+            db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            db.conn.execute("VACUUM")
+
+        report = db.snapshot_blob_report()
+        print(f"[CODEC] snapshot_blobs: {_mb(report['blob_bytes'])} JSON stored in {_mb(report['stored_bytes'])} "
+              f"({report['compressed_blobs']} of {report['blobs']} blobs compressed)")
+    finally:
+        db.close()
+
+    note = "" if args.vacuum else " (freed pages are reused; --vacuum shrinks the file)"
+    print(f"[CODEC] Database file: {_mb(size_before)} -> {_mb(os.path.getsize(db.db_path))}{note}")
+    if args.codec != UnderlordsDatabaseManager.SNAPSHOT_JSON_CODEC:
+        print(f"[CODEC] Set SNAPSHOT_JSON_CODEC={args.codec} so the backend stores new blobs the same way")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())